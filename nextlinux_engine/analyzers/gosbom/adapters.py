@@ -95,6 +95,7 @@ def _convert_gosbom_to_engine(gosbom_output: dict,
         )
     else:
         artifacts = gosbom_output["artifacts"]
+    artifacts_by_type = collections.defaultdict(list)
     for artifact in artifacts:
         # gosbom may do more work than what is supported in engine, ensure we only include artifacts
         # of select package types.
@@ -103,8 +104,17 @@ def _convert_gosbom_to_engine(gosbom_output: dict,
                 "Handler for artifact type {} not available. Skipping package {}."
                 .format(artifact["type"], artifact["name"]))
             continue
-        handler = modules_by_artifact_type[artifact["type"]]
-        handler.translate_and_save_entry(findings, artifact)
+        artifacts_by_type[artifact["type"]].append(artifact)
+
+    # dispatch all artifacts of a type to the handler at once, handlers that do not provide a batch entry point
+    # are invoked per artifact
+    for artifact_type, typed_artifacts in artifacts_by_type.items():
+        handler = modules_by_artifact_type[artifact_type]
+        if hasattr(handler, "translate_and_save_entries"):
+            handler.translate_and_save_entries(findings, typed_artifacts)
+        else:
+            for artifact in typed_artifacts:
+                handler.translate_and_save_entry(findings, artifact)
 
     return defaultdict_to_dict(findings)
 
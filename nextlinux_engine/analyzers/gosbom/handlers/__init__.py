@@ -2,6 +2,7 @@ from . import alpine, debian, gem, golang, java, npm, python, rpm
 
 # This is a mapping of **gosbom** artifact types to modules to transform gosbom output into engine-compliant output.
 # Each module has two functions: translate_and_save_entry & save_entry
+# Modules may also provide translate_and_save_entries to handle all artifacts of their type in one call
 modules_by_artifact_type = {
     "gem": gem,
     "python": python,
@@ -82,7 +82,13 @@ def _all_packages(findings, artifact):
 
 
 def _all_package_files(findings, artifact):
-    for file in dig(artifact, "metadata", "files", force_default=[]):
+    files = dig(artifact, "metadata", "files")
+    if not files:
+        # don't touch the findings so no empty "pkgfiles.all" section is created
+        return
+
+    pkgfiles = findings["package_list"]["pkgfiles.all"]["base"]
+    for file in files:
         original_path = file.get("path")
         if not original_path.startswith("/"):
             # the 'alpine-baselayout' package is installed relative to root,
@@ -90,5 +96,4 @@ def _all_package_files(findings, artifact):
             original_path = "/" + original_path
 
         # nextlinux-engine considers all parent paths to also be a registered apkg path (except root)
-        findings["package_list"]["pkgfiles.all"]["base"][
-            original_path] = "APKFILE"
+        pkgfiles[original_path] = "APKFILE"
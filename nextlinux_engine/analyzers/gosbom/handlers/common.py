@@ -23,16 +23,7 @@ def save_entry_to_findings(findings: Union[dict, DefaultDict], entry: dict,
     :rtype: None
     """
     try:
-        # If the path is already defined, log a message and do nothing because nothing should override values
-        if findings["package_list"][pkg_type]["base"].get(pkg_key):
-            logger.warn(
-                "%s package already present under %s in the analysis report and will not be overwritten",
-                pkg_key,
-                pkg_type,
-            )
-        # Otherwise set it to value
-        else:
-            findings["package_list"][pkg_type]["base"][pkg_key] = entry
+        section = findings["package_list"][pkg_type]["base"]
     except KeyError:
         # There is a chance that the specified path in the dictionary does not exist.
         # This happens if artifact type not found by gosbom but is present in the hints file
@@ -47,3 +38,34 @@ def save_entry_to_findings(findings: Union[dict, DefaultDict], entry: dict,
                 }
             }},
         )
+    else:
+        save_entry_to_section(section, entry, pkg_type, pkg_key)
+
+
+def save_entry_to_section(section: dict, entry: dict, pkg_type: str,
+                          pkg_key: str) -> None:
+    """
+    Same as save_entry_to_findings, but saves to an already resolved findings["package_list"][pkg_type]["base"] dict.
+    Intended for handlers that save many entries of the same type and resolve the section once
+
+    :param section: the base dict of the pkg_type in the findings
+    :type section: dict
+    :param entry: actual artifact to be added to findings
+    :type entry: dict
+    :param pkg_type: the pkg_type of the section, used for logging
+    :type pkg_type: str
+    :param pkg_key: pkg_key used to index the finding. Usually the name or location of package
+    :type pkg_key: str
+    :return: None
+    :rtype: None
+    """
+    # If the path is already defined, log a message and do nothing because nothing should override values
+    if section.get(pkg_key):
+        logger.warn(
+            "%s package already present under %s in the analysis report and will not be overwritten",
+            pkg_key,
+            pkg_type,
+        )
+    # Otherwise set it to value
+    else:
+        section[pkg_key] = entry
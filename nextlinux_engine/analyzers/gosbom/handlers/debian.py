@@ -1,91 +1,108 @@
-from nextlinux_engine.analyzers.gosbom.handlers.common import save_entry_to_findings
-from nextlinux_engine.analyzers.utils import dig
+from typing import List, Optional
 
+from nextlinux_engine.analyzers.gosbom.handlers.common import (
+    save_entry_to_findings,
+    save_entry_to_section,
+)
 
-def save_entry(findings, engine_entry, pkg_key=None):
+
+def save_entry(findings: dict,
+               engine_entry: dict,
+               pkg_key: Optional[str] = None) -> None:
     if not pkg_key:
         pkg_key = engine_entry.get("name", "")
 
     save_entry_to_findings(findings, engine_entry, "pkgs.allinfo", pkg_key)
 
 
-def translate_and_save_entry(findings, artifact):
+def translate_and_save_entry(findings: dict, artifact: dict) -> None:
     """
     Handler function to map gosbom results for an debian package type into the engine "raw" document format.
     """
-    _all_package_files(findings, artifact)
-    _all_packages(findings, artifact)
-    _all_packages_plus_source(findings, artifact)
-    _all_package_info(findings, artifact)
+    translate_and_save_entries(findings, [artifact])
+
+
+def translate_and_save_entries(findings: dict, artifacts: List[dict]) -> None:
+    """
+    Handler function to map a batch of gosbom results for the debian package type into the engine "raw" document format.
 
+    The package list sections written for every artifact are resolved once for the whole batch.
+    """
+    package_list = findings["package_list"]
+    pkgs_all = package_list["pkgs.all"]["base"]
+    pkgs_plus_source = package_list["pkgs_plus_source.all"]["base"]
+    pkgs_allinfo = package_list["pkgs.allinfo"]["base"]
+
+    for artifact in artifacts:
+        _all_package_files(findings, artifact)
+        _all_packages(pkgs_all, artifact)
+        _all_packages_plus_source(pkgs_plus_source, artifact)
+        _all_package_info(pkgs_allinfo, artifact)
 
-def _all_package_info(findings, artifact):
+
+def _all_package_info(pkgs_allinfo: dict, artifact: dict) -> None:
     name = artifact["name"]
     version = artifact["version"]
-    release = dig(artifact, "metadata", "release")
+    metadata = artifact.get("metadata") or {}
+    release = metadata.get("release")
 
     if release:
-        version = artifact["version"] + "-" + release
+        version = f"{version}-{release}"
 
-    maintainer = dig(artifact, "metadata", "maintainer")
+    maintainer = metadata.get("maintainer")
     if maintainer:
-        maintainer += " (maintainer)"
+        maintainer = f"{maintainer} (maintainer)"
 
-    size = dig(artifact, "metadata", "installedSize")
-    if size:
-        # convert KB to Bytes
-        size = size * 1000
-    else:
-        size = "N/A"
+    size = metadata.get("installedSize")
+    # convert KB to Bytes
+    size = str(size * 1000) if size else "N/A"
 
-    license = dig(artifact, "licenses")
-    if license:
-        license = " ".join(license)
-    else:
-        license = "Unknown"
+    license = artifact.get("licenses")
+    license = " ".join(license) if license else "Unknown"
 
     pkg_value = {
         "version": version,
-        "sourcepkg": dig(artifact, "metadata", "source", force_default="N/A"),
-        "arch": dig(artifact, "metadata", "architecture", force_default="N/A"),
+        "sourcepkg": metadata.get("source") or "N/A",
+        "arch": metadata.get("architecture") or "N/A",
         "origin": maintainer or "N/A",
-        "release": "N/A",
-        "size": str(size),
+        "size": size,
         "license": license,
         "type": "dpkg",
         "cpes": artifact.get("cpes", []),
     }
 
-    save_entry(findings, pkg_value, name)
+    save_entry_to_section(pkgs_allinfo, pkg_value, "pkgs.allinfo", name)
 
 
-def _all_packages_plus_source(findings, artifact):
+def _all_packages_plus_source(pkgs_plus_source: dict, artifact: dict) -> None:
     name = artifact["name"]
     version = artifact["version"]
 
-    origin_package = dig(artifact, "metadata", "originPackage")
+    origin_package = (artifact.get("metadata") or {}).get("originPackage")
 
-    findings["package_list"]["pkgs_plus_source.all"]["base"][name] = version
+    pkgs_plus_source[name] = version
     if origin_package:
-        findings["package_list"]["pkgs_plus_source.all"]["base"][
-            origin_package] = version
+        pkgs_plus_source[origin_package] = version
 
 
-def _all_packages(findings, artifact):
+def _all_packages(pkgs_all: dict, artifact: dict) -> None:
     name = artifact["name"]
     version = artifact["version"]
     if name and version:
-        findings["package_list"]["pkgs.all"]["base"][name] = version
+        pkgs_all[name] = version
+
 
+def _all_package_files(findings: dict, artifact: dict) -> None:
+    files = (artifact.get("metadata") or {}).get("files")
+    if not files:
+        # don't touch the findings so no empty "pkgfiles.all" section is created
+        return
 
-def _all_package_files(findings, artifact):
-    for file in dig(artifact, "metadata", "files", force_default=[]):
-        original_path = file.get("path")
-        if not original_path.startswith("/"):
-            # the 'alpine-baselayout' package is installed relative to root,
-            # however, gosbom reports this as an absolute path
-            original_path = "/" + original_path
+    # the 'alpine-baselayout' package is installed relative to root,
+    # however, gosbom reports this as an absolute path
+    paths = [file.get("path") for file in files]
+    paths = [path if path.startswith("/") else "/" + path for path in paths]
 
-        # nextlinux-engine considers all parent paths to also be a registered apkg path (except root)
-        findings["package_list"]["pkgfiles.all"]["base"][
-            original_path] = "DPKGFILE"
+    # nextlinux-engine considers all parent paths to also be a registered apkg path (except root)
+    findings["package_list"]["pkgfiles.all"]["base"].update(
+        dict.fromkeys(paths, "DPKGFILE"))
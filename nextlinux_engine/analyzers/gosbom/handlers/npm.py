@@ -1,8 +1,14 @@
-from nextlinux_engine.analyzers.gosbom.handlers.common import save_entry_to_findings
-from nextlinux_engine.analyzers.utils import dig
+from typing import List, Optional
 
+from nextlinux_engine.analyzers.gosbom.handlers.common import (
+    save_entry_to_findings,
+    save_entry_to_section,
+)
 
-def save_entry(findings, engine_entry, pkg_key=None):
+
+def save_entry(findings: dict,
+               engine_entry: dict,
+               pkg_key: Optional[str] = None) -> None:
     if not pkg_key:
         pkg_location = engine_entry.get("location", "")
         if pkg_location:
@@ -20,27 +26,38 @@ def save_entry(findings, engine_entry, pkg_key=None):
     save_entry_to_findings(findings, engine_entry, "pkgs.npms", pkg_key)
 
 
-def translate_and_save_entry(findings, artifact):
+def translate_and_save_entry(findings: dict, artifact: dict) -> None:
     """
     Handler function to map gosbom results for npm package type into the engine "raw" document format.
     """
-    pkg_key = artifact["locations"][0]["path"]
-    name = artifact["name"]
-    homepage = dig(artifact, "metadata", "homepage", force_default="")
-    author = dig(artifact, "metadata", "author", force_default="")
-    authors = dig(artifact, "metadata", "authors", force_default=[])
-    origins = [] if not author else [author]
-    origins.extend(authors)
-
-    pkg_value = {
-        "name": name,
-        "versions": [artifact["version"]],
-        "latest": artifact["version"],
-        "sourcepkg": dig(artifact, "metadata", "url", force_default=homepage),
-        "origins": origins,
-        "lics": dig(artifact, "metadata", "licenses", force_default=[]),
-        "cpes": artifact.get("cpes", []),
-    }
-
-    # inject the artifact document into the "raw" analyzer document
-    save_entry(findings, pkg_value, pkg_key)
+    translate_and_save_entries(findings, [artifact])
+
+
+def translate_and_save_entries(findings: dict, artifacts: List[dict]) -> None:
+    """
+    Handler function to map a batch of gosbom results for the npm package type into the engine "raw" document format.
+    """
+    pkgs_npms = findings["package_list"]["pkgs.npms"]["base"]
+
+    for artifact in artifacts:
+        pkg_key = artifact["locations"][0]["path"]
+        name = artifact["name"]
+        version = artifact["version"]
+        metadata = artifact.get("metadata") or {}
+        homepage = metadata.get("homepage") or ""
+        author = metadata.get("author") or ""
+        authors = metadata.get("authors") or []
+        origins = [author, *authors] if author else list(authors)
+
+        pkg_value = {
+            "name": name,
+            "versions": [version],
+            "latest": version,
+            "sourcepkg": metadata.get("url") or homepage,
+            "origins": origins,
+            "lics": metadata.get("licenses") or [],
+            "cpes": artifact.get("cpes", []),
+        }
+
+        # inject the artifact document into the "raw" analyzer document
+        save_entry_to_section(pkgs_npms, pkg_value, "pkgs.npms", pkg_key)
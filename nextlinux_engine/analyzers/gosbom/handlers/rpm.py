@@ -62,6 +62,11 @@ def _all_packages(findings, artifact):
 
 
 def _all_package_files(findings, artifact):
-    for file in dig(artifact, "metadata", "files", force_default=[]):
-        pkgfile = file.get("path")
-        findings["package_list"]["pkgfiles.all"]["base"][pkgfile] = "RPMFILE"
+    files = dig(artifact, "metadata", "files")
+    if not files:
+        # don't touch the findings so no empty "pkgfiles.all" section is created
+        return
+
+    pkgfiles = findings["package_list"]["pkgfiles.all"]["base"]
+    for file in files:
+        pkgfiles[file.get("path")] = "RPMFILE"
@@ -23,30 +23,32 @@ imgname = config["imgid"]
 outputdir = config["dirs"]["outputdir"]
 unpackdir = config["dirs"]["unpackdir"]
 
+squashtar_path = os.path.join(unpackdir, "squashed.tar")
+dockerfile_path = os.path.join(unpackdir, "Dockerfile")
+meta_json_path = os.path.join(unpackdir, "analyzer_meta.json")
+meta_outfile = os.path.join(outputdir, "analyzer_meta")
+dockerfile_outfile = os.path.join(outputdir, "Dockerfile")
+
 try:
-    meta = nextlinux_engine.analyzers.utils.get_distro_from_squashtar(
-        os.path.join(unpackdir, "squashed.tar")
-    )
+    meta = nextlinux_engine.analyzers.utils.get_distro_from_squashtar(squashtar_path)
 
-    dockerfile_contents = None
-    if os.path.exists(os.path.join(unpackdir, "Dockerfile")):
-        dockerfile_contents = nextlinux_engine.analyzers.utils.read_plainfile_tostr(
-            os.path.join(unpackdir, "Dockerfile")
-        )
+    try:
+        with open(dockerfile_path, "r") as FH:
+            dockerfile_contents = FH.read()
+    except FileNotFoundError:
+        dockerfile_contents = None
 
     if meta:
-        ofile = os.path.join(outputdir, "analyzer_meta")
-        nextlinux_engine.analyzers.utils.write_kvfile_fromdict(ofile, meta)
-        # shutil.copy(ofile, unpackdir + "/analyzer_meta")
-        with open(os.path.join(unpackdir, "analyzer_meta.json"), "w") as OFH:
-            OFH.write(json.dumps(meta))
+        nextlinux_engine.analyzers.utils.write_kvfile_fromdict(meta_outfile, meta)
+        # shutil.copy(meta_outfile, unpackdir + "/analyzer_meta")
+        with open(meta_json_path, "w") as OFH:
+            json.dump(meta, OFH)
     else:
         raise Exception("could not analyze/store basic metadata about image")
 
     if dockerfile_contents:
-        ofile = os.path.join(outputdir, "Dockerfile")
         nextlinux_engine.analyzers.utils.write_plainfile_fromstr(
-            ofile, dockerfile_contents
+            dockerfile_outfile, dockerfile_contents
         )
 
 except Exception as err:
@@ -390,6 +390,10 @@ class DbAuthorizationHandler(AuthorizationHandler):
         :param permission_list: list of Permission objects
         :return:
         """
+        # An empty list is always permitted (authc only), so skip the realm lookup, which may call an external authorizer
+        if not permission_list:
+            return
+
         logger.debug("Checking permission: {}".format(permission_list))
         try:
             stringified_permissions = []
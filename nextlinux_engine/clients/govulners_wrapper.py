@@ -1,19 +1,25 @@
+import collections
 import errno
 import json
 import os
 import shlex
 import shutil
 import tarfile
+import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from json.decoder import JSONDecodeError
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
+import orjson
 import sqlalchemy
 from readerwriterlock import rwlock
-from sqlalchemy import Column, ForeignKey, Integer, String, and_, func
+from sqlalchemy import Column, ForeignKey, Integer, String, and_, bindparam, func, select
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 import nextlinux_engine.configuration.localconfig
 from nextlinux_engine.db.entities.common import UtilMixin
@@ -23,9 +29,55 @@ from nextlinux_engine.utils import CommandException, run_check
 VULNERABILITIES = "vulnerabilities"
 VULNERABILITY_TABLE_NAME = "vulnerability"
 VULNERABILITY_METADATA_TABLE_NAME = "vulnerability_metadata"
+COPY_FILE_RANGE_CHUNK_SIZE = 64 * 1024 * 1024
+TAR_EXTRACT_BUFFER_SIZE = 1024 * 1024
 Base = declarative_base()
 
 
+def _deserialize_column(row, column_name: str):
+    """
+    Returns the parsed json contents of a string column of a govulners_db row. The parsed value is cached on the row
+    under an underscore-prefixed key, so it is excluded from to_dict()/to_json(). This is safe because govulners_db
+    rows are only ever read. Cached rows are shared between callers and threads, so the returned value is read-only
+    and must not be modified.
+    """
+    cache_key = "_deserialized_" + column_name
+    row_dict = vars(row)
+    if cache_key not in row_dict:
+        row_dict[cache_key] = orjson.loads(getattr(row, column_name))
+    return row_dict[cache_key]
+
+
+def _copy_file(src: str, dst: str) -> None:
+    """
+    Copies src to dst with copy_file_range(2) where available, which lets the kernel copy without moving the data
+    through userspace, or reflink it on filesystems that support that. Falls back to shutil.copyfile otherwise.
+    """
+    if hasattr(os, "copy_file_range"):
+        with open(src, "rb") as read_file, open(dst, "wb") as write_file:
+            try:
+                while os.copy_file_range(
+                    read_file.fileno(), write_file.fileno(), COPY_FILE_RANGE_CHUNK_SIZE
+                ):
+                    pass
+                return
+            except OSError as error:
+                if error.errno not in (
+                    errno.ENOSYS,
+                    errno.EXDEV,
+                    errno.EINVAL,
+                    errno.EOPNOTSUPP,
+                ):
+                    raise
+                logger.debug(
+                    "copy_file_range unsupported for %s to %s, falling back to a regular copy",
+                    src,
+                    dst,
+                )
+
+    shutil.copyfile(src, dst)
+
+
 # Table definitions.
 class GovulnersVulnerability(Base, UtilMixin):
     __tablename__ = VULNERABILITY_TABLE_NAME
@@ -44,11 +96,11 @@ class GovulnersVulnerability(Base, UtilMixin):
 
     @property
     def deserialized_related_vulnerabilities(self):
-        return json.loads(self.related_vulnerabilities)
+        return _deserialize_column(self, "related_vulnerabilities")
 
     @property
     def deserialized_fixed_in_versions(self):
-        return json.loads(self.fixed_in_versions)
+        return _deserialize_column(self, "fixed_in_versions")
 
 
 class GovulnersVulnerabilityMetadata(Base, UtilMixin):
@@ -65,15 +117,123 @@ class GovulnersVulnerabilityMetadata(Base, UtilMixin):
 
     @property
     def deserialized_urls(self):
-        return json.loads(self.urls)
+        return _deserialize_column(self, "urls")
 
     @property
     def deserialized_cvss(self):
-        return json.loads(self.cvss)
+        return _deserialize_column(self, "cvss")
+
+
+def _batched(values: list, batch_size: int) -> Iterable[list]:
+    """
+    Yields consecutive slices of values of at most batch_size items
+    """
+    for i in range(0, len(values), batch_size):
+        yield values[i : i + batch_size]
+
+
+# Connection-local table holding the vuln ids of a single large lookup, so they can be joined against instead of
+# being sent as many batches of bound parameters. Temp tables live outside the read-only govulners_db file
+_QUERY_VULN_IDS_TEMP_TABLE = sqlalchemy.Table(
+    "query_vuln_ids",
+    sqlalchemy.MetaData(),
+    Column("id", String, primary_key=True),
+    prefixes=["TEMPORARY"],
+)
+_CREATE_QUERY_VULN_IDS_TEMP_TABLE = CreateTable(
+    _QUERY_VULN_IDS_TEMP_TABLE, if_not_exists=True
+)
+
+
+def _load_query_vuln_ids(session, vuln_ids: list) -> None:
+    """
+    Replaces the contents of the session connection's query_vuln_ids temp table with vuln_ids. The table is kept on
+    the pooled connection between lookups, so it is created only if missing and emptied before loading
+    """
+    connection = session.connection()
+    connection.execute(_CREATE_QUERY_VULN_IDS_TEMP_TABLE)
+    connection.execute(_QUERY_VULN_IDS_TEMP_TABLE.delete())
+    connection.execute(
+        _QUERY_VULN_IDS_TEMP_TABLE.insert(), [{"id": vuln_id} for vuln_id in vuln_ids]
+    )
+
+
+# Lookup statements are built once per filter combination and executed with bound parameters, so each call
+# reuses the same statement (and its entry in the engine's compiled cache) instead of rebuilding it.
+@lru_cache(maxsize=None)
+def _vulnerability_metadata_select(filter_namespaces: bool, join_vuln_ids: bool = False):
+    """
+    Returns the select for GovulnersVulnerabilityMetadata rows matching the vuln_ids (and optionally namespaces) params,
+    or matching the ids in the query_vuln_ids temp table if join_vuln_ids is set
+    """
+    stmt = select(GovulnersVulnerabilityMetadata)
+    if join_vuln_ids:
+        stmt = stmt.join(
+            _QUERY_VULN_IDS_TEMP_TABLE,
+            _QUERY_VULN_IDS_TEMP_TABLE.c.id == GovulnersVulnerabilityMetadata.id,
+        )
+    else:
+        stmt = stmt.where(
+            GovulnersVulnerabilityMetadata.id.in_(bindparam("vuln_ids", expanding=True))
+        )
+    if filter_namespaces:
+        stmt = stmt.where(
+            GovulnersVulnerabilityMetadata.namespace.in_(
+                bindparam("namespaces", expanding=True)
+            )
+        )
+    return stmt
+
+
+@lru_cache(maxsize=None)
+def _vulnerabilities_select(
+    filter_vuln_ids: bool,
+    filter_namespaces: bool,
+    filter_package: bool,
+    join_vuln_ids: bool = False,
+):
+    """
+    Returns the select for GovulnersVulnerabilityMetadata left outer joined with GovulnersVulnerability, filtered by
+    the vuln_ids, namespaces and affected_package params as requested. If join_vuln_ids is set, the vuln ids are
+    matched against the query_vuln_ids temp table instead of the vuln_ids param
+    """
+    stmt = select(GovulnersVulnerability, GovulnersVulnerabilityMetadata).outerjoin(
+        GovulnersVulnerability,
+        and_(
+            GovulnersVulnerability.id == GovulnersVulnerabilityMetadata.id,
+            GovulnersVulnerability.namespace == GovulnersVulnerabilityMetadata.namespace,
+        ),
+    )
+    if join_vuln_ids:
+        stmt = stmt.join(
+            _QUERY_VULN_IDS_TEMP_TABLE,
+            _QUERY_VULN_IDS_TEMP_TABLE.c.id == GovulnersVulnerability.id,
+        )
+    elif filter_vuln_ids:
+        stmt = stmt.where(
+            GovulnersVulnerability.id.in_(bindparam("vuln_ids", expanding=True))
+        )
+    if filter_namespaces:
+        stmt = stmt.where(
+            GovulnersVulnerability.namespace.in_(bindparam("namespaces", expanding=True))
+        )
+    if filter_package:
+        stmt = stmt.where(
+            GovulnersVulnerability.package_name == bindparam("affected_package")
+        )
+    return stmt
+
+
+_RECORD_SOURCE_COUNTS_SELECT = select(
+    GovulnersVulnerabilityMetadata.namespace,
+    func.count(GovulnersVulnerabilityMetadata.namespace).label("count"),
+).group_by(GovulnersVulnerabilityMetadata.namespace)
 
 
 @dataclass
 class GovulnersDBMetadata:
+    __slots__ = ("built", "version", "checksum")
+
     built: str
     version: str
     checksum: str
@@ -88,6 +248,8 @@ class GovulnersDBMetadata:
 
 @dataclass
 class GovulnersDBEngineMetadata:
+    __slots__ = ("db_checksum", "archive_checksum", "govulners_db_version")
+
     db_checksum: str
     archive_checksum: str
     govulners_db_version: str
@@ -102,6 +264,8 @@ class GovulnersDBEngineMetadata:
 
 @dataclass
 class RecordSource:
+    __slots__ = ("count", "feed", "group", "last_synced")
+
     count: int
     feed: str
     group: str
@@ -118,9 +282,24 @@ class GovulnersWrapperSingleton(object):
     # These values should be treated as constants, and will not be changed by the functions below
     LOCK_READ_ACCESS_TIMEOUT = 60000
     LOCK_WRITE_ACCESS_TIMEOUT = 60000
-    SQL_LITE_URL_TEMPLATE = "sqlite:///{}"
+    # Engine never writes to the db file, so open it read-only. It is not opened as immutable since staging the same
+    # archive again re-extracts it over the file in the same checksum-named dir
+    SQL_LITE_URL_TEMPLATE = "sqlite:///file:{}?mode=ro&uri=true"
+    SQL_LITE_QUERY_CACHE_SIZE = 1200
+    # Keeps the number of bound parameters per statement under sqlite's limit, which is 999 before sqlite 3.32
+    QUERY_VULN_IDS_BATCH_SIZE = 500
+    # Lookups with more vuln ids than this load them into a temp table and join on it, rather than running batches
+    QUERY_VULN_IDS_TEMP_TABLE_THRESHOLD = 2000
+    VULNERABILITY_METADATA_CACHE_SIZE = 4096
+    # Engine only ever reads from govulners_db, so favor read performance on each new sqlite connection
+    SQL_LITE_CONNECT_PRAGMAS = (
+        "PRAGMA mmap_size = 1073741824",
+        "PRAGMA temp_store = MEMORY",
+    )
     GOVULNERS_SUB_COMMAND = "govulners -vv -o json"
+    GOVULNERS_SUB_COMMAND_ARGV = shlex.split(GOVULNERS_SUB_COMMAND)
     GOVULNERS_VERSION_COMMAND = "govulners version -o json"
+    GOVULNERS_VERSION_COMMAND_ARGV = shlex.split(GOVULNERS_VERSION_COMMAND)
     VULNERABILITY_FILE_NAME = "vulnerability.db"
     METADATA_FILE_NAME = "metadata.json"
     ENGINE_METADATA_FILE_NAME = "engine_metadata.json"
@@ -152,15 +331,44 @@ class GovulnersWrapperSingleton(object):
             cls._govulners_db_dir_internal = None
             cls._govulners_db_version_internal = None
             cls._govulners_db_session_maker_internal = None
+            # The engine behind the session maker, kept so its pooled connections can be closed once it is replaced
+            cls._govulners_db_engine_internal = None
 
             # These variables are also mutable. They are for staging updated grye_dbs.
             cls._staging_govulners_db_dir_internal = None
             cls._staging_govulners_db_version_internal = None
             cls._staging_govulners_db_session_maker_internal = None
+            cls._staging_govulners_db_engine_internal = None
 
             # The reader-writer lock for this class
             cls._govulners_db_lock = rwlock.RWLockWrite()
 
+            # The installed govulners binary does not change for the life of the process, so its version
+            # output is only retrieved once
+            cls._govulners_version = None
+
+            # Serializes govulners_db updates, so the reader-writer lock only needs to be held for writing while
+            # the new govulners_db is swapped in
+            cls._govulners_db_update_lock = threading.Lock()
+
+            # The process environment with the govulners env variables applied, captured once since copying
+            # os.environ is comparatively expensive and it is needed for every govulners invocation
+            cls._govulners_base_env = {**os.environ, **cls.GOVULNERS_BASE_ENV_VARS}
+
+            # Least recently used GovulnersVulnerabilityMetadata records of the production govulners_db, keyed by
+            # vulnerability id and namespace filter. The detached records are handed to every caller and thread that
+            # looks them up, so they are read-only and must not be modified
+            cls._vulnerability_metadata_cache = collections.OrderedDict()
+            cls._vulnerability_metadata_cache_lock = threading.Lock()
+            # Events for the cache keys currently being queried, set once the query completes, so concurrent
+            # lookups of the same ids wait for that query rather than running it again
+            cls._vulnerability_metadata_in_flight = {}
+
+            # Parsed metadata file contents or data objects, keyed by file path and converter and stored along with
+            # the file's mtime when read. The same value is returned to every caller, so it is read-only and must not
+            # be modified
+            cls._metadata_file_cache = {}
+
         # Return the singleton instance
         return cls._govulners_wrapper_instance
 
@@ -203,6 +411,9 @@ class GovulnersWrapperSingleton(object):
     @_govulners_db_session_maker.setter
     def _govulners_db_session_maker(self, govulners_db_session_maker_internal):
         self._govulners_db_session_maker_internal = govulners_db_session_maker_internal
+        # Cached records belong to the production govulners_db being replaced
+        with self._vulnerability_metadata_cache_lock:
+            self._vulnerability_metadata_cache.clear()
 
     @property
     def _staging_govulners_db_dir(self):
@@ -303,24 +514,22 @@ class GovulnersWrapperSingleton(object):
         This logs an error and returns None if the file does not exist or cannot be parsed into json, otherwise
         it returns the json.
         """
-        # If the file does not exist, log an error and return None
-        if not os.path.exists(file_path):
+        # Open directly rather than checking for existence first, reading the file is the common case
+        try:
+            with open(file_path, "rb") as read_file:
+                return orjson.loads(read_file.read())
+        except FileNotFoundError:
             logger.error(
                 "Unable to read non-exists file at %s to json.",
                 file_path,
             )
             return None
-        else:
-            # Get the contents of the file
-            with open(file_path) as read_file:
-                try:
-                    return json.load(read_file)
-                except JSONDecodeError:
-                    logger.error(
-                        "Unable to parse file at %s into json.",
-                        file_path,
-                    )
-                    return None
+        except JSONDecodeError:
+            logger.error(
+                "Unable to parse file at %s into json.",
+                file_path,
+            )
+            return None
 
     def get_current_govulners_db_checksum(self):
         """
@@ -378,10 +587,28 @@ class GovulnersWrapperSingleton(object):
                 govulners_db_archive_local_file_location,
                 govulners_db_archive_copied_file_location,
             )
-            shutil.copyfile(
-                govulners_db_archive_local_file_location,
-                govulners_db_archive_copied_file_location,
-            )
+            # Hard link rather than copy when possible, the archive can be hundreds of MB. The source is left in place
+            # since callers may still use it, e.g. to stage and then promote the same archive.
+            if os.path.exists(govulners_db_archive_copied_file_location):
+                if os.path.samefile(
+                    govulners_db_archive_local_file_location,
+                    govulners_db_archive_copied_file_location,
+                ):
+                    # The source itself, or a link to it from an earlier attempt, so it is already in place
+                    return govulners_db_archive_copied_file_location
+                # Left over from an interrupted update
+                os.remove(govulners_db_archive_copied_file_location)
+            try:
+                os.link(
+                    govulners_db_archive_local_file_location,
+                    govulners_db_archive_copied_file_location,
+                )
+            except OSError:
+                # Source and output dir are on different filesystems, or hard links are not supported
+                _copy_file(
+                    govulners_db_archive_local_file_location,
+                    govulners_db_archive_copied_file_location,
+                )
             return govulners_db_archive_copied_file_location
 
     def _open_govulners_db_archive(
@@ -404,9 +631,15 @@ class GovulnersWrapperSingleton(object):
             govulners_db_parent_dir,
         )
 
-        # Put the extracted files in the versioned dir
-        with tarfile.open(govulners_db_archive_copied_file_location) as read_archive:
-            read_archive.extractall(govulners_db_versioned_dir)
+        # Put the extracted files in the versioned dir. The archive is read as a stream, in a single forward pass,
+        # and members are restricted to plain data files inside the dir when this python supports extraction filters
+        extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        with tarfile.open(
+            govulners_db_archive_copied_file_location,
+            mode="r|*",
+            copybufsize=TAR_EXTRACT_BUFFER_SIZE,
+        ) as read_archive:
+            read_archive.extractall(govulners_db_versioned_dir, **extract_kwargs)
 
         # Return the full path to the parent govulners_db dir. This is the dir we actually pass to govulners,
         # which expects the version subdirectory to be under it.
@@ -445,8 +678,8 @@ class GovulnersWrapperSingleton(object):
         }
 
         # Write engine_metadata to file at output_file
-        with open(output_file, "w") as write_file:
-            json.dump(engine_metadata, write_file)
+        with open(output_file, "wb") as write_file:
+            write_file.write(orjson.dumps(engine_metadata))
 
         return
 
@@ -508,9 +741,31 @@ class GovulnersWrapperSingleton(object):
             latest_govulners_db_dir, govulners_db_version, self.VULNERABILITY_FILE_NAME
         )
         db_connect = self.SQL_LITE_URL_TEMPLATE.format(latest_govulners_db_file)
-        latest_govulners_db_engine = sqlalchemy.create_engine(db_connect, echo=False)
+        # Pool connections across threads instead of the sqlite file default of opening one per session
+        latest_govulners_db_engine = sqlalchemy.create_engine(
+            db_connect,
+            echo=False,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=max(8, os.cpu_count() or 1),
+            query_cache_size=self.SQL_LITE_QUERY_CACHE_SIZE,
+        )
+        sqlalchemy.event.listen(
+            latest_govulners_db_engine, "connect", self._set_sqlite_connect_pragmas
+        )
         return latest_govulners_db_engine
 
+    def _set_sqlite_connect_pragmas(self, dbapi_connection, connection_record):
+        """
+        Apply SQL_LITE_CONNECT_PRAGMAS to a new govulners_db sqlite connection
+        """
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in self.SQL_LITE_CONNECT_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
     def _init_latest_govulners_db_session_maker(self, govulners_db_engine) -> sessionmaker:
         """
         Create and return the db session maker
@@ -526,10 +781,10 @@ class GovulnersWrapperSingleton(object):
         lastest_govulners_db_archive: str,
         archive_checksum: str,
         govulners_db_version: str,
-    ) -> Tuple[str, sessionmaker]:
+    ) -> Tuple[str, sqlalchemy.engine.Engine, sessionmaker]:
         """
         Write the db string to file, create the engine, and create the session maker
-        Return the file and session maker
+        Return the file, engine and session maker
         """
         latest_govulners_db_dir = self._move_and_open_govulners_db_archive(
             lastest_govulners_db_archive, archive_checksum, govulners_db_version
@@ -541,8 +796,24 @@ class GovulnersWrapperSingleton(object):
             latest_govulners_db_engine
         )
 
-        # Return the dir and session maker
-        return latest_govulners_db_dir, latest_govulners_db_session_maker
+        # Return the dir, engine and session maker
+        return (
+            latest_govulners_db_dir,
+            latest_govulners_db_engine,
+            latest_govulners_db_session_maker,
+        )
+
+    @staticmethod
+    def _dispose_govulners_db_engine(govulners_db_engine) -> None:
+        """
+        Close the pooled connections of a govulners_db engine that was swapped out or unstaged, so they do not keep
+        the replaced db file open. Callers must hold write access to the govulners_db lock.
+        """
+        if govulners_db_engine is not None:
+            logger.info(
+                "Disposing govulners_db engine based on %s", govulners_db_engine.url
+            )
+            govulners_db_engine.dispose()
 
     def _remove_local_govulners_db(self, govulners_db_dir) -> None:
         """
@@ -585,47 +856,118 @@ class GovulnersWrapperSingleton(object):
                 archive_checksum,
             )
 
-        with self.write_lock_access():
-            # Store the db locally and
-            # Create the sqlalchemy session maker for the new db
+        with self._govulners_db_update_lock:
+            # The archive is unpacked into a dir named after its checksum. If that dir backs the production or
+            # staging govulners_db, its files are overwritten in place, so readers must be kept out the whole time.
+            if self._is_govulners_db_checksum_in_use(archive_checksum):
+                with self.write_lock_access():
+                    (
+                        latest_govulners_db_dir,
+                        latest_govulners_db_engine,
+                        latest_govulners_db_session_maker,
+                    ) = self._init_latest_govulners_db(
+                        govulners_db_archive_local_file_location,
+                        archive_checksum,
+                        govulners_db_version,
+                    )
+                    return self._set_govulners_db(
+                        latest_govulners_db_dir,
+                        govulners_db_version,
+                        latest_govulners_db_engine,
+                        latest_govulners_db_session_maker,
+                        archive_checksum,
+                        use_staging,
+                    )
+
+            # Otherwise store the db locally and create the sqlalchemy session maker for the new db before taking
+            # the write lock, so scans and queries against the current govulners_db continue in the meantime
             (
                 latest_govulners_db_dir,
+                latest_govulners_db_engine,
                 latest_govulners_db_session_maker,
             ) = self._init_latest_govulners_db(
                 govulners_db_archive_local_file_location, archive_checksum, govulners_db_version
             )
 
-            # Store the staged dir and session variables
-            if use_staging:
-                self._staging_govulners_db_dir = latest_govulners_db_dir
-                self._staging_govulners_db_version = govulners_db_version
-                self._staging_govulners_db_session_maker = latest_govulners_db_session_maker
-
-                logger.info(
-                    "Staging govulners_db updated to archive checksum %s",
+            with self.write_lock_access():
+                return self._set_govulners_db(
+                    latest_govulners_db_dir,
+                    govulners_db_version,
+                    latest_govulners_db_engine,
+                    latest_govulners_db_session_maker,
                     archive_checksum,
+                    use_staging,
                 )
-            else:
-                self._govulners_db_dir = latest_govulners_db_dir
-                self._govulners_db_version = govulners_db_version
-                self._govulners_db_session_maker = latest_govulners_db_session_maker
 
-                logger.info(
-                    "Production govulners_db updated to archive checksum %s",
-                    archive_checksum,
-                )
+    def _is_govulners_db_checksum_in_use(self, archive_checksum: str) -> bool:
+        """
+        Return True if the production or staging govulners_db was unpacked from an archive with the given checksum
+        """
+        return any(
+            govulners_db_dir and os.path.basename(govulners_db_dir) == archive_checksum
+            for govulners_db_dir in (
+                self._govulners_db_dir_internal,
+                self._staging_govulners_db_dir_internal,
+            )
+        )
 
-            # Return the engine metadata as a data object
-            return self.get_govulners_db_engine_metadata(use_staging=use_staging)
+    def _set_govulners_db(
+        self,
+        latest_govulners_db_dir: str,
+        govulners_db_version: str,
+        latest_govulners_db_engine: sqlalchemy.engine.Engine,
+        latest_govulners_db_session_maker: sessionmaker,
+        archive_checksum: str,
+        use_staging: bool,
+    ) -> Optional[GovulnersDBEngineMetadata]:
+        """
+        Swap in the provided govulners_db as the staging or production db, and dispose the engine it replaces.
+        Callers must hold write access to the govulners_db lock. Returns the engine metadata of the new db.
+        """
+        self._metadata_file_cache.clear()
+
+        # Store the staged dir and session variables
+        if use_staging:
+            replaced_govulners_db_engine = self._staging_govulners_db_engine_internal
+            self._staging_govulners_db_dir = latest_govulners_db_dir
+            self._staging_govulners_db_version = govulners_db_version
+            self._staging_govulners_db_session_maker = latest_govulners_db_session_maker
+            self._staging_govulners_db_engine_internal = latest_govulners_db_engine
+
+            logger.info(
+                "Staging govulners_db updated to archive checksum %s",
+                archive_checksum,
+            )
+        else:
+            replaced_govulners_db_engine = self._govulners_db_engine_internal
+            self._govulners_db_dir = latest_govulners_db_dir
+            self._govulners_db_version = govulners_db_version
+            self._govulners_db_session_maker = latest_govulners_db_session_maker
+            self._govulners_db_engine_internal = latest_govulners_db_engine
+
+            logger.info(
+                "Production govulners_db updated to archive checksum %s",
+                archive_checksum,
+            )
+
+        self._dispose_govulners_db_engine(replaced_govulners_db_engine)
+
+        # Return the engine metadata as a data object
+        return self.get_govulners_db_engine_metadata(use_staging=use_staging)
 
     def unstage_govulners_db(self) -> Optional[GovulnersDBEngineMetadata]:
         """
         Unstages the staged govulners_db. This method returns the production govulners_db engine metadata, if a production
         govulners_db has been set. Otherwise it returns None.
         """
-        self._staging_govulners_db_dir = None
-        self._staging_govulners_db_version = None
-        self._staging_govulners_db_session_maker = None
+        with self.write_lock_access():
+            self._staging_govulners_db_dir = None
+            self._staging_govulners_db_version = None
+            self._staging_govulners_db_session_maker = None
+            self._dispose_govulners_db_engine(
+                self._staging_govulners_db_engine_internal
+            )
+            self._staging_govulners_db_engine_internal = None
 
         # Return the existing, production engine metadata as a data object
         try:
@@ -637,10 +979,13 @@ class GovulnersWrapperSingleton(object):
             return None
 
     def _get_metadata_file_contents(
-        self, metadata_file_name, use_staging: bool = False
+        self, metadata_file_name, use_staging: bool = False, to_object=None
     ) -> json:
         """
-        Return the json contents of one of the metadata files for the in-use version of govulners db
+        Return the json contents of one of the metadata files for the in-use version of govulners db.
+        If to_object is provided, return the data object it builds from the contents instead, or None if the
+        file is empty or cannot be read. The result is cached and shared with other callers, so it must not be
+        modified.
         """
         # Get the path to the latest metadata file, staging or prod
         if use_staging:
@@ -654,8 +999,28 @@ class GovulnersWrapperSingleton(object):
                 self._govulners_db_dir, self._govulners_db_version, metadata_file_name
             )
 
-        # Ensure the file exists
-        return self.read_file_to_json(latest_metadata_file)
+        # The metadata files only change when govulners_db is updated, so reuse the parsed contents (or data object)
+        # for as long as the file's mtime is unchanged
+        try:
+            mtime = os.stat(latest_metadata_file).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        cache_key = (latest_metadata_file, to_object)
+        cached = self._metadata_file_cache.get(cache_key)
+        if mtime is not None and cached and cached[0] == mtime:
+            return cached[1]
+
+        contents = self.read_file_to_json(latest_metadata_file)
+        if contents is None:
+            return None
+
+        value = contents
+        if to_object:
+            value = to_object(contents) if contents else None
+        if mtime is not None:
+            self._metadata_file_cache[cache_key] = (mtime, value)
+        return value
 
     def get_govulners_db_metadata(
         self, use_staging: bool = False
@@ -665,16 +1030,12 @@ class GovulnersWrapperSingleton(object):
         This file contains metadata specific to govulners about the current govulners_db instance.
         This call can be parameterized to return either the production or staging metadata.
         """
-
-        db_metadata = self._get_metadata_file_contents(
-            self.METADATA_FILE_NAME, use_staging=use_staging
+        return self._get_metadata_file_contents(
+            self.METADATA_FILE_NAME,
+            use_staging=use_staging,
+            to_object=GovulnersDBMetadata.to_object,
         )
 
-        if db_metadata:
-            return GovulnersDBMetadata.to_object(db_metadata)
-        else:
-            return None
-
     def get_govulners_db_engine_metadata(
         self, use_staging: bool = False
     ) -> Optional[GovulnersDBEngineMetadata]:
@@ -683,35 +1044,33 @@ class GovulnersWrapperSingleton(object):
         This file contains metadata specific to engine about the current govulners_db instance.
         This call can be parameterized to return either the production or staging metadata.
         """
-
-        engine_metadata = self._get_metadata_file_contents(
-            self.ENGINE_METADATA_FILE_NAME, use_staging=use_staging
+        return self._get_metadata_file_contents(
+            self.ENGINE_METADATA_FILE_NAME,
+            use_staging=use_staging,
+            to_object=GovulnersDBEngineMetadata.to_object,
         )
 
-        if engine_metadata:
-            return GovulnersDBEngineMetadata.to_object(engine_metadata)
-        else:
-            return None
-
     def _get_env_variables(
         self, include_govulners_db: bool = True, use_staging: bool = False
     ) -> Dict[str, str]:
         # Set govulners env variables, optionally including the govulners db location
-        govulners_env = self.GOVULNERS_BASE_ENV_VARS.copy()
-        if include_govulners_db:
-            if use_staging:
-                govulners_env["GOVULNERS_DB_CACHE_DIR"] = self._staging_govulners_db_dir
-            else:
-                govulners_env["GOVULNERS_DB_CACHE_DIR"] = self._govulners_db_dir
+        if not include_govulners_db:
+            return dict(self._govulners_base_env)
 
-        env_variables = os.environ.copy()
-        env_variables.update(govulners_env)
-        return env_variables
+        if use_staging:
+            govulners_db_dir = self._staging_govulners_db_dir
+        else:
+            govulners_db_dir = self._govulners_db_dir
+
+        return {**self._govulners_base_env, "GOVULNERS_DB_CACHE_DIR": govulners_db_dir}
 
     def get_govulners_version(self) -> json:
         """
         Return version information for govulners
         """
+        if self._govulners_version is not None:
+            return self._govulners_version
+
         with self.read_lock_access():
             env_variables = self._get_env_variables(include_govulners_db=False)
 
@@ -722,9 +1081,7 @@ class GovulnersWrapperSingleton(object):
             stdout = None
             err = None
             try:
-                stdout, _ = run_check(
-                    shlex.split(self.GOVULNERS_VERSION_COMMAND), env=env_variables
-                )
+                stdout, _ = run_check(self.GOVULNERS_VERSION_COMMAND_ARGV, env=env_variables)
             except CommandException as exc:
                 logger.error(
                     "Exception running command: %s, stderr: %s",
@@ -733,30 +1090,30 @@ class GovulnersWrapperSingleton(object):
                 )
                 raise exc
 
-            # Return the output as json
-            return json.loads(stdout)
+        # Parse the output once the read lock is released, it does not depend on govulners_db
+        self._govulners_version = orjson.loads(stdout)
+        return self._govulners_version
 
-    def get_vulnerabilities_for_sbom(self, govulners_sbom: str) -> json:
+    def get_vulnerabilities_for_sbom(self, govulners_sbom: Union[str, bytes]) -> json:
         """
-        Use govulners to scan the provided sbom for vulnerabilites.
+        Use govulners to scan the provided sbom for vulnerabilites. The sbom may be passed already utf-8 encoded.
         """
         # Get the read lock
         with self.read_lock_access():
             # Get env variables to run the govulners scan with
             env_variables = self._get_env_variables()
 
-            # Format and run the command. Govulners supports piping in an sbom string
-            cmd = "{}".format(self.GOVULNERS_SUB_COMMAND)
-
+            # Run the command. Govulners supports piping in an sbom string. The sbom can be several MB, so it is only
+            # formatted into the message if spew logging is enabled
             logger.spew(
-                "Running govulners with command: {} | {}".format(
-                    govulners_sbom, self.GOVULNERS_SUB_COMMAND
-                )
+                "Running govulners with command: %s | %s",
+                govulners_sbom,
+                self.GOVULNERS_SUB_COMMAND,
             )
 
             try:
                 stdout, _ = run_check(
-                    shlex.split(cmd),
+                    self.GOVULNERS_SUB_COMMAND_ARGV,
                     input_data=govulners_sbom,
                     log_level="spew",
                     env=env_variables,
@@ -764,13 +1121,13 @@ class GovulnersWrapperSingleton(object):
             except CommandException as exc:
                 logger.error(
                     "Exception running command: %s, stderr: %s",
-                    cmd,
+                    self.GOVULNERS_SUB_COMMAND,
                     exc.stderr,
                 )
                 raise exc
 
-            # Return the output as json
-            return json.loads(stdout)
+        # Return the output as json, parsed once the read lock is released
+        return orjson.loads(stdout)
 
     def get_vulnerabilities_for_sbom_file(self, govulners_sbom_file: str) -> json:
         """
@@ -792,7 +1149,9 @@ class GovulnersWrapperSingleton(object):
             err = None
             try:
                 stdout, _ = run_check(
-                    shlex.split(cmd), log_level="spew", env=env_variables
+                    [*self.GOVULNERS_SUB_COMMAND_ARGV, "sbom:" + govulners_sbom_file],
+                    log_level="spew",
+                    env=env_variables,
                 )
             except CommandException as exc:
                 logger.error(
@@ -802,38 +1161,136 @@ class GovulnersWrapperSingleton(object):
                 )
                 raise exc
 
-            # Return the output as json
-            return json.loads(stdout)
+        # Return the output as json, parsed once the read lock is released
+        return orjson.loads(stdout)
 
     def query_vulnerability_metadata(
         self, vuln_ids: List[str], namespaces: List[str]
     ) -> Iterable[GovulnersVulnerabilityMetadata]:
         """
-        Provided a list of vulnerability ids and namespaces, returns a list of matching GovulnersVulnerabilityMetadata records
+        Provided a list of vulnerability ids and namespaces, returns a list of matching GovulnersVulnerabilityMetadata records.
+        The records are cached and shared with other callers, so they must not be modified
         """
 
         if not vuln_ids:
             logger.debug("No vulnerabilities provided for query")
             return []
 
-        with self.read_lock_access():
-            logger.debug(
-                "Querying govulners_db for GovulnersVulenrabilityMetadata records matching vuln_ids: %s, namespace: %s",
-                vuln_ids,
-                namespaces,
-            )
+        # Results are cached per vulnerability id and namespace filter, scan reports look up the same ids repeatedly
+        namespaces_key = frozenset(namespaces) if namespaces else None
+        unique_vuln_ids = list(dict.fromkeys(vuln_ids))
 
-            with self.govulners_session_scope() as session:
-                query = session.query(GovulnersVulnerabilityMetadata).filter(
-                    GovulnersVulnerabilityMetadata.id.in_(vuln_ids)
+        with self.read_lock_access():
+            results = []
+            uncached_vuln_ids = []
+            in_flight_lookups = []
+            query_done = threading.Event()
+            with self._vulnerability_metadata_cache_lock:
+                for vuln_id in unique_vuln_ids:
+                    cache_key = (vuln_id, namespaces_key)
+                    cached = self._vulnerability_metadata_cache.get(cache_key)
+                    if cached is not None:
+                        self._vulnerability_metadata_cache.move_to_end(cache_key)
+                        results.extend(cached)
+                    elif cache_key in self._vulnerability_metadata_in_flight:
+                        in_flight_lookups.append(
+                            (vuln_id, self._vulnerability_metadata_in_flight[cache_key])
+                        )
+                    else:
+                        self._vulnerability_metadata_in_flight[cache_key] = query_done
+                        uncached_vuln_ids.append(vuln_id)
+
+            if uncached_vuln_ids:
+                try:
+                    results.extend(
+                        self._query_and_cache_vulnerability_metadata(
+                            uncached_vuln_ids, namespaces, namespaces_key
+                        )
+                    )
+                finally:
+                    with self._vulnerability_metadata_cache_lock:
+                        for vuln_id in uncached_vuln_ids:
+                            self._vulnerability_metadata_in_flight.pop(
+                                (vuln_id, namespaces_key), None
+                            )
+                    query_done.set()
+
+            # Ids another thread was already querying are read from the cache once that query is done. If it failed, or
+            # the records were evicted in the meantime, they are queried here instead
+            unresolved_vuln_ids = []
+            for vuln_id, in_flight_query_done in in_flight_lookups:
+                in_flight_query_done.wait()
+                with self._vulnerability_metadata_cache_lock:
+                    cached = self._vulnerability_metadata_cache.get(
+                        (vuln_id, namespaces_key)
+                    )
+                if cached is None:
+                    unresolved_vuln_ids.append(vuln_id)
+                else:
+                    results.extend(cached)
+
+            if unresolved_vuln_ids:
+                results.extend(
+                    self._query_and_cache_vulnerability_metadata(
+                        unresolved_vuln_ids, namespaces, namespaces_key
+                    )
                 )
 
-                if namespaces:
-                    query = query.filter(
-                        GovulnersVulnerabilityMetadata.namespace.in_(namespaces)
+            return results
+
+    def _query_and_cache_vulnerability_metadata(
+        self,
+        vuln_ids: List[str],
+        namespaces: List[str],
+        namespaces_key: Optional[frozenset],
+    ) -> List[GovulnersVulnerabilityMetadata]:
+        """
+        Queries the GovulnersVulnerabilityMetadata records for the unique vuln_ids and namespaces, and stores them in the
+        metadata cache. Must be called while holding the read lock, so the records cannot be stored after the cache is
+        cleared for a db update
+        """
+        logger.debug(
+            "Querying govulners_db for GovulnersVulenrabilityMetadata records matching vuln_ids: %s, namespace: %s",
+            vuln_ids,
+            namespaces,
+        )
+
+        with self.govulners_session_scope() as session:
+            # Expanding bind params need a list, while callers may pass any collection e.g. a set of related ids
+            params = {}
+            if namespaces:
+                params["namespaces"] = list(namespaces)
+
+            records_by_vuln_id = {vuln_id: [] for vuln_id in vuln_ids}
+            if len(vuln_ids) > self.QUERY_VULN_IDS_TEMP_TABLE_THRESHOLD:
+                _load_query_vuln_ids(session, vuln_ids)
+                stmt = _vulnerability_metadata_select(bool(namespaces), True)
+                params_list = [params]
+            else:
+                stmt = _vulnerability_metadata_select(bool(namespaces))
+                params_list = (
+                    {**params, "vuln_ids": vuln_ids_batch}
+                    for vuln_ids_batch in _batched(
+                        vuln_ids, self.QUERY_VULN_IDS_BATCH_SIZE
                     )
+                )
+
+            for batch_params in params_list:
+                for record in session.execute(stmt, batch_params).scalars():
+                    records_by_vuln_id.setdefault(record.id, []).append(record)
 
-                return query.all()
+        results = []
+        with self._vulnerability_metadata_cache_lock:
+            for vuln_id, records in records_by_vuln_id.items():
+                self._vulnerability_metadata_cache[(vuln_id, namespaces_key)] = records
+                results.extend(records)
+            while (
+                len(self._vulnerability_metadata_cache)
+                > self.VULNERABILITY_METADATA_CACHE_SIZE
+            ):
+                self._vulnerability_metadata_cache.popitem(last=False)
+
+        return results
 
     def query_vulnerabilities(
         self,
@@ -865,29 +1322,33 @@ class GovulnersWrapperSingleton(object):
                 # GovulnersVulnerabilityMetadata contains info for the vulnerability. GovulnersVulnerability contains info for the affected/fixed package
                 # A vulnerability can impact 0 or more packages i.e. a GovulnersVulnerabilityMetadata row can be associated with 0 or more GovulnersVulnerability rows
                 # Since the lookup is for vulnerability information, the query should left outer join GovulnersVulnerabilityMetadata with GovulnersVulnerability
-                query = session.query(
-                    GovulnersVulnerability, GovulnersVulnerabilityMetadata
-                ).outerjoin(
-                    GovulnersVulnerability,
-                    and_(
-                        GovulnersVulnerability.id == GovulnersVulnerabilityMetadata.id,
-                        GovulnersVulnerability.namespace
-                        == GovulnersVulnerabilityMetadata.namespace,
-                    ),
+                stmt = _vulnerabilities_select(
+                    vuln_id is not None, namespace is not None, affected_package is not None
                 )
-
-                if vuln_id is not None:
-                    query = query.filter(GovulnersVulnerability.id.in_(vuln_id))
+                params = {}
                 if namespace is not None:
-                    query = query.filter(GovulnersVulnerability.namespace.in_(namespace))
+                    params["namespaces"] = list(namespace)
                 if affected_package is not None:
-                    query = query.filter(
-                        GovulnersVulnerability.package_name == affected_package
-                    )
+                    params["affected_package"] = affected_package
+
+                logger.debug("govulners_db sql query for vulnerabilities lookup: %s", stmt)
 
-                logger.debug("govulners_db sql query for vulnerabilities lookup: %s", query)
+                if vuln_id is None:
+                    return session.execute(stmt, params).all()
 
-                return query.all()
+                vuln_id = list(dict.fromkeys(vuln_id))
+                if len(vuln_id) > self.QUERY_VULN_IDS_TEMP_TABLE_THRESHOLD:
+                    _load_query_vuln_ids(session, vuln_id)
+                    stmt = _vulnerabilities_select(
+                        True, namespace is not None, affected_package is not None, True
+                    )
+                    return session.execute(stmt, params).all()
+
+                results = []
+                for vuln_ids_batch in _batched(vuln_id, self.QUERY_VULN_IDS_BATCH_SIZE):
+                    params["vuln_ids"] = vuln_ids_batch
+                    results.extend(session.execute(stmt, params))
+                return results
 
     def query_record_source_counts(self, use_staging: bool = False):
         """
@@ -899,30 +1360,24 @@ class GovulnersWrapperSingleton(object):
 
             # Get the counts for each record source
             with self.govulners_session_scope(use_staging) as session:
-                results = (
-                    session.query(
-                        GovulnersVulnerabilityMetadata.namespace,
-                        func.count(GovulnersVulnerabilityMetadata.namespace).label("count"),
-                    )
-                    .group_by(GovulnersVulnerabilityMetadata.namespace)
-                    .all()
-                )
-
-                # Get the timestamp from the current metadata file
-                last_synced = None
-                if db_metadata := self.get_govulners_db_metadata(use_staging):
-                    last_synced = db_metadata.built
-
-                # Transform the results along with the last_synced timestamp for each result
-                output = []
-                for group, count in results:
-                    record_source = RecordSource(
-                        count=count,
-                        feed=VULNERABILITIES,
-                        group=group,
-                        last_synced=last_synced,
-                    )
-                    output.append(record_source)
+                results = session.execute(_RECORD_SOURCE_COUNTS_SELECT).all()
+
+            # Get the timestamp from the current metadata file. This is normally served from the metadata cache,
+            # and is done after the session is closed since it does not need a db connection
+            last_synced = None
+            if db_metadata := self.get_govulners_db_metadata(use_staging):
+                last_synced = db_metadata.built
+
+        # Transform the results along with the last_synced timestamp for each result
+        output = []
+        for group, count in results:
+            record_source = RecordSource(
+                count=count,
+                feed=VULNERABILITIES,
+                group=group,
+                last_synced=last_synced,
+            )
+            output.append(record_source)
 
-                # Return the results
-                return output
+        # Return the results
+        return output
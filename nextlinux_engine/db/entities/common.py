@@ -174,6 +174,12 @@ def do_connect(db_params):
                 # Special case for testing with sqlite. Not for production use, unit tests only
                 engine = sqlalchemy.create_engine(db_connect, echo=True)
             else:
+                db_driver = sqlalchemy.engine.make_url(db_connect).get_driver_name()
+                if db_driver == "psycopg2":
+                    # The default only batches executemany INSERTs into multi-row VALUES statements, this also sends
+                    # the executemany UPDATEs and DELETEs of a flush in batches rather than one round trip per row
+                    db_engine_args.setdefault("executemany_mode", "values_plus_batch")
+
                 logger.debug(
                     "db_connect_args {} db_engine_args={}".format(
                         db_connect_args, db_engine_args
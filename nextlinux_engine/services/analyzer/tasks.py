@@ -24,6 +24,8 @@ class WorkerTask(threading.Thread):
         self.started_at = None
         self.finished_at = None
         self.status = Status.pending
+        self._done = threading.Event()
+        self._done_callbacks = []
 
     def _success(self):
         self.status = Status.success
@@ -50,10 +52,24 @@ class WorkerTask(threading.Thread):
         else:
             self._failed()
 
+    def add_done_callback(self, callback):
+        """
+        Register a callable to be invoked with this task, from the task's thread, once the task completes
+        """
+        self._done_callbacks.append(callback)
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
     def run(self):
-        self._pre_exec()
         try:
-            self.execute()
-            self._post_exec()
-        except Exception as ex:
-            self._post_exec(ex)
+            self._pre_exec()
+            try:
+                self.execute()
+                self._post_exec()
+            except Exception as ex:
+                self._post_exec(ex)
+        finally:
+            self._done.set()
+            for callback in self._done_callbacks:
+                callback(self)
@@ -1,5 +1,5 @@
-import copy
-import time
+import threading
+from typing import Optional
 
 from nextlinux_engine.clients.services import internal_client_for
 from nextlinux_engine.clients.services.simplequeue import SimpleQueueClient
@@ -61,65 +61,68 @@ class AnalysisWatcher(BaseWatcher):
         myconfig = config["services"]["analyzer"]
         max_analyze_threads = int(myconfig.get("max_threads", 1))
         layer_cache_enable = myconfig.get("layer_cache_enable", False)
+        owned_package_filtering_enabled = get_bool_value(
+            myconfig.get(PACKAGE_FILTERING_ENABLED_KEY, "true")
+        )
         logger.debug("max analysis threads: " + str(max_analyze_threads))
 
-        threads = []
+        # Tasks remove themselves from running_tasks as they complete and set task_completed, so a freed slot is
+        # refilled without waiting out the cycle and without checking every running task each cycle
+        running_tasks = set()
+        task_completed = threading.Event()
         layer_cache_dirty = True
+        q_client = None
+
+        def on_task_done(completed_task: WorkerTask):
+            running_tasks.discard(completed_task)
+            logger.info("worker thread completed")
+            task_completed.set()
 
         while True:
             logger.debug("analyzer thread cycle start")
             try:
-                q_client = internal_client_for(SimpleQueueClient, userId=None)
+                if q_client is None:
+                    q_client = internal_client_for(SimpleQueueClient, userId=None)
 
-                if len(threads) < max_analyze_threads:
+                # Fill every free worker slot this cycle rather than starting one task per cycle
+                while len(running_tasks) < max_analyze_threads:
                     logger.debug(
                         "analyzer has free worker threads {} / {}".format(
-                            len(threads), max_analyze_threads
+                            len(running_tasks), max_analyze_threads
                         )
                     )
                     qobj = q_client.dequeue(IMAGE_ANALYSIS_QUEUE)
-                    if qobj:
-                        myqobj = copy.deepcopy(qobj)
-                        logger.debug(
-                            "got work from queue task Id: {}".format(
-                                qobj.get("queueId", "unknown")
-                            )
-                        )
-                        logger.debug(
-                            "incoming queue object: " + str(myqobj)
-                        )  # Was "spew" level
+                    if not qobj:
+                        logger.debug("analyzer queue is empty - no more work this cycle")
+                        break
 
-                        message = QueueMessage.from_json(qobj)
-                        task = self.build_task(message, myconfig)
-                        task.start()
-                        threads.append(task)
-                        logger.debug("thread started")
-
-                        # Only analysis tasks can dirty the cache, import or other tasks don't use it
-                        if type(task) == ImageAnalysisTask:
-                            layer_cache_dirty = True
+                    logger.debug(
+                        "got work from queue task Id: %s", qobj.get("queueId", "unknown")
+                    )
+                    logger.debug("incoming queue object: %s", qobj)  # Was "spew" level
 
-                    else:
-                        logger.debug("analyzer queue is empty - no work this cycle")
+                    message = QueueMessage.from_json(qobj)
+                    task = self.build_task(
+                        message, myconfig, owned_package_filtering_enabled
+                    )
+                    task.add_done_callback(on_task_done)
+                    # Track the task before starting it, so it cannot complete before being added
+                    running_tasks.add(task)
+                    try:
+                        task.start()
+                    except Exception:
+                        running_tasks.discard(task)
+                        raise
+                    logger.debug("thread started")
+
+                    # Only analysis tasks can dirty the cache, import or other tasks don't use it
+                    if type(task) == ImageAnalysisTask:
+                        layer_cache_dirty = True
                 else:
                     logger.debug("all workers are busy")
 
-                alive_threads = []
-                while threads:
-                    athread = threads.pop()
-                    if not athread.is_alive():
-                        try:
-                            logger.debug("thread completed - joining")
-                            athread.join()
-                            logger.info("worker thread completed")
-                        except Exception as err:
-                            logger.warn("cannot join thread - exception: " + str(err))
-                    else:
-                        alive_threads.append(athread)
-                threads = alive_threads
-
                 # TODO: would like to fold this into the ImageAnalysisTask thread, but this basically assumes a mutex. Can add RLock later
-                if layer_cache_enable and layer_cache_dirty and len(threads) == 0:
+                if layer_cache_enable and layer_cache_dirty and not running_tasks:
                     logger.debug("running layer cache handler")
                     try:
                         handle_layer_cache()
@@ -131,17 +134,26 @@ class AnalysisWatcher(BaseWatcher):
 
             except Exception as err:
                 logger.exception("Failure in image analysis loop")
+                # Build a fresh client next cycle in case the failure came from its service endpoints or credentials
+                q_client = None
 
             logger.debug("analyzer thread cycle complete: next in " + str(cycle_timer))
-            time.sleep(cycle_timer)
+            task_completed.wait(timeout=cycle_timer)
+            task_completed.clear()
 
         return True
 
     @classmethod
-    def build_task(cls, message: QueueMessage, config: dict) -> WorkerTask:
-        owned_package_filtering_enabled = get_bool_value(
-            config.get(PACKAGE_FILTERING_ENABLED_KEY, "true")
-        )
+    def build_task(
+        cls,
+        message: QueueMessage,
+        config: dict,
+        owned_package_filtering_enabled: Optional[bool] = None,
+    ) -> WorkerTask:
+        if owned_package_filtering_enabled is None:
+            owned_package_filtering_enabled = get_bool_value(
+                config.get(PACKAGE_FILTERING_ENABLED_KEY, "true")
+            )
         if is_analysis_message(message.data):
             logger.info("Starting image analysis thread")
             return ImageAnalysisTask(
@@ -742,7 +742,7 @@ def get_image_metadata_by_type(imageDigest, mtype):
             return_object = {
                 "imageDigest": imageDigest,
                 "metadata_type": mtype,
-                "metadata": list(return_object.values())[0],
+                "metadata": next(iter(return_object.values())),
             }
 
     except Exception as err:
@@ -792,7 +792,7 @@ def get_image_content_by_type(imageDigest, ctype):
             return_object = {
                 "imageDigest": imageDigest,
                 "content_type": ctype,
-                "content": list(return_object.values())[0],
+                "content": next(iter(return_object.values())),
             }
 
     except Exception as err:
@@ -904,7 +904,7 @@ def get_image_vulnerabilities_by_type(
             return_object = {
                 "imageDigest": imageDigest,
                 "vulnerability_type": vulnerability_type,
-                "vulnerabilities": list(return_object.values())[0],
+                "vulnerabilities": next(iter(return_object.values())),
             }
 
     except Exception as err:
@@ -48,15 +48,14 @@ def get_credentials():
             mgr = identities.manager_factory.for_session(session)
             usr = mgr.get_user(ApiRequestContextProxy.identity().username)
 
-            creds = [
-                credential_db_to_msg(
-                    usr.get("credentials")[UserAccessCredentialTypes.password]
-                )
-            ]
-            if creds is None:
+            # Users without a password credential, e.g. those with only external credentials, have none to list
+            password = (usr.get("credentials") or {}).get(
+                UserAccessCredentialTypes.password
+            )
+            if password is None:
                 return [], 200
             else:
-                return creds, 200
+                return [credential_db_to_msg(password)], 200
     except Exception as ex:
         logger.exception("API Error")
         return make_response_error(errmsg=str(ex), in_httpcode=500), 500
@@ -3,6 +3,7 @@ from collections import namedtuple
 
 FeedGroupList = namedtuple("FeedGroupList", ["groups"])
 FeedList = namedtuple("FeedList", ["feeds"])
+FeedRecord = namedtuple("FeedRecord", ["meta", "groups"])
 GroupData = namedtuple(
     "GroupData", ["data", "next_token", "since", "record_count", "response_metadata"]
 )
@@ -1,14 +1,25 @@
 import abc
-import copy
 import datetime
 import json
+import random
+import threading
+import time
 from dataclasses import dataclass, field
 from io import BytesIO
-from typing import Any, Dict, Optional, Tuple, Union
+from operator import itemgetter
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlencode
 
-import ijson
+import orjson
 import requests
 import requests.exceptions
+from requests.adapters import HTTPAdapter
+
+try:
+    # The C backend parses much faster than the pure python default, use it when it is built
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    import ijson
 
 from nextlinux_engine.clients.govulners_wrapper import GovulnersWrapperSingleton
 from nextlinux_engine.common.models.schemas import (
@@ -25,22 +36,49 @@ from nextlinux_engine.services.policy_engine.engine.feeds import (
 from nextlinux_engine.services.policy_engine.engine.feeds.config import SyncConfig
 from nextlinux_engine.subsys import logger
 from nextlinux_engine.util.time import rfc3339str_to_datetime
-from nextlinux_engine.utils import (
-    NextlinuxException,
-    CommandException,
-    ensure_bytes,
-    ensure_str,
-)
+from nextlinux_engine.utils import NextlinuxException, CommandException
+
+# Top-level keys of a feed data page
+FEED_DATA_ITEMS_KEY = "data"
+FEED_DATA_NEXT_TOKEN_KEY = "next_token"
+FEED_DATA_CONTAINER_START_EVENTS = frozenset(("start_map", "start_array"))
+FEED_DATA_CONTAINER_END_EVENTS = frozenset(("end_map", "end_array"))
+# Pages up to this size are decoded whole, which is much faster than walking parser events. Larger pages are walked
+# with ijson so the decoded page is never held in memory
+FEED_DATA_DECODE_MAX_BYTES = 8 << 20
+
+# Prefixes of the content of a response for a failed request attempt
+_SERVER_ERROR_PREFIX = b"server error: "
+_TIMED_OUT_ERROR_PREFIX = _SERVER_ERROR_PREFIX + b"timed_out: "
+
+# Fields of the feed and group records in a listing, in the argument order of FeedAPIRecord and FeedAPIGroupRecord
+_get_listing_record_fields = itemgetter("name", "access_tier", "description")
 
-FEED_DATA_ITEMS_PATH = "data.item"
-FEED_DATA_NEXT_TOKEN_PATH = "next_token"
+
+def _build_listing_records(record_type, listing: list) -> list:
+    """
+    Returns a record_type for each feed or group in the listing. Listing pages are usually complete, so fields are
+    fetched with one itemgetter call per item, falling back to treating any missing field as None.
+    """
+    try:
+        return [record_type(*_get_listing_record_fields(x)) for x in listing]
+    except KeyError:
+        return [
+            record_type(
+                name=x.get("name"),
+                access_tier=x.get("access_tier"),
+                description=x.get("description"),
+            )
+            for x in listing
+        ]
 
 
 @dataclass
 class HTTPClientResponse:
     content_type: Optional[str] = None
     status_code: int = 1
-    content: bytes = b""
+    # Response bytes, or an iterator of chunks of them when the request was made with stream=True
+    content: Union[bytes, Iterator[bytes]] = b""
     success: bool = False
     headers: Dict[str, Any] = field(default_factory=dict)
 
@@ -73,7 +111,7 @@ class InvalidCredentialsError(HTTPClientException):
 class IAuthenticatedHTTPClientBase(abc.ABC):
     @abc.abstractmethod
     def execute_request(
-        self, method, url, connect_timeout=None, read_timeout=None, retries=None
+        self, method: str, url, connect_timeout=None, read_timeout=None, retries=None
     ):
         pass
 
@@ -93,7 +131,18 @@ class HTTPBasicAuthClient(IAuthenticatedHTTPClientBase):
         "conn_timeout": 3,
         "read_timeout": 60,
         "verify": True,
+        # Seconds to wait before retrying a connect timeout
+        "static_retry_interval": 1,
+        # Other failed attempts are retried after a random wait of up to backoff_base * 2^(attempt - 1) seconds,
+        # capped at backoff_cap seconds
+        "backoff_base": 0.5,
+        "backoff_cap": 30,
     }
+    # Feed syncs page through many requests to the same host, so connections are kept alive and reused across them
+    POOL_CONNECTIONS = 16
+    POOL_MAXSIZE = 32
+    # Size of the chunks a streamed response body is read in
+    STREAM_CHUNK_SIZE = 1 << 20
 
     def __init__(
         self,
@@ -104,19 +153,40 @@ class HTTPBasicAuthClient(IAuthenticatedHTTPClientBase):
         retries=None,
         verify=True,
     ):
-        self.auth_config = copy.copy(self.client_config)
+        self.auth_config = {
+            **self.client_config,
+            "conn_timeout": connect_timeout or self.client_config["conn_timeout"],
+            "read_timeout": read_timeout or self.client_config["read_timeout"],
+            "max_retries": retries or self.client_config["max_retries"],
+            "verify": verify,
+        }
         self._user = username
         self.password = password
         self.retries = retries
 
-        if connect_timeout:
-            self.auth_config["conn_timeout"] = connect_timeout
-        if read_timeout:
-            self.auth_config["read_timeout"] = read_timeout
-        if retries:
-            self.auth_config["max_retries"] = retries
+        # Coerced once here rather than on every request
+        self._conn_timeout = int(self.auth_config["conn_timeout"])
+        self._read_timeout = int(self.auth_config["read_timeout"])
+        self._max_retries = int(self.auth_config["max_retries"])
 
-        self.auth_config["verify"] = verify
+        # requests.Session is not thread-safe and a sync uses one client from several threads, so each gets its own
+        self._thread_local = threading.local()
+
+    @property
+    def _session(self) -> requests.Session:
+        """
+        Returns the calling thread's session, creating it on first use
+        """
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.POOL_CONNECTIONS, pool_maxsize=self.POOL_MAXSIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._thread_local.session = session
+        return session
 
     @property
     def user(self):
@@ -138,37 +208,65 @@ class HTTPBasicAuthClient(IAuthenticatedHTTPClientBase):
                 )
             )
 
+    def _get_retry_delay(self, attempt: int, connect_timed_out: bool) -> float:
+        """
+        Returns the seconds to wait before retrying the given failed attempt. A connect timeout has already waited out
+        its timeout, so it is retried after a short fixed interval. Other failures back off exponentially with full
+        jitter, so that clients retrying through an outage of the feed service do not all retry at the same time.
+        """
+        if connect_timed_out:
+            return self.auth_config["static_retry_interval"]
+
+        return random.uniform(
+            0,
+            min(
+                self.auth_config["backoff_cap"],
+                self.auth_config["backoff_base"] * 2 ** (attempt - 1),
+            ),
+        )
+
+    @classmethod
+    def _iter_response_content(cls, response: requests.Response) -> Iterator[bytes]:
+        """
+        Yields the body of a streamed response in chunks, releasing the connection back to the pool once it is read
+        """
+        try:
+            yield from response.iter_content(chunk_size=cls.STREAM_CHUNK_SIZE)
+        finally:
+            response.close()
+
     def authenticated_get(
         self, url, connect_timeout=None, read_timeout=None, retries=None
     ) -> HTTPClientResponse:
-        return self.execute_request(
-            requests.get, url, connect_timeout, read_timeout, retries
-        )
+        return self.execute_request("GET", url, connect_timeout, read_timeout, retries)
 
     def execute_request(
-        self, method, url, connect_timeout=None, read_timeout=None, retries=None
+        self,
+        method: str,
+        url,
+        connect_timeout=None,
+        read_timeout=None,
+        retries=None,
+        stream=False,
     ) -> HTTPClientResponse:
         """
         Execute an HTTP request with auth params and the specified timeout overrides
 
-        :param method: a callable for the http method to execute (e.g. requests.get, requests.put, ...)
+        :param method: the http method to execute (e.g. "GET", "PUT", ...)
         :param url:
         :param connect_timeout:
         :param read_timeout:
         :param retries:
+        :param stream: if True, the content of a successful response is an iterator of chunks of the body instead of
+            the whole body. Retries only cover getting the response, callers that read the body retry the request
+            if reading it fails.
         :return:
         """
 
         # make a request
-        if not connect_timeout:
-            connect_timeout = int(self.auth_config["conn_timeout"])
-
-        if not read_timeout:
-            read_timeout = int(self.auth_config["read_timeout"])
-
-        if not retries:
-            retries = int(self.auth_config["max_retries"])
-        retries = int(retries)
+        conn_timeout = int(connect_timeout) if connect_timeout else self._conn_timeout
+        read_timeout = int(read_timeout) if read_timeout else self._read_timeout
+        retries = int(retries) if retries else self._max_retries
 
         verify = self.auth_config["verify"]
 
@@ -177,48 +275,60 @@ class HTTPBasicAuthClient(IAuthenticatedHTTPClientBase):
         success = False
         count = 0
 
-        conn_timeout = int(connect_timeout)
-        read_timeout = int(read_timeout)
-
         while not success and count < retries:
             count += 1
-            logger.debug("get attempt " + str(count) + " of " + str(retries))
+            connect_timed_out = False
+            logger.debug("get attempt %s of %s", count, retries)
             try:
                 logger.debug(
-                    "making authenticated request (user={}, conn_timeout={}, read_timeout={}, verify={}) to url {}".format(
-                        str(self.user), conn_timeout, read_timeout, verify, str(url)
-                    )
+                    "making authenticated request (user=%s, conn_timeout=%s, read_timeout=%s, verify=%s) to url %s",
+                    self.user,
+                    conn_timeout,
+                    read_timeout,
+                    verify,
+                    url,
                 )
                 # TODO: move un-authed requests to new class or rename this class
                 auth = None
                 if self.user or self.password:
                     auth = (self.user, self.password)
-                r = method(
-                    url, auth=auth, timeout=(conn_timeout, read_timeout), verify=verify
+                # Issued on the client's session so the connection can be reused
+                r = self._session.request(
+                    method,
+                    url,
+                    auth=auth,
+                    timeout=(conn_timeout, read_timeout),
+                    verify=verify,
+                    stream=stream,
                 )
-                logger.debug("\tresponse status_code: " + str(r.status_code))
+                logger.debug("\tresponse status_code: %s", r.status_code)
                 if r.status_code == 200:
                     success = True
                     client_response.success = True
                 elif r.status_code == 401:
                     logger.debug(
-                        "Got HTTP 401 on authenticated {}, response body: {}".format(
-                            method.__name__, str(r.text)
-                        )
+                        "Got HTTP 401 on authenticated %s, response body: %s",
+                        method,
+                        r.text,
                     )
                     r.raise_for_status()
                 elif r.status_code in [403, 404]:
                     r.raise_for_status()
 
                 client_response.status_code = r.status_code
-                client_response.content_type = r.headers["Content-Type"]
-                client_response.content = r.content
+                # Only the media type, without parameters such as the charset, so callers can compare it directly
+                client_response.content_type = (
+                    r.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+                )
+                if stream and success:
+                    client_response.content = self._iter_response_content(r)
+                else:
+                    client_response.content = r.content
                 client_response.headers = r.headers
             except requests.exceptions.ConnectTimeout as err:
-                logger.debug("attempt failed: " + str(err))
-                client_response.content = ensure_bytes(
-                    "server error: timed_out: " + str(err)
-                )
+                connect_timed_out = True
+                logger.debug("attempt failed: %s", err)
+                client_response.content = _TIMED_OUT_ERROR_PREFIX + str(err).encode()
                 # return(ret)
 
             except requests.HTTPError as e:
@@ -226,11 +336,16 @@ class HTTPBasicAuthClient(IAuthenticatedHTTPClientBase):
                     self._map_error_to_exception(e, username=self.user, url=url)
                     # raise e
                 else:
-                    logger.debug("attempt failed: " + str(e))
-                    client_response.content = ensure_bytes("server error: " + str(e))
+                    logger.debug("attempt failed: %s", e)
+                    client_response.content = _SERVER_ERROR_PREFIX + str(e).encode()
             except Exception as err:
-                logger.debug("attempt failed: " + str(err))
-                client_response.content = ensure_bytes("server error: " + str(err))
+                logger.debug("attempt failed: %s", err)
+                client_response.content = _SERVER_ERROR_PREFIX + str(err).encode()
+
+            if not success and count < retries:
+                retry_delay = self._get_retry_delay(count, connect_timed_out)
+                logger.debug("retrying request in %.2f seconds", retry_delay)
+                time.sleep(retry_delay)
 
         return client_response
 
@@ -264,35 +379,29 @@ class FeedServiceClient(IFeedSource):
         self.group_url = self.feed_url + "/{feed}"
         self.group_data_url = self.group_url + "/{group}"
         self.retry_count = 3
+        # Group data urls rendered per (feed, group), since a group's data is requested once per page
+        self._group_data_base_urls: Dict[Tuple[str, str], str] = {}
 
     def list_feeds(self) -> FeedList:
         more_data = True
-        next_token = None
         feed_list = FeedList(feeds=[])
+        url = self.feed_url
 
         while more_data:
-            url = self.feed_url + (("?next_token=" + next_token) if next_token else "")
-
             try:
                 record = self.http_client.execute_request(
-                    requests.get, url, retries=self.retry_count
+                    "GET", url, retries=self.retry_count
                 )
 
                 if record.success:
-                    data = json.loads(ensure_str(record.content))
+                    data = orjson.loads(record.content)
                     if data and "feeds" in data:
                         feed_list.feeds.extend(
-                            [
-                                FeedAPIRecord(
-                                    name=x.get("name"),
-                                    description=x.get("description"),
-                                    access_tier=x.get("access_tier"),
-                                )
-                                for x in data["feeds"]
-                            ]
+                            _build_listing_records(FeedAPIRecord, data["feeds"])
                         )
                         if "next_token" in data and data["next_token"]:
                             next_token = data["next_token"]
+                            url = f"{self.feed_url}?next_token={next_token}"
                             more_data = True
                         else:
                             more_data = False
@@ -309,32 +418,23 @@ class FeedServiceClient(IFeedSource):
     def list_feed_groups(self, feed: str) -> FeedGroupList:
         group_list = FeedGroupList(groups=[])
         more_data = True
-        next_token = None
+        base_url = self.group_url.format(feed=feed)
+        url = base_url
 
         while more_data:
-            url = self.group_url.format(feed=feed) + (
-                ("?next_token=" + next_token) if next_token else ""
-            )
-
             try:
                 record = self.http_client.execute_request(
-                    requests.get, url, retries=self.retry_count
+                    "GET", url, retries=self.retry_count
                 )
                 if record.success:
-                    data = json.loads(ensure_str(record.content))
+                    data = orjson.loads(record.content)
                     if "groups" in data:
                         group_list.groups.extend(
-                            [
-                                FeedAPIGroupRecord(
-                                    name=x.get("name"),
-                                    description=x.get("description"),
-                                    access_tier=x.get("access_tier"),
-                                )
-                                for x in data["groups"]
-                            ]
+                            _build_listing_records(FeedAPIGroupRecord, data["groups"])
                         )
                     if "next_token" in data and data["next_token"]:
                         next_token = data["next_token"]
+                        url = f"{base_url}?next_token={next_token}"
                         more_data = True
                     else:
                         more_data = False
@@ -343,7 +443,7 @@ class FeedServiceClient(IFeedSource):
                         "Feed list operation failed. Msg: {}.".format(record.content)
                     )
             except Exception as e:
-                logger.debug("Error executing feed listing: {}".format(e))
+                logger.debug("Error executing feed listing: %s", e)
                 raise e
 
         return group_list
@@ -375,7 +475,7 @@ class FeedServiceClient(IFeedSource):
                     "Feed list operation failed. Msg: {}.".format(record.content)
                 )
         except Exception as e:
-            logger.debug("Error executing feed data download: {}".format(e))
+            logger.debug("Error executing feed data download: %s", e)
             raise e
 
     def get_raw_feed_group_data(
@@ -388,53 +488,95 @@ class FeedServiceClient(IFeedSource):
         if since and not isinstance(since, datetime.datetime):
             raise TypeError("since should be a datetime object")
 
-        baseurl = self.group_data_url.format(feed=feed, group=group)
-        if since:
-            baseurl += "?since={}".format(since.isoformat())
-            if next_token:
-                url = baseurl + "&next_token={}".format(next_token)
-            else:
-                url = baseurl
-        elif next_token:
-            url = baseurl + "?next_token={}".format(next_token)
-        else:
-            url = baseurl
+        baseurl = self._group_data_base_urls.get((feed, group))
+        if baseurl is None:
+            baseurl = self.group_data_url.format(feed=feed, group=group)
+            self._group_data_base_urls[(feed, group)] = baseurl
+
+        query = urlencode(
+            [
+                (key, value)
+                for key, value in (
+                    ("since", since.isoformat() if since else None),
+                    ("next_token", next_token),
+                )
+                if value
+            ]
+        )
+        url = baseurl + "?" + query if query else baseurl
 
-        logger.debug("data group url: " + str(url))
+        logger.debug("data group url: %s", url)
         try:
             return self.http_client.execute_request(
-                requests.get, url, retries=self.retry_count
+                "GET", url, retries=self.retry_count
             )
         except Exception as e:
-            logger.debug("Error executing feed data download: {}".format(e))
+            logger.debug("Error executing feed data download: %s", e)
             raise e
 
     @staticmethod
     def _extract_response_data(response_text):
-        next_token = None
-        sio = BytesIO(response_text)
-        count = 0
-
-        # Get the next token
-        p = ijson.items(sio, FEED_DATA_NEXT_TOKEN_PATH)
-        d = [x for x in p]
-        if len(d) == 1:
-            next_token = d[0]
+        if len(response_text) <= FEED_DATA_DECODE_MAX_BYTES:
+            next_token, count = FeedServiceClient._decode_response_data(response_text)
+        else:
+            next_token, count = FeedServiceClient._parse_response_data(response_text)
 
         # Be explicit, no empty strings
         if not next_token:
             next_token = None
 
-        # Get the record count
+        logger.debug("Found %s records in data chunk", count)
+
+        return next_token, response_text, count
+
+    @staticmethod
+    def _decode_response_data(response_text) -> Tuple[Optional[str], int]:
+        page = orjson.loads(response_text)
+        if not isinstance(page, dict):
+            return None, 0
+
+        data = page.get(FEED_DATA_ITEMS_KEY)
+        return (
+            page.get(FEED_DATA_NEXT_TOKEN_KEY),
+            len(data) if isinstance(data, list) else 0,
+        )
+
+    @staticmethod
+    def _parse_response_data(response_text) -> Tuple[Optional[str], int]:
+        next_token = None
+        sio = BytesIO(response_text)
+        count = 0
+
+        # Get the next token and the record count in a single pass over the basic parser events, tracking the nesting
+        # depth instead of letting ijson build a prefix for every event. Every event at depth 2 inside the data array
+        # begins an item, except the event closing the array itself.
         # Not using the special parser for handling decimals here because this isn't on the return path, just counting records
-        sio.seek(0)
-        for _ in ijson.items(sio, FEED_DATA_ITEMS_PATH):
-            count += 1
+        depth = 0
+        key = None
+        in_items = False
+        for event, value in ijson.basic_parse(sio):
+            if depth == 2 and in_items:
+                if event == "end_array":
+                    in_items = False
+                else:
+                    count += 1
+            elif depth == 1:
+                if event == "map_key":
+                    key = value
+                elif key == FEED_DATA_ITEMS_KEY and event == "start_array":
+                    in_items = True
+                elif key == FEED_DATA_NEXT_TOKEN_KEY:
+                    next_token = value
+                    key = None
+
+            if event in FEED_DATA_CONTAINER_START_EVENTS:
+                depth += 1
+            elif event in FEED_DATA_CONTAINER_END_EVENTS:
+                depth -= 1
 
-        logger.debug("Found {} records in data chunk".format(count))
         sio.close()
 
-        return next_token, response_text, count
+        return next_token, count
 
 
 class GovulnersDBUnavailable(FeedClientError):
@@ -491,7 +633,7 @@ class GovulnersDBServiceClient(IFeedSource):
                 FeedAPIRecord(
                     name="govulnersdb",
                     description="govulnersdb feed",
-                    access_tier="0",
+                    access_tier=0,
                 )
             ]
         )
@@ -507,16 +649,22 @@ class GovulnersDBServiceClient(IFeedSource):
         """
         logger.info("Downloading govulnersdb listing.json from %s", self.feed_url)
         listing_response = self.http_client.execute_request(
-            requests.get, self.feed_url, retries=self.RETRY_COUNT
+            "GET", self.feed_url, retries=self.RETRY_COUNT
         )
         if not listing_response.success:
             raise HTTPStatusException(listing_response)
-        listings_json = json.loads(listing_response.content.decode("utf-8"))
         required_govulners_db_version = self._get_supported_govulners_db_version()
-        available_dbs = listings_json.get("available").get(required_govulners_db_version)
-        if not available_dbs:
+        # The listing covers every schema version, so it is parsed incrementally and only up to the first listing
+        # for the required version, rather than loading the whole document
+        raw_db_listing = next(
+            ijson.items(
+                BytesIO(listing_response.content),
+                "available.{}.item".format(required_govulners_db_version),
+            ),
+            None,
+        )
+        if not raw_db_listing:
             raise GovulnersDBUnavailable(required_govulners_db_version)
-        raw_db_listing = available_dbs[0]
         logger.info("Found relevant govulnersdb listing: %s", raw_db_listing)
         return raw_db_listing
 
@@ -537,7 +685,7 @@ class GovulnersDBServiceClient(IFeedSource):
                 FeedAPIGroupRecord(
                     name="govulnersdb:vulnerabilities",
                     description="govulnersdb:vulnerabilities group",
-                    access_tier="0",
+                    access_tier=0,
                     govulners_listing=GovulnersDBListing(**govulners_db_listing),
                 )
             ]
@@ -575,8 +723,9 @@ class GovulnersDBServiceClient(IFeedSource):
         govulners_db_listing = self._list_feed_groups()
         govulners_db_url = govulners_db_listing["url"]
         logger.info("Downloading govulnersdb %s", govulners_db_url)
+        # The db archive is streamed, so it is written out in chunks rather than held in memory whole
         govulners_db_download_response = self.http_client.execute_request(
-            requests.get, govulners_db_url, retries=self.RETRY_COUNT
+            "GET", govulners_db_url, retries=self.RETRY_COUNT, stream=True
         )
         if not govulners_db_download_response.success:
             raise HTTPStatusException(govulners_db_download_response)
@@ -590,7 +739,7 @@ class GovulnersDBServiceClient(IFeedSource):
         next_token: str = None,
     ) -> GroupData:
         """
-        Retrieves a single Govulners DB, storing the raw bytes in GroupData.data.
+        Retrieves a single Govulners DB, storing an iterator of chunks of the raw bytes in GroupData.data.
 
         :param feed: feed name (unused)
         :type feed: str
@@ -600,7 +749,7 @@ class GovulnersDBServiceClient(IFeedSource):
         :type since: Optional[datetime.datetime]
         :param next_token: token for pagination (unused)
         :type next_token: str
-        :return: GroupData where GroupData.data contains the raw bytes and GroupData.response_metadata contains the listing information.
+        :return: GroupData where GroupData.data iterates over the raw bytes and GroupData.response_metadata contains the listing information.
         :rtype: GroupData
         """
         try:
@@ -1,5 +1,6 @@
 from typing import Optional
 
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.exc import MultipleResultsFound
 
 from nextlinux_engine.db import FeedGroupMetadata, FeedMetadata, get_session
@@ -182,4 +183,5 @@ def get_feed_group_detached(feed_name, group_name):
 
 
 def get_all_feeds(db):
-    return db.query(FeedMetadata).all()
+    # Callers walk the groups of every feed, so load them all in one query up front instead of one per feed
+    return db.query(FeedMetadata).options(selectinload(FeedMetadata.groups)).all()
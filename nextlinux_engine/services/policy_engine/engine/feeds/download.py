@@ -4,7 +4,9 @@ import json
 import os
 import shutil
 from dataclasses import dataclass
-from typing import Dict, Generator, Tuple
+from typing import Dict, Generator, Iterable, Tuple, Union
+
+import requests.exceptions
 
 from nextlinux_engine.common.models.schemas import (
     DownloadOperationConfiguration,
@@ -13,7 +15,7 @@ from nextlinux_engine.common.models.schemas import (
     GroupDownloadResult,
     LocalFeedDataRepoMetadata,
 )
-from nextlinux_engine.services.policy_engine.engine.feeds import IFeedSource
+from nextlinux_engine.services.policy_engine.engine.feeds import GroupData, IFeedSource
 from nextlinux_engine.subsys import logger
 from nextlinux_engine.utils import ensure_bytes, mapped_parser_item_iterator, timer
 
@@ -92,14 +94,19 @@ class LocalFeedDataRepo(object):
         with open(self.metadata_file_path) as f:
             self.metadata = LocalFeedDataRepoMetadata.from_json(json.load(f))
 
-    def write_data(self, feed, group, chunk_id, data: bytes):
+    def write_data(self, feed, group, chunk_id, data: Union[bytes, Iterable[bytes]]):
         write_dir = os.path.join(self.root_dir, feed, group)
 
         os.makedirs(write_dir, exist_ok=True)
 
         outfile = os.path.join(write_dir, str(chunk_id))
         with open(outfile, "w+b") as f:
-            f.write(data)
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                # Streamed data is written out as it is read
+                for chunk in data:
+                    f.write(chunk)
 
     def write_json(self, feed, group, chunk_id, data):
         b = ensure_bytes(json.dumps(data))
@@ -321,6 +328,15 @@ class FeedDownloader(object):
         complete = "complete"
         failed = "failed"
 
+    # A streamed page, e.g. the govulners db archive, is read after its request returns, so a connection dropped
+    # while reading it is retried here by requesting the page again
+    STREAM_READ_ATTEMPTS = 3
+    STREAM_READ_ERRORS = (
+        requests.exceptions.ChunkedEncodingError,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.ReadTimeout,
+    )
+
     def __init__(
         self,
         download_root_dir: str,
@@ -476,17 +492,13 @@ class FeedDownloader(object):
                     chunk_number, group.feed, group.group
                 )
             )
-            group_data = self.service_client.get_feed_group_data(
-                group.feed, group.group, since=since, next_token=next_token
+            group_data = self._fetch_and_write_group_page(
+                group, chunk_number, since, next_token
             )
             get_next = bool(group_data.next_token)
             next_token = group_data.next_token
             count += group_data.record_count
             group_metadata = {str(chunk_number): group_data.response_metadata}
-            if group_data.data is not None:
-                self.local_repo.write_data(
-                    group.feed, group.group, chunk_number, ensure_bytes(group_data.data)
-                )
             chunk_number += 1
             yield group_data.record_count, group_metadata
 
@@ -495,3 +507,48 @@ class FeedDownloader(object):
                 group.feed, group.group, chunk_number
             )
         )
+
+    def _fetch_and_write_group_page(
+        self,
+        group: GroupDownloadOperationConfiguration,
+        chunk_number: int,
+        since,
+        next_token,
+    ) -> GroupData:
+        """
+        Download a single page of the group's data and write it into the local repo. If reading a streamed page
+        fails, the page is requested again and rewritten from its first chunk, up to STREAM_READ_ATTEMPTS times
+
+        :param group: group download op configuration
+        :type group: GroupDownloadOperationConfiguration
+        :return: the downloaded page
+        :rtype: GroupData
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            group_data = self.service_client.get_feed_group_data(
+                group.feed, group.group, since=since, next_token=next_token
+            )
+            if group_data.data is None:
+                return group_data
+
+            data = group_data.data
+            if isinstance(data, str):
+                data = ensure_bytes(data)
+            try:
+                self.local_repo.write_data(group.feed, group.group, chunk_number, data)
+                return group_data
+            except self.STREAM_READ_ERRORS as err:
+                if attempt >= self.STREAM_READ_ATTEMPTS:
+                    raise
+                logger.warn(
+                    "Reading page {} of feed data for feed group {}/{} failed on attempt {} of {}, downloading it again: {}".format(
+                        chunk_number,
+                        group.feed,
+                        group.group,
+                        attempt,
+                        self.STREAM_READ_ATTEMPTS,
+                        err,
+                    )
+                )
@@ -65,6 +65,9 @@ class GovulnersDBSyncManager:
     Sync govulners db to local instance of policy engine if it has been updated globally
     """
 
+    # Incremented each time the local govulners db is updated, so readers can drop anything cached from the old db
+    generation = 0
+
     @classmethod
     def _get_active_govulnersdb(cls, session) -> GovulnersDBFeedMetadata:
         """
@@ -192,6 +195,7 @@ class GovulnersDBSyncManager:
                     active_govulnersdb=active_govulnersdb,
                     govulnersdb_file_path=govulnersdb_file_path,
                 )
+                cls.generation += 1
                 return True
             else:
                 return False
@@ -47,8 +47,8 @@ class KeyIDFeedDataMapper(FeedDataMapper):
     """
 
     def map(self, record_json):
-        if len(list(record_json.keys())) == 1:
-            key, value = list(record_json.items())[0]
+        if len(record_json) == 1:
+            key, value = next(iter(record_json.items()))
             return self.map_inner(key, value)
 
     def map_inner(self, key, data):
@@ -7,23 +7,22 @@ data. Additionally, any new feed will require new code to be able to consume it
 an update to the feed handling code is ok to be required as well.
 
 """
+import concurrent.futures
 import os
 import time
 import uuid
 from dataclasses import asdict
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional
 
 from nextlinux_engine.clients.services.catalog import CatalogClient
 from nextlinux_engine.common.models.schemas import (
     DownloadOperationConfiguration,
-    FeedAPIGroupRecord,
-    FeedAPIRecord,
     GroupDownloadOperationConfiguration,
     GroupDownloadOperationParams,
 )
 from nextlinux_engine.configuration import localconfig
 from nextlinux_engine.db import FeedGroupMetadata
-from nextlinux_engine.services.policy_engine.engine.feeds import IFeedSource
+from nextlinux_engine.services.policy_engine.engine.feeds import FeedRecord, IFeedSource
 from nextlinux_engine.services.policy_engine.engine.feeds.db import get_all_feeds_detached
 from nextlinux_engine.services.policy_engine.engine.feeds.download import (
     FeedDownloader,
@@ -87,6 +86,7 @@ class DataFeeds(object):
     _proxy = None
 
     __scratch_dir__ = None  # Override location for the downloads to write
+    __group_listing_workers__ = 4  # Max concurrent upstream group listing requests
 
     @classmethod
     def instance(cls):
@@ -118,7 +118,7 @@ class DataFeeds(object):
     def get_feed_group_information(
         feed_client: IFeedSource,
         to_sync: List[str] = None,
-    ) -> Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]:
+    ) -> Dict[str, FeedRecord]:
         """
         Uses API client to populate a mapping.
 
@@ -126,24 +126,29 @@ class DataFeeds(object):
         :type feed_client: IFeedSource
         :param to_sync: list of feed names to download
         :type to_sync: List[str]
-        :return: mapping containing API response
-        :rtype: Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]
+        :return: mapping of feed names to FeedRecord containing API response
+        :rtype: Dict[str, FeedRecord]
         """
         if not to_sync:
             return {}
 
         source_resp = feed_client.list_feeds()
-        if to_sync:
-            feeds = filter(lambda x: x.name in to_sync, source_resp.feeds)
-        else:
-            feeds = []
-        source_feeds = {
-            x.name: {
-                "meta": x,
-                "groups": feed_client.list_feed_groups(x.name).groups,
+        feeds = [x for x in source_resp.feeds if x.name in to_sync]
+        if not feeds:
+            return {}
+
+        # Each feed's group listing is a separate upstream request, so they are made concurrently
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(feeds), DataFeeds.__group_listing_workers__),
+            thread_name_prefix="feed_group_listing",
+        ) as executor:
+            group_lists = executor.map(
+                lambda x: feed_client.list_feed_groups(x.name), feeds
+            )
+            source_feeds = {
+                x.name: FeedRecord(meta=x, groups=group_list.groups)
+                for x, group_list in zip(feeds, group_lists)
             }
-            for x in feeds
-        }
         logger.debug("Upstream feeds available: %s", source_feeds)
         return source_feeds
 
@@ -338,7 +343,49 @@ class DataFeeds(object):
         )
         download_dir = os.path.join(base_dir, "policy_engine_tmp", "feed_syncs")
 
+        download_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="feed_download"
+        )
+
+        def start_group_download(
+            group: FeedGroupMetadata,
+        ) -> concurrent.futures.Future:
+            """
+            Queues the download of just one group into a download result. Errors setting up the download are set on the
+            returned future, so they are handled along with download errors when the group is synced
+            """
+            try:
+                downloader = FeedDownloader(
+                    download_root_dir=download_dir,
+                    config=download_operation_config_factory(
+                        feed_client.feed_url, db_groups_to_sync=[group]
+                    ),
+                    client=feed_client,
+                    fetch_all=full_flush,
+                )
+            except Exception as e:
+                failed_download = concurrent.futures.Future()
+                failed_download.set_exception(e)
+                return failed_download
+
+            logger.debug("Groups to download {}".format(downloader.config.groups))
+            return download_executor.submit(
+                downloader.execute, feed_name=group.feed_name, group_name=group.name
+            )
+
+        def discard_group_download(download: Optional[concurrent.futures.Future]):
+            """
+            Cancels a queued group download that will not be synced, or cleans up its data if it already started
+            """
+            if download is None or download.cancel():
+                return
+            try:
+                download.result().teardown()
+            except Exception:
+                logger.exception("Could not cleanup download repo due to error")
+
         feed_data_repo = None
+        next_download = None
         try:
             # Order by feed
             for f in feeds_to_sync:
@@ -357,23 +404,21 @@ class DataFeeds(object):
                     ]
                     logger.debug("Groups to sync {}".format(groups_to_sync))
 
-                    # Filter groups by that feed
-                    for g in groups_to_sync:
-
-                        # Down load just one group into a download result
-                        group_download_config = download_operation_config_factory(
-                            feed_client.feed_url, db_groups_to_sync=[g]
-                        )
-                        downloader = FeedDownloader(
-                            download_root_dir=download_dir,
-                            config=group_download_config,
-                            client=feed_client,
-                            fetch_all=full_flush,
+                    # Filter groups by that feed. Each group's download is queued behind the one before it, so the
+                    # next group is fetched from the network while the current one is synced to the db
+                    next_download = (
+                        start_group_download(groups_to_sync[0])
+                        if groups_to_sync
+                        else None
+                    )
+                    for i, g in enumerate(groups_to_sync):
+                        download = next_download
+                        next_download = (
+                            start_group_download(groups_to_sync[i + 1])
+                            if i + 1 < len(groups_to_sync)
+                            else None
                         )
 
-                        logger.debug(
-                            "Groups to download {}".format(downloader.config.groups)
-                        )
                         try:
                             notify_event(
                                 FeedGroupSyncStarted(feed=g.feed_name, group=g.name),
@@ -386,9 +431,7 @@ class DataFeeds(object):
                                     g.feed_name, g.name, operation_id
                                 )
                             )
-                            feed_data_repo = downloader.execute(
-                                feed_name=g.feed_name, group_name=g.name
-                            )
+                            feed_data_repo = download.result()
 
                             logger.info(
                                 "Download complete. Syncing to db (feed={}, group={}, operation_id={})".format(
@@ -468,6 +511,9 @@ class DataFeeds(object):
                     logger.exception(
                         "Error syncing {} (operation_id={})".format(f, operation_id)
                     )
+                finally:
+                    discard_group_download(next_download)
+                    next_download = None
 
                 if feed_result.status == "success":
                     notify_event(
@@ -489,6 +535,8 @@ class DataFeeds(object):
         finally:
             if feed_data_repo:
                 feed_data_repo.teardown()
+            discard_group_download(next_download)
+            download_executor.shutdown(wait=True)
 
         return result
 
@@ -1,12 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Union
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 from sqlalchemy.orm.session import Session
 
-from nextlinux_engine.common.models.schemas import FeedAPIGroupRecord, FeedAPIRecord
 from nextlinux_engine.db import FeedGroupMetadata, FeedMetadata
 from nextlinux_engine.db import get_thread_scoped_session as get_session
-from nextlinux_engine.services.policy_engine.engine.feeds import IFeedSource
+from nextlinux_engine.services.policy_engine.engine.feeds import FeedRecord, IFeedSource
 from nextlinux_engine.services.policy_engine.engine.feeds.client import (
     FeedServiceClient,
     GovulnersDBServiceClient,
@@ -29,24 +28,27 @@ GOVULNERS_DB_FEED_NAME = GovulnersDBFeed.__feed_name__
 class MetadataSyncUtils:
     @staticmethod
     def _pivot_and_filter_feeds_by_config(
-        to_sync: list, source_found: list, db_found: list
+        to_sync: Iterable[str], source_found: Iterable[str], db_found: list
     ) -> Dict[str, FeedMetadata]:
         """
         Filters FeedMetadata records to only include those that are configured
 
-        :param to_sync: list of feed names requested to be synced
-        :param source_found: list of feed names available as returned by the upstream source
+        :param to_sync: feed names requested to be synced, a set or frozenset is used as is
+        :param source_found: feed names available as returned by the upstream source
         :param db_found: list of db records that were updated as result of upstream metadata sync (this is to handle db update failures)
         :return: dict of feed names to FeedMetadata records
         :rtype: Dict[str, FeedMetadata]
         """
-        available = set(to_sync).intersection(set(source_found))
+        if not isinstance(to_sync, AbstractSet):
+            to_sync = frozenset(to_sync)
+        # intersection() takes any iterable, so the upstream names are not copied into a set of their own
+        available = to_sync.intersection(source_found)
         return {x.name: x for x in db_found if x.name in available}
 
     @staticmethod
     def _sync_feed_metadata(
         db: Session,
-        feed_api_record: Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]],
+        feed_api_record: FeedRecord,
         db_feeds: Dict[str, FeedMetadata],
         operation_id: Optional[str] = None,
     ) -> Dict[str, FeedMetadata]:
@@ -56,7 +58,7 @@ class MetadataSyncUtils:
         :param db: database session
         :type db: Session
         :param feed_api_record: data from API client
-        :type feed_api_record: Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
+        :type feed_api_record: FeedRecord
         :param db_feeds: map of feed names to FeedMetadata
         :type db_feeds: Dict[str, FeedMetadata]
         :param operation_id: UUID4 hexadecimal string
@@ -64,14 +66,14 @@ class MetadataSyncUtils:
         :return: map of feed names to FeedMetadata that has been updated or created in the DB
         :rtype: Dict[str, FeedMetadata]
         """
-        api_feed = feed_api_record["meta"]
+        api_feed = feed_api_record.meta
         db_feed = db_feeds.get(api_feed.name)
         # Do this instead of a db.merge() to ensure no timestamps are reset or overwritten
         if not db_feed:
             logger.debug(
-                "Adding new feed metadata record to db: {} (operation_id={})".format(
-                    api_feed.name, operation_id
-                )
+                "Adding new feed metadata record to db: %s (operation_id=%s)",
+                api_feed.name,
+                operation_id,
             )
             db_feed = FeedMetadata(
                 name=api_feed.name,
@@ -79,21 +81,22 @@ class MetadataSyncUtils:
                 access_tier=api_feed.access_tier,
                 enabled=True,
             )
+            # Not flushed here: the new feed is inserted along with its new groups, which the unit of work batches into
+            # a single executemany, and as a pending object its empty groups collection needs no lazy load
             db.add(db_feed)
-            db.flush()
             return {api_feed.name: db_feed}
         else:
             logger.debug(
-                "Feed metadata already in db: {} (operation_id={})".format(
-                    api_feed.name, operation_id
-                )
+                "Feed metadata already in db: %s (operation_id=%s)",
+                api_feed.name,
+                operation_id,
             )
             return db_feeds
 
     @staticmethod
     def _sync_feed_group_metadata(
         db: Session,
-        feed_api_record: Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]],
+        feed_api_record: FeedRecord,
         db_feeds: Dict[str, FeedMetadata],
         operation_id: Optional[str] = None,
     ) -> None:
@@ -103,27 +106,27 @@ class MetadataSyncUtils:
         :param db: database session
         :type db: Session
         :param feed_api_record: data from API client
-        :type feed_api_record: Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
+        :type feed_api_record: FeedRecord
         :param db_feeds: map of feed names to FeedMetadata tied to DB session
         :type db_feeds: Dict[str, FeedMetadata]
         :param operation_id: UUID4 hexadecimal string
         :type operation_id: Optional[str]
         """
-        api_feed = feed_api_record["meta"]
+        api_feed = feed_api_record.meta
         db_feed = db_feeds.get(api_feed.name)
         # Check for any update
         db_feed.description = api_feed.description
         db_feed.access_tier = api_feed.access_tier
 
         db_groups = {x.name: x for x in db_feed.groups}
-        for api_group in feed_api_record.get("groups", []):
+        for api_group in feed_api_record.groups:
             db_group = db_groups.get(api_group.name)
             # Do this instead of a db.merge() to ensure no timestamps are reset or overwritten
             if not db_group:
                 logger.debug(
-                    "Adding new feed metadata record to db: {} (operation_id={})".format(
-                        api_group.name, operation_id
-                    )
+                    "Adding new feed metadata record to db: %s (operation_id=%s)",
+                    api_group.name,
+                    operation_id,
                 )
                 db_group = FeedGroupMetadata(
                     name=api_group.name,
@@ -136,9 +139,9 @@ class MetadataSyncUtils:
                 db.add(db_group)
             else:
                 logger.debug(
-                    "Feed group metadata already in db: {} (operation_id={})".format(
-                        api_group.name, operation_id
-                    )
+                    "Feed group metadata already in db: %s (operation_id=%s)",
+                    api_group.name,
+                    operation_id,
                 )
 
             db_group.access_tier = api_group.access_tier
@@ -146,10 +149,8 @@ class MetadataSyncUtils:
 
     @staticmethod
     def sync_metadata(
-        source_feeds: Dict[
-            str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
-        ],
-        to_sync: List[str] = None,
+        source_feeds: Dict[str, FeedRecord],
+        to_sync: Iterable[str] = None,
         operation_id: Optional[str] = None,
         groups: bool = True,
     ) -> Tuple[Dict[str, FeedMetadata], List[Tuple[str, Union[str, BaseException]]]]:
@@ -159,10 +160,10 @@ class MetadataSyncUtils:
 
         If a record exists in db but was not found upstream, it is not returned
 
-        :param source_feeds: mapping containing FeedAPIRecord and FeedAPIGroupRecord
-        :type source_feeds: Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]
-        :param to_sync: list of string feed names to sync metadata on
-        :type to_sync: List[str]
+        :param source_feeds: mapping of feed names to FeedRecord, containing FeedAPIRecord and FeedAPIGroupRecord
+        :type source_feeds: Dict[str, FeedRecord]
+        :param to_sync: string feed names to sync metadata on, a set or frozenset is used as is
+        :type to_sync: Iterable[str]
         :param operation_id: UUID4 hexadecimal string
         :type operation_id: Optional[str]
         :param groups: whether or not to sync group metadata (defaults to True, which will sync group metadata)
@@ -177,57 +178,68 @@ class MetadataSyncUtils:
         db = get_session()
         try:
             logger.info(
-                "Syncing feed and group metadata from upstream source (operation_id={})".format(
-                    operation_id
-                )
+                "Syncing feed and group metadata from upstream source (operation_id=%s)",
+                operation_id,
             )
             failed = []
+            to_sync_names = (
+                to_sync if isinstance(to_sync, AbstractSet) else frozenset(to_sync)
+            )
+            # Only the configured feeds are processed, so narrow the upstream records to those up front
+            source_feeds = {
+                feed_name: feed_api_record
+                for feed_name, feed_api_record in source_feeds.items()
+                if feed_name in to_sync_names
+            }
             db_feeds = MetadataSyncUtils._pivot_and_filter_feeds_by_config(
-                to_sync, list(source_feeds.keys()), get_all_feeds(db)
+                to_sync_names, source_feeds.keys(), get_all_feeds(db)
             )
+            # The configured feeds found upstream with their records as of the sync, kept up to date as feeds are
+            # added rather than reloaded from the db afterwards
+            synced_feeds = dict(db_feeds)
 
+            logger.info(
+                "Syncing metadata for %d feeds: %s (operation_id=%s)",
+                len(source_feeds),
+                list(source_feeds),
+                operation_id,
+            )
             for feed_name, feed_api_record in source_feeds.items():
                 try:
-                    logger.info(
-                        "Syncing metadata for feed: {} (operation_id={})".format(
-                            feed_name, operation_id
-                        )
+                    logger.debug(
+                        "Syncing metadata for feed: %s (operation_id=%s)",
+                        feed_name,
+                        operation_id,
                     )
                     feed_metadata_map = MetadataSyncUtils._sync_feed_metadata(
                         db, feed_api_record, db_feeds, operation_id
                     )
+                    synced_feeds.update(feed_metadata_map)
                     if groups:
                         MetadataSyncUtils._sync_feed_group_metadata(
                             db, feed_api_record, feed_metadata_map, operation_id
                         )
                 except Exception as e:
-                    logger.exception("Error syncing feed {}".format(feed_name))
+                    logger.exception("Error syncing feed %s", feed_name)
                     logger.warn(
-                        "Could not sync metadata for feed: {} (operation_id={})".format(
-                            feed_name, operation_id
-                        )
+                        "Could not sync metadata for feed: %s (operation_id=%s)",
+                        feed_name,
+                        operation_id,
                     )
                     failed.append((feed_name, e))
-                finally:
-                    db.flush()
-
-            # Reload
-            db_feeds = MetadataSyncUtils._pivot_and_filter_feeds_by_config(
-                to_sync, list(source_feeds.keys()), get_all_feeds(db)
-            )
 
+            # All feeds' changes are flushed together by the commit, so the unit of work can batch their inserts
             db.commit()
             logger.info(
-                "Metadata sync from feeds upstream source complete (operation_id={})".format(
-                    operation_id
-                )
+                "Metadata sync from feeds upstream source complete (operation_id=%s)",
+                operation_id,
             )
-            return db_feeds, failed
+            return synced_feeds, failed
         except Exception as e:
             logger.error(
-                "Rolling back feed metadata update due to error: {} (operation_id={})".format(
-                    e, operation_id
-                )
+                "Rolling back feed metadata update due to error: %s (operation_id=%s)",
+                e,
+                operation_id,
             )
             db.rollback()
             raise
@@ -247,6 +259,7 @@ class SyncUtilProvider(ABC):
             sync_configs
         )
         self._to_sync: List[str] = self._get_feeds_to_sync()
+        self._to_sync_names: FrozenSet[str] = frozenset(self._to_sync)
 
     @property
     def to_sync(self) -> List[str]:
@@ -258,6 +271,16 @@ class SyncUtilProvider(ABC):
         """
         return self._to_sync
 
+    @property
+    def to_sync_names(self) -> FrozenSet[str]:
+        """
+        Getter for the set of feeds to sync, for membership checks.
+
+        :return: set of feeds to sync
+        :rtype: FrozenSet[str]
+        """
+        return self._to_sync_names
+
     def _get_feeds_to_sync(self):
         """
         Convert dict of sync configs to list of feed names that are enabled for this provider.
@@ -293,16 +316,14 @@ class SyncUtilProvider(ABC):
     @abstractmethod
     def sync_metadata(
         self,
-        source_feeds: Dict[
-            str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
-        ],
+        source_feeds: Dict[str, FeedRecord],
         operation_id: Optional[str],
     ) -> Tuple[Dict[str, FeedMetadata], List[Tuple[str, Union[str, BaseException]]]]:
         """
         Wraps MetadataSyncUtils.sync_metadata so that it may be called with arguments appropriate for the provider.
 
-        :param source_feeds: mapping containing FeedAPIRecord and FeedAPIGroupRecord
-        :type source_feeds: Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]
+        :param source_feeds: mapping of feed names to FeedRecord, containing FeedAPIRecord and FeedAPIGroupRecord
+        :type source_feeds: Dict[str, FeedRecord]
         :param operation_id: UUID4 hexadecimal string
         :type operation_id: Optional[str]
         :return: response of MetadataSyncUtils.sync_metadata()
@@ -313,17 +334,15 @@ class SyncUtilProvider(ABC):
     @staticmethod
     @abstractmethod
     def get_groups_to_download(
-        source_feeds: Dict[
-            str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
-        ],
+        source_feeds: Dict[str, FeedRecord],
         feeds_to_sync: List[DataFeed],
         operation_id: str,
     ) -> List[FeedGroupMetadata]:
         """
         Returns a list of FeedGroupMetadata for each feed group to download.
 
-        :param source_feeds: mapping containing FeedAPIRecord and FeedAPIGroupRecord
-        :type source_feeds: Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]
+        :param source_feeds: mapping of feed names to FeedRecord, containing FeedAPIRecord and FeedAPIGroupRecord
+        :type source_feeds: Dict[str, FeedRecord]
         :param feeds_to_sync: ordered list of DataFeed(s) to sync
         :type feeds_to_sync: List[DataFeed]
         :param operation_id: UUID4 hexadecimal string
@@ -393,34 +412,32 @@ class LegacySyncUtilProvider(SyncUtilProvider):
         :return: instance of FeedServiceClient
         :rtype: FeedServiceClient
         """
-        sync_config = list(self._sync_configs.values())[0]
+        sync_config = next(iter(self._sync_configs.values()))
         return get_feeds_client(sync_config)
 
     def sync_metadata(
         self,
-        source_feeds: Dict[
-            str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
-        ],
+        source_feeds: Dict[str, FeedRecord],
         operation_id: Optional[str],
     ) -> Tuple[Dict[str, FeedMetadata], List[Tuple[str, Union[str, BaseException]]]]:
         """
         Wraps MetadataSyncUtils.sync_metadata so that it may be called with arguments appropriate for the provider.
         In this case, we want to make sure that syncing FeedGroupMetadata is enabled for the legacy feeds.
 
-        :param source_feeds: mapping containing FeedAPIRecord and FeedAPIGroupRecord
-        :type source_feeds: Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]
+        :param source_feeds: mapping of feed names to FeedRecord, containing FeedAPIRecord and FeedAPIGroupRecord
+        :type source_feeds: Dict[str, FeedRecord]
         :param operation_id: UUID4 hexadecimal string
         :type operation_id: Optional[str]
         :return: response of MetadataSyncUtils.sync_metadata()
         :rtype: Tuple[Dict[str, FeedMetadata], List[Tuple[str, Union[str, BaseException]]]]
         """
-        return MetadataSyncUtils.sync_metadata(source_feeds, self.to_sync, operation_id)
+        return MetadataSyncUtils.sync_metadata(
+            source_feeds, self.to_sync_names, operation_id
+        )
 
     @staticmethod
     def get_groups_to_download(
-        source_feeds: Dict[
-            str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
-        ],
+        source_feeds: Dict[str, FeedRecord],
         feeds_to_sync: List[DataFeed],
         operation_id: str,
     ) -> List[FeedGroupMetadata]:
@@ -428,45 +445,50 @@ class LegacySyncUtilProvider(SyncUtilProvider):
         Iterates over feeds_to_sync, reads the FeedMetadata, and makes a list of FeedGroupMetadata objects where
         enabled == True.
 
-        :param source_feeds: mapping containing FeedAPIRecord and FeedAPIGroupRecord
-        :type source_feeds: Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]
+        :param source_feeds: mapping of feed names to FeedRecord, containing FeedAPIRecord and FeedAPIGroupRecord
+        :type source_feeds: Dict[str, FeedRecord]
         :param feeds_to_sync: ordered list of DataFeed(s) to sync
         :type feeds_to_sync: List[DataFeed]
         :param operation_id: UUID4 hexadecimal string
         :type operation_id: Optional[str]
         :return:
         """
-        # Do the fetches
+        logger.info(
+            "Initialized feeds to sync: %s (operation_id=%s)",
+            [f.__feed_name__ for f in feeds_to_sync],
+            operation_id,
+        )
         groups_to_download = []
+        disabled_feeds = []
+        disabled_groups = []
         for f in feeds_to_sync:
-            logger.info(
-                "Initialized feed to sync: {} (operation_id={})".format(
-                    f.__feed_name__, operation_id
-                )
-            )
-            if f.metadata:
-                if f.metadata.enabled:
-                    for g in f.metadata.groups:
-                        if g.enabled:
-                            groups_to_download.append(g)
-                        else:
-                            logger.info(
-                                "Will not sync/download group {} of feed {} because group is explicitly disabled".format(
-                                    g.name, g.feed_name
-                                )
-                            )
-                else:
-                    logger.info(
-                        "Skipping feed {} because it is explicitly not enabled".format(
-                            f.__feed_name__
-                        )
-                    )
-            else:
+            metadata = f.metadata
+            if not metadata:
                 logger.warn(
-                    "No metadata found for feed {}. Unexpected but not an error (operation_id={})".format(
-                        f.__feed_name__, operation_id
-                    )
+                    "No metadata found for feed %s. Unexpected but not an error (operation_id=%s)",
+                    f.__feed_name__,
+                    operation_id,
                 )
+                continue
+            if not metadata.enabled:
+                disabled_feeds.append(f.__feed_name__)
+                continue
+            for g in metadata.groups:
+                if g.enabled:
+                    groups_to_download.append(g)
+                else:
+                    # Group names are not unique across feeds
+                    disabled_groups.append("%s/%s" % (metadata.name, g.name))
+        if disabled_feeds:
+            logger.info(
+                "Skipping feeds %s because they are explicitly not enabled",
+                disabled_feeds,
+            )
+        if disabled_groups:
+            logger.info(
+                "Will not sync/download groups %s because they are explicitly disabled",
+                disabled_groups,
+            )
         return groups_to_download
 
     @staticmethod
@@ -541,50 +563,54 @@ class GovulnersDBSyncUtilProvider(SyncUtilProvider):
 
     def sync_metadata(
         self,
-        source_feeds: Dict[
-            str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
-        ],
+        source_feeds: Dict[str, FeedRecord],
         operation_id: Optional[str],
     ) -> Tuple[Dict[str, FeedMetadata], List[Tuple[str, Union[str, BaseException]]]]:
         """
         Wraps MetadataSyncUtils.sync_metadata so that it may be called with arguments appropriate for the provider.
         In this case, we want to make sure that syncing FeedGroupMetadata is disabled for govulnersdb feed.
 
-        :param source_feeds: mapping containing FeedAPIRecord and FeedAPIGroupRecord
-        :type source_feeds: Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]
+        :param source_feeds: mapping of feed names to FeedRecord, containing FeedAPIRecord and FeedAPIGroupRecord
+        :type source_feeds: Dict[str, FeedRecord]
         :param operation_id: UUID4 hexadecimal string
         :type operation_id: Optional[str]
         :return: response of MetadataSyncUtils.sync_metadata()
         :rtype: Tuple[Dict[str, FeedMetadata], List[Tuple[str, Union[str, BaseException]]]]
         """
         return MetadataSyncUtils.sync_metadata(
-            source_feeds, self.to_sync, operation_id, groups=False
+            source_feeds, self.to_sync_names, operation_id, groups=False
         )
 
     @staticmethod
     def get_groups_to_download(
-        source_feeds: Dict[
-            str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]
-        ],
+        source_feeds: Dict[str, FeedRecord],
         feeds_to_sync: List[DataFeed],
         operation_id: str,
     ) -> List[FeedGroupMetadata]:
         """
         Creates a FeedGroupMetadata record that is never added to the database. We purposefully avoid adding the feed
         attribute to the record so that this record does not get created implicitly by sqlalchemy back-population.
-        Uses FeedMetadata from feeds_to_sync. Expects only one record is present for govulnersdb.
+        Uses FeedMetadata from feeds_to_sync. Raises ValueError unless exactly one feed and one group are present for
+        govulnersdb.
 
-        :param source_feeds: mapping containing FeedAPIRecord and FeedAPIGroupRecord
-        :type source_feeds: Dict[str, Dict[str, Union[FeedAPIRecord, List[FeedAPIGroupRecord]]]]
+        :param source_feeds: mapping of feed names to FeedRecord, containing FeedAPIRecord and FeedAPIGroupRecord
+        :type source_feeds: Dict[str, FeedRecord]
         :param feeds_to_sync: ordered list of DataFeed(s) to sync
         :type feeds_to_sync: List[DataFeed]
         :param operation_id: UUID4 hexadecimal string
         :type operation_id: Optional[str]
         :return:
         """
-        # TODO consider throwing exceptions if length is not 1 for these
-        api_feed_group = source_feeds[GOVULNERS_DB_FEED_NAME]["groups"][0]
-        feed_metadata = feeds_to_sync[0].metadata
+        try:
+            (api_feed_group,) = source_feeds[GOVULNERS_DB_FEED_NAME].groups
+            (feed,) = feeds_to_sync
+        except (KeyError, ValueError) as e:
+            raise ValueError(
+                "Expected exactly one {} feed and group to sync".format(
+                    GOVULNERS_DB_FEED_NAME
+                )
+            ) from e
+        feed_metadata = feed.metadata
         groups_to_download = []
         if feed_metadata.enabled:
             groups_to_download.append(
@@ -1,6 +1,9 @@
 import datetime
+import os
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import namedtuple
+from threading import RLock
+from typing import Optional, Tuple
 
 from nextlinux_engine.db import DistroNamespace, session_scope
 from nextlinux_engine.db.db_govulners_db_feed_metadata import (
@@ -14,7 +17,21 @@ from nextlinux_engine.services.policy_engine.engine.feeds.feeds import (
     feed_registry,
     have_vulnerabilities_for,
 )
-from nextlinux_engine.subsys import logger
+from nextlinux_engine.services.policy_engine.engine.feeds.govulnersdb_sync import (
+    GovulnersDBSyncManager,
+)
+from nextlinux_engine.subsys import caching, logger
+
+ACTIVE_GOVULNERSDB_CACHE_TTL = int(
+    os.getenv("NEXTLINUX_POLICY_ENGINE_ACTIVE_GOVULNERSDB_CACHE_TTL", 30)
+)
+
+OLDEST_FEED_SYNC_CACHE_TTL = int(
+    os.getenv("NEXTLINUX_POLICY_ENGINE_OLDEST_FEED_SYNC_CACHE_TTL", 30)
+)
+
+# What the gates need from the active govulners db. group_names is None when there is no active db
+ActiveGovulnersDB = namedtuple("ActiveGovulnersDB", ["built_at", "group_names"])
 
 
 class GateUtilProvider(ABC):
@@ -55,6 +72,11 @@ class LegacyGateUtilProvider(GateUtilProvider):
     Gate-specific logic for the LegacyProvider.
     """
 
+    # Gates look up the sync time of the same few namespaces for every image they evaluate, and it only changes on a
+    # feed sync, so it is cached briefly per set of namespace names
+    __oldest_sync_cache__ = caching.TTLCache(default_ttl_sec=OLDEST_FEED_SYNC_CACHE_TTL)
+    __oldest_sync_cache_lock__ = RLock()
+
     def oldest_namespace_feed_sync(
         self, namespace: DistroNamespace
     ) -> datetime.datetime:
@@ -66,15 +88,33 @@ class LegacyGateUtilProvider(GateUtilProvider):
         :return: the time of the oldest feed sync
         :rtype: datetime.datetime
         """
-        oldest_update = None
         if not namespace:
             raise ValueError(
                 "must have valid DistroNamespace object for namespace parameter"
             )
 
-        for namespace_name in namespace.like_namespace_names:
+        cache_key = tuple(namespace.like_namespace_names)
+        with self.__oldest_sync_cache_lock__:
+            # Cached as a 1-tuple so that a namespace without a feed group (None) is cached too
+            cached = self.__oldest_sync_cache__.lookup(cache_key)
+        if cached is not None:
+            return cached[0]
+
+        # Looked up outside of the lock so that a miss does not hold up gates evaluating in other threads
+        oldest_update = self._lookup_oldest_namespace_feed_sync(cache_key)
+        with self.__oldest_sync_cache_lock__:
+            self.__oldest_sync_cache__.cache_it(cache_key, (oldest_update,))
+        return oldest_update
+
+    @staticmethod
+    def _lookup_oldest_namespace_feed_sync(
+        like_namespace_names: Tuple[str, ...]
+    ) -> Optional[datetime.datetime]:
+        oldest_update = None
+        feed_names = feed_registry.registered_vulnerability_feed_names()
+        for namespace_name in like_namespace_names:
             # Check feed names
-            for feed in feed_registry.registered_vulnerability_feed_names():
+            for feed in feed_names:
                 # First match, assume only one matches for the namespace
                 group = get_feed_group_detached(feed, namespace_name)
                 if group:
@@ -98,6 +138,51 @@ class GovulnersGateUtilProvider(GateUtilProvider):
     Gate-specific logic for the GovulnersProvider.
     """
 
+    # The active db is looked up for every namespace a gate evaluates but only changes on a sync, so it is cached
+    # briefly, keyed on the local db generation so that a local db update is seen right away
+    __active_db_cache__ = caching.TTLCache(default_ttl_sec=ACTIVE_GOVULNERSDB_CACHE_TTL)
+    __active_db_cache_lock__ = RLock()
+
+    @staticmethod
+    def _load_active_govulnersdb() -> ActiveGovulnersDB:
+        with session_scope() as session:
+            try:
+                govulnersdb = get_most_recent_active_govulnersdb(session)
+            except NoActiveGovulnersDB:
+                return ActiveGovulnersDB(built_at=None, group_names=None)
+
+            return ActiveGovulnersDB(
+                built_at=govulnersdb.built_at,
+                group_names=frozenset(
+                    group["name"]
+                    for group in govulnersdb.groups or []
+                    if group["record_count"] > 0
+                ),
+            )
+
+    @classmethod
+    def get_active_govulnersdb(cls) -> ActiveGovulnersDB:
+        """
+        Get the build time and the names of the groups with records of the active govulners db, from the cache if
+        it was looked up recently
+
+        :return: the active govulners db
+        :rtype: ActiveGovulnersDB
+        """
+        generation = GovulnersDBSyncManager.generation
+        with cls.__active_db_cache_lock__:
+            active_db = cls.__active_db_cache__.lookup(generation)
+        if active_db is not None:
+            return active_db
+
+        # Looked up outside of the lock so that a miss does not hold up gates evaluating in other threads
+        active_db = cls._load_active_govulnersdb()
+        with cls.__active_db_cache_lock__:
+            # Anything cached is either expired or from an earlier generation
+            cls.__active_db_cache__.flush()
+            cls.__active_db_cache__.cache_it(generation, active_db)
+        return active_db
+
     def oldest_namespace_feed_sync(
         self, namespace: DistroNamespace
     ) -> Optional[datetime.datetime]:
@@ -110,32 +195,17 @@ class GovulnersGateUtilProvider(GateUtilProvider):
         :return: the time of the oldest feed sync
         :rtype: datetime.datetime
         """
-        with session_scope() as session:
-            try:
-                govulnersdb = get_most_recent_active_govulnersdb(session)
-                return govulnersdb.built_at
-            except NoActiveGovulnersDB:
-                return None
+        return self.get_active_govulnersdb().built_at
 
     def have_vulnerabilities_for(self, distro_namespace_obj: DistroNamespace) -> bool:
-        with session_scope() as session:
-            try:
-                govulnersdb = get_most_recent_active_govulnersdb(session)
-            except NoActiveGovulnersDB:
-                logger.info(
-                    "No vulnerabilities for image distro found because no active govulners db found"
-                )
-                return False
-
-            if not govulnersdb or not govulnersdb.groups:
-                return False
-
-            groups = [
-                group["name"] for group in govulnersdb.groups if group["record_count"] > 0
-            ]
-
-        for namespace_name in distro_namespace_obj.like_namespace_names:
-            if namespace_name in groups:
-                return True
-        else:
+        groups = self.get_active_govulnersdb().group_names
+        if groups is None:
+            logger.info(
+                "No vulnerabilities for image distro found because no active govulners db found"
+            )
             return False
+
+        return any(
+            namespace_name in groups
+            for namespace_name in distro_namespace_obj.like_namespace_names
+        )
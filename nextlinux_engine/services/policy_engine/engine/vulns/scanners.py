@@ -2,11 +2,13 @@
 Scanners are responsible for finding vulnerabilities in an image.
 A scanner may use persistence context or an external tool to match image content with vulnerability data and return those matches
 """
+import concurrent.futures
 import datetime
-import json
 import os
+from functools import lru_cache
 from typing import Dict, List, Tuple, Union
 
+import orjson
 from sqlalchemy.orm.session import Session
 
 from nextlinux_engine.clients.govulners_wrapper import GovulnersWrapperSingleton
@@ -43,12 +45,24 @@ SAVE_SBOM_TO_FILE = (
     os.getenv("NEXTLINUX_POLICY_ENGINE_SAVE_SBOM_TO_FILE", "false").lower() == "true"
 )
 
+# Fetches image content from catalog while scans check the govulners db, shared by all scans in the process
+IMAGE_CONTENT_FETCH_WORKERS = int(
+    os.getenv("NEXTLINUX_POLICY_ENGINE_IMAGE_CONTENT_FETCH_WORKERS", 8)
+)
+image_content_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=IMAGE_CONTENT_FETCH_WORKERS, thread_name_prefix="image_content"
+)
+
+# Image content types fetched for the sbom, for now supported content types are os and non-os packages. Kept as a
+# list since the catalog client only sends list content types as a filter
+SUPPORTED_CONTENT_TYPES = ["os"] + list(nonos_package_types)
+
 # Distros that only add a CVE record to their secdb entries when a fix is available
 nvd_distro_matching_enabled = (
     os.getenv("NEXTLINUX_ENABLE_DISTRO_NVD_MATCHES", "true").lower() == "true"
 )
 
-FIX_ONLY_DISTROS = ["alpine"]
+FIX_ONLY_DISTROS = frozenset({"alpine"})
 
 
 def is_fix_only_distro(distro_name: str) -> bool:
@@ -61,6 +75,27 @@ def is_fix_only_distro(distro_name: str) -> bool:
     return distro_name in FIX_ONLY_DISTROS
 
 
+def _log_discarded_image_content_error(image_content: concurrent.futures.Future):
+    if not image_content.cancelled() and image_content.exception() is not None:
+        logger.error(
+            "Ignoring error fetching image content for a scan that ended early: %s",
+            image_content.exception(),
+        )
+
+
+def discard_image_content(image_content: concurrent.futures.Future):
+    """
+    Cancels an image content fetch whose result will not be used, or if it is already running, logs any error it
+    ends with since nothing else will retrieve it
+    """
+    if not image_content.cancel():
+        image_content.add_done_callback(_log_discarded_image_content_error)
+
+
+# Distros whose packages are also matched by cpe, the env flag is fixed for the process so it is folded in once here
+NVD_MATCHED_DISTROS = FIX_ONLY_DISTROS if nvd_distro_matching_enabled else frozenset()
+
+
 class LegacyScanner:
     """
     Scanner wrapping the legacy vulnerabilities subsystem.
@@ -84,7 +119,7 @@ class LegacyScanner:
         nvd_cls: type = NvdV2Metadata,
         cpe_cls: type = CpeV2Vulnerability,
     ):
-        if nvd_distro_matching_enabled and is_fix_only_distro(image.distro_name):
+        if image.distro_name in NVD_MATCHED_DISTROS:
             matcher = DistroEnabledCpeMatcher(nvd_cls, cpe_cls)
         else:
             matcher = NonOSCpeMatcher(nvd_cls, cpe_cls)
@@ -117,9 +152,10 @@ class GovulnersScanner:
             .all()
         )
 
-    def _get_image_content(self, image: Image) -> Dict:
+    def _get_image_content(self, account: str, image_digest: str) -> Dict:
         """
-        Produces image content map where the key is either 'os' or one of the non-os package types, values are lists of packages
+        Produces image content map where the key is either 'os' or one of the non-os package types, values are lists of packages.
+        Takes the image's account and digest rather than the image record so it can run off the request thread
 
         Example output
         {
@@ -157,22 +193,18 @@ class GovulnersScanner:
           ]
         }
         """
-        all_content = {}
-        catalog_client = internal_client_for(CatalogClient, userId=image.user_id)
-
-        # for now supported content types are os and non-os packages
-        supported_content_types = ["os"] + list(nonos_package_types)
+        catalog_client = internal_client_for(CatalogClient, userId=account)
 
         logger.debug(
             "Fetching %s content for %s from catalog",
-            supported_content_types,
-            image.digest,
+            SUPPORTED_CONTENT_TYPES,
+            image_digest,
         )
 
         # fetch image content from catalog for now. preferred approach is provide image content as the input to vuln matcher
         all_content = catalog_client.get_image_content_multiple_types(
-            image_digest=image.digest,
-            content_types=supported_content_types,
+            image_digest=image_digest,
+            content_types=SUPPORTED_CONTENT_TYPES,
             allow_analyzing_state=True,
         )
 
@@ -220,10 +252,17 @@ class GovulnersScanner:
             problems=[],
         )
 
+        # fetch the image content from catalog while the govulners db sync check runs, they share no state
+        account, image_digest = image.user_id, image.digest
+        image_content = image_content_executor.submit(
+            self._get_image_content, account, image_digest
+        )
+
         # check and run govulners sync if necessary
         try:
             GovulnersDBSyncManager.run_govulnersdb_sync(db_session)
         except NoActiveDBSyncError:
+            discard_image_content(image_content)
             logger.exception("Failed to initialize local vulnerability database")
             report.problems.append(
                 VulnerabilityScanProblem(
@@ -231,10 +270,18 @@ class GovulnersScanner:
                 )
             )
             return report
+        except Exception:
+            discard_image_content(image_content)
+            raise
 
         # create the image sbom
         try:
-            sbom = image_content_to_govulners_sbom(image, self._get_image_content(image))
+            # fetch the content here instead if all the fetch workers were busy with other scans in the meantime
+            if image_content.cancel():
+                content = self._get_image_content(account, image_digest)
+            else:
+                content = image_content.result()
+            sbom = image_content_to_govulners_sbom(image, content)
         except Exception:
             logger.exception(
                 "Failed to create the image sbom for %s/%s", image.user_id, image.id
@@ -246,6 +293,7 @@ class GovulnersScanner:
 
         # submit the sbom to govulners wrapper and get results
         try:
+            sbom_file_path = None
             if SAVE_SBOM_TO_FILE:
                 # don't bail on errors writing to file since this is for debugging only
                 try:
@@ -254,8 +302,9 @@ class GovulnersScanner:
                     )
                     logger.debug("Writing image sbom for %s to %s", image.id, file_path)
 
-                    with open(file_path, "w") as fp:
-                        json.dump(sbom, fp, indent=2)
+                    with open(file_path, "wb") as fp:
+                        fp.write(orjson.dumps(sbom, option=orjson.OPT_INDENT_2))
+                    sbom_file_path = file_path
                 except Exception:
                     logger.exception(
                         "Ignoring error writing the image sbom to file for  %s/%s Moving on",
@@ -263,12 +312,16 @@ class GovulnersScanner:
                         image.id,
                     )
 
-            # submit the image for analysis to govulners
-            govulners_response = (
-                GovulnersWrapperSingleton.get_instance().get_vulnerabilities_for_sbom(
-                    json.dumps(sbom)
+            # submit the image for analysis to govulners, scanning the saved sbom file rather than serializing it again
+            govulners_wrapper = GovulnersWrapperSingleton.get_instance()
+            if sbom_file_path:
+                govulners_response = govulners_wrapper.get_vulnerabilities_for_sbom_file(
+                    sbom_file_path
+                )
+            else:
+                govulners_response = govulners_wrapper.get_vulnerabilities_for_sbom(
+                    orjson.dumps(sbom)
                 )
-            )
         except Exception:
             logger.exception(
                 "Failed to scan image sbom for vulnerabilities using govulners for %s/%s",
@@ -305,14 +358,14 @@ class GovulnersScanner:
         Searches for govulners db vulnerability and metadata records that match the ids and namespaces. Additionally queries
         and returns the metadata records of related vulnerabilities from the first query
         """
+        govulners_wrapper = GovulnersWrapperSingleton.get_instance()
+
         # Query requested vulnerabilities
-        vulnerabilities_result = (
-            GovulnersWrapperSingleton.get_instance().query_vulnerabilities(
-                vuln_id=ids,
-                affected_package=affected_package,
-                affected_package_version=affected_package_version,
-                namespace=namespace,
-            )
+        vulnerabilities_result = govulners_wrapper.query_vulnerabilities(
+            vuln_id=ids,
+            affected_package=affected_package,
+            affected_package_version=affected_package_version,
+            namespace=namespace,
         )
 
         # if no results are found, return empty lists
@@ -338,15 +391,14 @@ class GovulnersScanner:
                 for related_vuln in related_vulns:
                     if self._is_only_nvd_namespace(related_vuln["Namespace"]):
                         # set nvd namespace. This allows it to be dynamic based on changes in govulnersdb
-                        nvd_namespace = nvd_namespace or related_vuln["Namespace"]
+                        if nvd_namespace is None:
+                            nvd_namespace = related_vuln["Namespace"]
                         related_nvd_vulnerabilities.add(related_vuln["ID"])
 
         if related_nvd_vulnerabilities:
-            related_nvd_metadata_records = (
-                GovulnersWrapperSingleton.get_instance().query_vulnerability_metadata(
-                    vuln_ids=related_nvd_vulnerabilities,
-                    namespaces=[nvd_namespace],
-                )
+            related_nvd_metadata_records = govulners_wrapper.query_vulnerability_metadata(
+                vuln_ids=list(related_nvd_vulnerabilities),
+                namespaces=[nvd_namespace],
             )
 
             return vulnerabilities_result, related_nvd_metadata_records
@@ -363,8 +415,17 @@ class GovulnersScanner:
         if isinstance(namespace, list):
             if len(namespace) > 1:
                 return False
-            return "nvd" in namespace[0].lower()
+            return GovulnersScanner._is_nvd_namespace(namespace[0])
         elif isinstance(namespace, str):
-            return "nvd" in namespace.lower()
+            return GovulnersScanner._is_nvd_namespace(namespace)
         else:
             return False
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _is_nvd_namespace(namespace: str) -> bool:
+        """
+        returns true or false based on if the provided namespace name is an nvd namespace. Memoized since it is checked
+        for every related vulnerability and the set of distinct namespace names is small
+        """
+        return "nvd" in namespace.lower()
@@ -107,7 +107,9 @@ def bootstrap_logger_intercept(level):
         @wraps(f)
         def wrapper(*args, **kwds):
             global bootstrap_logger_enabled
-            if bootstrap_logger_enabled:
+            if bootstrap_logger_enabled and (
+                level == "EXCEPTION" or bootstrap_logger.isEnabledFor(level)
+            ):
                 if len(args) > 1:
                     msg = safe_formatter(args[0], args[1::])
                 else:
@@ -166,6 +168,14 @@ def _msg(msg_string, msg_log_level="INFO"):
                 pass
 
 
+def _is_enabled(msg_log_level):
+    """
+    Returns True if messages of the given level are logged at the current log level, which defaults to INFO
+    """
+    level = log_level if log_level is not None else log_level_map["INFO"]
+    return log_level_map[msg_log_level] <= level
+
+
 def safe_formatter(message, args):
     """
     Try to safely format a log message, so that exceptions are logged and do
@@ -185,24 +195,33 @@ def safe_formatter(message, args):
 
 
 def spew(msg_string, *args):
+    # Skip formatting entirely when spew/debug messages would be dropped anyway
+    if not _is_enabled("SPEW"):
+        return
     formatted_msg_string = safe_formatter(msg_string, args)
     return _msg(formatted_msg_string, msg_log_level="SPEW")
 
 
 @bootstrap_logger_intercept(logging.DEBUG)
 def debug(msg_string, *args):
+    if not _is_enabled("DEBUG"):
+        return
     msg_string = safe_formatter(msg_string, args)
     return _msg(msg_string, msg_log_level="DEBUG")
 
 
 @bootstrap_logger_intercept(logging.INFO)
 def info(msg_string, *args):
+    if not _is_enabled("INFO"):
+        return
     msg_string = safe_formatter(msg_string, args)
     return _msg(msg_string, msg_log_level="INFO")
 
 
 @bootstrap_logger_intercept(logging.WARN)
 def warn(msg_string, *args):
+    if not _is_enabled("WARN"):
+        return
     msg_string = safe_formatter(msg_string, args)
     return _msg(msg_string, msg_log_level="WARN")
 
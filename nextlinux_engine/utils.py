@@ -292,17 +292,19 @@ def run_check(cmd, input_data=None, log_level="debug", **kwargs):
         # it is a str already, no need to decode
         pass
 
-    stdout_stream = stdout.splitlines()
     stderr_stream = stderr.splitlines()
 
     if log_level == "spew":
         # Some commands (like govulners scanning) will generate enough output here that we
-        # need to try to limit the impact of debug logging on system performance
-        for line in stdout_stream:
-            logger.spew("stdout: %s" % line)  # safe formatting not available for spew
-        for line in stderr_stream:
-            logger.spew("stderr: %s" % line)
+        # need to try to limit the impact of debug logging on system performance, so the
+        # output is not even split into lines unless spew logging is enabled
+        if logger._is_enabled("SPEW"):
+            for line in stdout.splitlines():
+                logger.spew("stdout: %s", line)
+            for line in stderr_stream:
+                logger.spew("stderr: %s", line)
     else:  # Always log stdout and stderr as debug, unless spew is specified
+        stdout_stream = stdout.splitlines()
         for line in stdout_stream:
             logger.debug("stdout: %s", line)
         for line in stderr_stream:
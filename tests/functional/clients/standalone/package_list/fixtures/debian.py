@@ -26,7 +26,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:adduser:adduser:3.115:*:*:*:*:*:*:*"],
         "license": "GPL-2",
         "origin": "Debian Adduser Developers <adduser-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "849000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -37,7 +36,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:apt:apt:1.4.10:*:*:*:*:*:*:*"],
         "license": "GPL-2 GPLv2+",
         "origin": "APT Development Team <deity@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "3539000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -55,7 +53,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL",
         "origin": "Santiago Vila <sanvila@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "333000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -73,7 +70,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2 PD",
         "origin": "Colin Watson <cjwatson@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "229000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -84,7 +80,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:bash:bash:4.4-5:*:*:*:*:*:*:*"],
         "license": "GPL-3",
         "origin": "Matthias Klose <doko@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "5798000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -95,7 +90,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:bsdutils:bsdutils:1:2.29.2-1+deb9u1:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause BSD-3-clause BSD-4-clause GPL-2 GPL-2+ GPL-3 GPL-3+ LGPL LGPL-2 LGPL-2+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ MIT public-domain",
         "origin": "Debian util-linux Maintainers <ah-util-linux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "238000",
         "sourcepkg": "util-linux",
         "type": "dpkg",
@@ -106,7 +100,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:coreutils:coreutils:8.26-3:*:*:*:*:*:*:*"],
         "license": "GPL-3",
         "origin": "Michael Stone <mstone@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "15103000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -124,7 +117,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL",
         "origin": "Ola Lundqvist <opal@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "167000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -135,7 +127,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:dash:dash:0.5.8-2.4:*:*:*:*:*:*:*"],
         "license": "GPL",
         "origin": "Gerrit Pape <pape@smarden.org> (maintainer)",
-        "release": "N/A",
         "size": "204000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -146,7 +137,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:debconf:debconf:1.5.61:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause",
         "origin": "Debconf Developers <debconf-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "558000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -168,7 +158,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL",
         "origin": "Debian Release Team <packages@release.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "148000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -179,7 +168,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:debianutils:debianutils:4.8.1.1:*:*:*:*:*:*:*"],
         "license": "GPL",
         "origin": "Clint Adams <clint@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "213000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -190,7 +178,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:diffutils:diffutils:1:3.5-3:*:*:*:*:*:*:*"],
         "license": "GFDL GPL",
         "origin": "Santiago Vila <sanvila@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "1327000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -201,7 +188,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:dpkg:dpkg:1.18.25:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause GPL-2 GPL-2+ public-domain-md5 public-domain-s-s-d",
         "origin": "Dpkg Developers <debian-dpkg@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "6778000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -212,7 +198,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:e2fslibs:e2fslibs:1.43.4-2+deb9u2:*:*:*:*:*:*:*"],
         "license": "GPL-2 LGPL-2",
         "origin": "Theodore Y. Ts'o <tytso@mit.edu> (maintainer)",
-        "release": "N/A",
         "size": "450000",
         "sourcepkg": "e2fsprogs",
         "type": "dpkg",
@@ -223,7 +208,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:e2fsprogs:e2fsprogs:1.43.4-2+deb9u2:*:*:*:*:*:*:*"],
         "license": "GPL-2 LGPL-2",
         "origin": "Theodore Y. Ts'o <tytso@mit.edu> (maintainer)",
-        "release": "N/A",
         "size": "4027000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -234,7 +218,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:findutils:findutils:4.6.0+git+20161106-2:*:*:*:*:*:*:*"],
         "license": "GFDL-1.3 GPL-3",
         "origin": "Andreas Metzler <ametzler@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "1854000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -256,7 +239,6 @@ pkgs_allinfo = {
         ],
         "license": "Artistic GFDL-1.2 GPL GPL-2 GPL-3",
         "origin": "Debian GCC Maintainers <debian-gcc@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "209000",
         "sourcepkg": "gcc-6",
         "type": "dpkg",
@@ -267,7 +249,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:gpgv:gpgv:2.1.18-8~deb9u4:*:*:*:*:*:*:*"],
         "license": "BSD-3-clause Expat GPL-3 GPL-3+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ RFC-Reference TinySCHEME permissive",
         "origin": "Debian GnuPG Maintainers <pkg-gnupg-maint@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "721000",
         "sourcepkg": "gnupg2",
         "type": "dpkg",
@@ -278,7 +259,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:grep:grep:2.27-2:*:*:*:*:*:*:*"],
         "license": "GPL-3 GPL-3+",
         "origin": "Anibal Monsalve Salazar <anibal@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "1131000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -289,7 +269,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:gzip:gzip:1.6-5+b1:*:*:*:*:*:*:*"],
         "license": "GPL",
         "origin": "Bdale Garbee <bdale@gag.com> (maintainer)",
-        "release": "N/A",
         "size": "231000",
         "sourcepkg": "gzip",
         "type": "dpkg",
@@ -300,7 +279,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:hostname:hostname:3.18+b1:*:*:*:*:*:*:*"],
         "license": "GPL-2",
         "origin": "Debian Hostname Team <hostname-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "47000",
         "sourcepkg": "hostname",
         "type": "dpkg",
@@ -322,7 +300,6 @@ pkgs_allinfo = {
         ],
         "license": "BSD-3-clause GPL-2 GPL-2+",
         "origin": "Debian systemd Maintainers <pkg-systemd-maintainers@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "131000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -333,7 +310,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libacl1:libacl1:2.2.52-3+b1:*:*:*:*:*:*:*"],
         "license": "GPL LGPL-2.1",
         "origin": "Anibal Monsalve Salazar <anibal@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "62000",
         "sourcepkg": "acl",
         "type": "dpkg",
@@ -351,7 +327,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2 GPLv2+",
         "origin": "APT Development Team <deity@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "3056000",
         "sourcepkg": "apt",
         "type": "dpkg",
@@ -362,7 +337,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libattr1:libattr1:1:2.4.47-2+b2:*:*:*:*:*:*:*"],
         "license": "GPL-2 LGPL-2.1",
         "origin": "Anibal Monsalve Salazar <anibal@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "42000",
         "sourcepkg": "attr",
         "type": "dpkg",
@@ -380,7 +354,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-1 GPL-2 LGPL-2.1",
         "origin": "Laurent Bigonville <bigon@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "30000",
         "sourcepkg": "audit",
         "type": "dpkg",
@@ -391,7 +364,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libaudit1:libaudit1:1:2.6.7-2:*:*:*:*:*:*:*"],
         "license": "GPL-1 GPL-2 LGPL-2.1",
         "origin": "Laurent Bigonville <bigon@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "150000",
         "sourcepkg": "audit",
         "type": "dpkg",
@@ -402,7 +374,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libblkid1:libblkid1:2.29.2-1+deb9u1:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause BSD-3-clause BSD-4-clause GPL-2 GPL-2+ GPL-3 GPL-3+ LGPL LGPL-2 LGPL-2+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ MIT public-domain",
         "origin": "Debian util-linux Maintainers <ah-util-linux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "367000",
         "sourcepkg": "util-linux",
         "type": "dpkg",
@@ -420,7 +391,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2",
         "origin": "Anibal Monsalve Salazar <anibal@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "96000",
         "sourcepkg": "bzip2",
         "type": "dpkg",
@@ -438,7 +408,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2 LGPL-2.1",
         "origin": "GNU Libc Maintainers <debian-glibc@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "3366000",
         "sourcepkg": "glibc",
         "type": "dpkg",
@@ -449,7 +418,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libc6:libc6:2.24-11+deb9u4:*:*:*:*:*:*:*"],
         "license": "GPL-2 LGPL-2.1",
         "origin": "GNU Libc Maintainers <debian-glibc@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "10686000",
         "sourcepkg": "glibc",
         "type": "dpkg",
@@ -467,7 +435,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2 GPL-3 LGPL-2.1",
         "origin": "Pierre Chifflier <pollux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "43000",
         "sourcepkg": "libcap-ng",
         "type": "dpkg",
@@ -478,7 +445,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libcomerr2:libcomerr2:1.43.4-2+deb9u2:*:*:*:*:*:*:*"],
         "license": "Unknown",
         "origin": "Theodore Y. Ts'o <tytso@mit.edu> (maintainer)",
-        "release": "N/A",
         "size": "84000",
         "sourcepkg": "e2fsprogs",
         "type": "dpkg",
@@ -489,7 +455,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libdb5.3:libdb5.3:5.3.28-12+deb9u1:*:*:*:*:*:*:*"],
         "license": "Unknown",
         "origin": "Debian Berkeley DB Group <pkg-db-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "1814000",
         "sourcepkg": "db5.3",
         "type": "dpkg",
@@ -500,7 +465,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libdebconfclient0:libdebconfclient0:0.227:*:*:*:*:*:*:*"],
         "license": "Unknown",
         "origin": "Debian Install System Team <debian-boot@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "67000",
         "sourcepkg": "cdebconf",
         "type": "dpkg",
@@ -511,7 +475,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libfdisk1:libfdisk1:2.29.2-1+deb9u1:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause BSD-3-clause BSD-4-clause GPL-2 GPL-2+ GPL-3 GPL-3+ LGPL LGPL-2 LGPL-2+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ MIT public-domain",
         "origin": "Debian util-linux Maintainers <ah-util-linux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "469000",
         "sourcepkg": "util-linux",
         "type": "dpkg",
@@ -522,7 +485,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libgcc1:libgcc1:1:6.3.0-18+deb9u1:*:*:*:*:*:*:*"],
         "license": "Artistic GFDL-1.2 GPL GPL-2 GPL-3",
         "origin": "Debian GCC Maintainers <debian-gcc@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "108000",
         "sourcepkg": "gcc-6",
         "type": "dpkg",
@@ -533,7 +495,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libgcrypt20:libgcrypt20:1.7.6-2+deb9u3:*:*:*:*:*:*:*"],
         "license": "GPL-2 LGPL",
         "origin": "Debian GnuTLS Maintainers <pkg-gnutls-maint@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "1266000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -551,7 +512,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2.1+ LGPL-2.1",
         "origin": "Debian GnuPG Maintainers <pkg-gnupg-maint@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "572000",
         "sourcepkg": "libgpg-error",
         "type": "dpkg",
@@ -569,7 +529,6 @@ pkgs_allinfo = {
         ],
         "license": "BSD-2-clause GPL-2 GPL-2+",
         "origin": "Nobuhiro Iwamatsu <iwamatsu@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "93000",
         "sourcepkg": "lz4",
         "type": "dpkg",
@@ -580,7 +539,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:liblzma5:liblzma5:5.2.2-1.2+b1:*:*:*:*:*:*:*"],
         "license": "Autoconf GPL-2 GPL-2+ GPL-3 LGPL-2 LGPL-2.1 LGPL-2.1+ PD PD-debian config-h noderivs permissive-fsf permissive-nowarranty probably-PD",
         "origin": "Jonathan Nieder <jrnieder@gmail.com> (maintainer)",
-        "release": "N/A",
         "size": "339000",
         "sourcepkg": "xz-utils",
         "type": "dpkg",
@@ -591,7 +549,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libmount1:libmount1:2.29.2-1+deb9u1:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause BSD-3-clause BSD-4-clause GPL-2 GPL-2+ GPL-3 GPL-3+ LGPL LGPL-2 LGPL-2+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ MIT public-domain",
         "origin": "Debian util-linux Maintainers <ah-util-linux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "403000",
         "sourcepkg": "util-linux",
         "type": "dpkg",
@@ -604,7 +561,6 @@ pkgs_allinfo = {
         ],
         "license": "Unknown",
         "origin": "Craig Small <csmall@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "347000",
         "sourcepkg": "ncurses",
         "type": "dpkg",
@@ -622,7 +578,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL",
         "origin": "Steve Langasek <vorlon@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "874000",
         "sourcepkg": "pam",
         "type": "dpkg",
@@ -644,7 +599,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL",
         "origin": "Steve Langasek <vorlon@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "220000",
         "sourcepkg": "pam",
         "type": "dpkg",
@@ -662,7 +616,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL",
         "origin": "Steve Langasek <vorlon@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "1016000",
         "sourcepkg": "pam",
         "type": "dpkg",
@@ -673,7 +626,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libpam0g:libpam0g:1.1.8-3.6:*:*:*:*:*:*:*"],
         "license": "GPL",
         "origin": "Steve Langasek <vorlon@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "229000",
         "sourcepkg": "pam",
         "type": "dpkg",
@@ -684,7 +636,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libpcre3:libpcre3:2:8.39-3:*:*:*:*:*:*:*"],
         "license": "Unknown",
         "origin": "Matthew Vernon <matthew@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "668000",
         "sourcepkg": "pcre3",
         "type": "dpkg",
@@ -695,7 +646,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libselinux1:libselinux1:2.6-3+b3:*:*:*:*:*:*:*"],
         "license": "GPL-2 LGPL-2.1",
         "origin": "Debian SELinux maintainers <selinux-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "209000",
         "sourcepkg": "libselinux",
         "type": "dpkg",
@@ -713,7 +663,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL LGPL",
         "origin": "Debian SELinux maintainers <selinux-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "39000",
         "sourcepkg": "libsemanage",
         "type": "dpkg",
@@ -724,7 +673,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libsemanage1:libsemanage1:2.6-2:*:*:*:*:*:*:*"],
         "license": "GPL LGPL",
         "origin": "Debian SELinux maintainers <selinux-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "291000",
         "sourcepkg": "libsemanage",
         "type": "dpkg",
@@ -735,7 +683,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libsepol1:libsepol1:2.6-2:*:*:*:*:*:*:*"],
         "license": "GPL LGPL",
         "origin": "Debian SELinux maintainers <selinux-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "653000",
         "sourcepkg": "libsepol",
         "type": "dpkg",
@@ -746,7 +693,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libsmartcols1:libsmartcols1:2.29.2-1+deb9u1:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause BSD-3-clause BSD-4-clause GPL-2 GPL-2+ GPL-3 GPL-3+ LGPL LGPL-2 LGPL-2+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ MIT public-domain",
         "origin": "Debian util-linux Maintainers <ah-util-linux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "257000",
         "sourcepkg": "util-linux",
         "type": "dpkg",
@@ -757,7 +703,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libss2:libss2:1.43.4-2+deb9u2:*:*:*:*:*:*:*"],
         "license": "Unknown",
         "origin": "Theodore Y. Ts'o <tytso@mit.edu> (maintainer)",
-        "release": "N/A",
         "size": "96000",
         "sourcepkg": "e2fsprogs",
         "type": "dpkg",
@@ -768,7 +713,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libstdc++6:libstdc++6:6.3.0-18+deb9u1:*:*:*:*:*:*:*"],
         "license": "Artistic GFDL-1.2 GPL GPL-2 GPL-3",
         "origin": "Debian GCC Maintainers <debian-gcc@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "1998000",
         "sourcepkg": "gcc-6",
         "type": "dpkg",
@@ -779,7 +723,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libsystemd0:libsystemd0:232-25+deb9u12:*:*:*:*:*:*:*"],
         "license": "CC0 Expat GPL-2 GPL-2+ LGPL-2.1 LGPL-2.1+ public-domain",
         "origin": "Debian systemd Maintainers <pkg-systemd-maintainers@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "654000",
         "sourcepkg": "systemd",
         "type": "dpkg",
@@ -790,7 +733,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libtinfo5:libtinfo5:6.0+20161126-1+deb9u2:*:*:*:*:*:*:*"],
         "license": "Unknown",
         "origin": "Craig Small <csmall@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "478000",
         "sourcepkg": "ncurses",
         "type": "dpkg",
@@ -801,7 +743,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libudev1:libudev1:232-25+deb9u12:*:*:*:*:*:*:*"],
         "license": "CC0 Expat GPL-2 GPL-2+ LGPL-2.1 LGPL-2.1+ public-domain",
         "origin": "Debian systemd Maintainers <pkg-systemd-maintainers@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "224000",
         "sourcepkg": "systemd",
         "type": "dpkg",
@@ -823,7 +764,6 @@ pkgs_allinfo = {
         ],
         "license": "BSD-2-clause GPL-2 GPL-2+ LGPL-2+ LGPL-2.1 MIT",
         "origin": "Vaclav Ovsik <vaclav.ovsik@i.cz> (maintainer)",
-        "release": "N/A",
         "size": "258000",
         "sourcepkg": "ustr",
         "type": "dpkg",
@@ -834,7 +774,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:libuuid1:libuuid1:2.29.2-1+deb9u1:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause BSD-3-clause BSD-4-clause GPL-2 GPL-2+ GPL-3 GPL-3+ LGPL LGPL-2 LGPL-2+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ MIT public-domain",
         "origin": "Debian util-linux Maintainers <ah-util-linux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "107000",
         "sourcepkg": "util-linux",
         "type": "dpkg",
@@ -845,7 +784,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:login:login:1:4.4-4.1:*:*:*:*:*:*:*"],
         "license": "GPL-2",
         "origin": "Shadow package maintainers <pkg-shadow-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "2747000",
         "sourcepkg": "shadow",
         "type": "dpkg",
@@ -863,7 +801,6 @@ pkgs_allinfo = {
         ],
         "license": "BSD-3-clause GPL-2",
         "origin": "Debian LSB Team <debian-lsb@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "49000",
         "sourcepkg": "lsb",
         "type": "dpkg",
@@ -874,7 +811,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:mawk:mawk:1.3.3-17+b3:*:*:*:*:*:*:*"],
         "license": "GPL-2",
         "origin": "Steve Langasek <vorlon@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "183000",
         "sourcepkg": "mawk",
         "type": "dpkg",
@@ -885,7 +821,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:mount:mount:2.29.2-1+deb9u1:*:*:*:*:*:*:*"],
         "license": "BSD-2-clause BSD-3-clause BSD-4-clause GPL-2 GPL-2+ GPL-3 GPL-3+ LGPL LGPL-2 LGPL-2+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ MIT public-domain",
         "origin": "Debian util-linux Maintainers <ah-util-linux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "444000",
         "sourcepkg": "util-linux",
         "type": "dpkg",
@@ -903,7 +838,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2 LGPL-2.1",
         "origin": "GNU Libc Maintainers <debian-glibc@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "221000",
         "sourcepkg": "glibc",
         "type": "dpkg",
@@ -921,7 +855,6 @@ pkgs_allinfo = {
         ],
         "license": "Unknown",
         "origin": "Craig Small <csmall@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "340000",
         "sourcepkg": "ncurses",
         "type": "dpkg",
@@ -939,7 +872,6 @@ pkgs_allinfo = {
         ],
         "license": "Unknown",
         "origin": "Craig Small <csmall@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "536000",
         "sourcepkg": "ncurses",
         "type": "dpkg",
@@ -950,7 +882,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:passwd:passwd:1:4.4-4.1:*:*:*:*:*:*:*"],
         "license": "GPL-2",
         "origin": "Shadow package maintainers <pkg-shadow-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "2478000",
         "sourcepkg": "shadow",
         "type": "dpkg",
@@ -968,7 +899,6 @@ pkgs_allinfo = {
         ],
         "license": "Artistic Artistic-2 BSD-3-clause BSD-3-clause-GENERIC BSD-3-clause-with-weird-numbering BSD-4-clause-POWERDOG BZIP DONT-CHANGE-THE-GPL Expat GPL-1 GPL-1+ GPL-2 GPL-2+ GPL-3+-WITH-BISON-EXCEPTION HSIEH-BSD HSIEH-DERIVATIVE LGPL-2.1 REGCOMP REGCOMP, RRA-KEEP-THIS-NOTICE S2P SDBM-PUBLIC-DOMAIN TEXT-TABS Unicode ZLIB",
         "origin": "Niko Tyni <ntyni@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "7551000",
         "sourcepkg": "perl",
         "type": "dpkg",
@@ -979,7 +909,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:sed:sed:4.4-1:*:*:*:*:*:*:*"],
         "license": "GPL-3",
         "origin": "Clint Adams <clint@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "799000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -997,7 +926,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2",
         "origin": "Anibal Monsalve Salazar <anibal@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "62000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -1015,7 +943,6 @@ pkgs_allinfo = {
         ],
         "license": "GPL-2",
         "origin": "Debian sysvinit maintainers <pkg-sysvinit-devel@lists.alioth.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "110000",
         "sourcepkg": "sysvinit",
         "type": "dpkg",
@@ -1026,7 +953,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:tar:tar:1.29b-1.1:*:*:*:*:*:*:*"],
         "license": "GPL-2 GPL-3",
         "origin": "Bdale Garbee <bdale@gag.com> (maintainer)",
-        "release": "N/A",
         "size": "2770000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -1037,7 +963,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:tzdata:tzdata:2020a-0+deb9u1:*:*:*:*:*:*:*"],
         "license": "Unknown",
         "origin": "GNU Libc Maintainers <debian-glibc@lists.debian.org> (maintainer)",
-        "release": "N/A",
         "size": "3032000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -1055,7 +980,6 @@ pkgs_allinfo = {
         ],
         "license": "BSD-2-clause BSD-3-clause BSD-4-clause GPL-2 GPL-2+ GPL-3 GPL-3+ LGPL LGPL-2 LGPL-2+ LGPL-2.1 LGPL-2.1+ LGPL-3 LGPL-3+ MIT public-domain",
         "origin": "Debian util-linux Maintainers <ah-util-linux@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "3558000",
         "sourcepkg": "N/A",
         "type": "dpkg",
@@ -1066,7 +990,6 @@ pkgs_allinfo = {
         "cpes": ["cpe:2.3:a:zlib1g:zlib1g:1:1.2.8.dfsg-5:*:*:*:*:*:*:*"],
         "license": "Unknown",
         "origin": "Mark Brown <broonie@debian.org> (maintainer)",
-        "release": "N/A",
         "size": "156000",
         "sourcepkg": "zlib",
         "type": "dpkg",
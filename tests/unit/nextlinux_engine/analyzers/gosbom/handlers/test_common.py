@@ -1,6 +1,9 @@
 import pytest
 
-from nextlinux_engine.analyzers.gosbom.handlers.common import save_entry_to_findings
+from nextlinux_engine.analyzers.gosbom.handlers.common import (
+    save_entry_to_findings,
+    save_entry_to_section,
+)
 
 
 @pytest.mark.parametrize(
@@ -75,3 +78,21 @@ def test_save_entry_to_findings(param):
                                  {}).get("base",
                                          {}).get(param["pkg_key"],
                                                  {}) == param["expected"])
+
+
+@pytest.mark.parametrize(
+    "section, expected",
+    [
+        pytest.param({}, {"unit": "testvalue"}, id="basic-case"),
+        pytest.param(
+            {"key_test": {
+                "unit2": "testvalue2"
+            }},
+            {"unit2": "testvalue2"},
+            id="no-overwrite",
+        ),
+    ],
+)
+def test_save_entry_to_section(section, expected):
+    save_entry_to_section(section, {"unit": "testvalue"}, "test", "key_test")
+    assert section["key_test"] == expected
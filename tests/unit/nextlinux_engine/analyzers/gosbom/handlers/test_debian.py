@@ -1,6 +1,12 @@
+import collections
+
 import pytest
 
-from nextlinux_engine.analyzers.gosbom.handlers.debian import save_entry, _all_packages
+from nextlinux_engine.analyzers.gosbom.handlers.debian import (
+    _all_packages,
+    save_entry,
+    translate_and_save_entries,
+)
 
 
 class TestDebian:
@@ -84,11 +90,48 @@ class TestDebian:
         ],
     )
     def test_all_packages(self, param):
-        findings = {"package_list": {"pkgs.all": {"base": {}}}}
+        pkgs_all = {}
         if param["expected_err"] is not None:
             with pytest.raises(param["expected_err"]):
-                _all_packages(findings, param["artifact"])
+                _all_packages(pkgs_all, param["artifact"])
         else:
-            _all_packages(findings, param["artifact"])
-            assert (findings["package_list"]["pkgs.all"]["base"][
-                param["expected_key"]] == param["expected_version"])
+            _all_packages(pkgs_all, param["artifact"])
+            assert pkgs_all[param["expected_key"]] == param["expected_version"]
+
+    def test_translate_and_save_entries(self):
+        nested_dict = lambda: collections.defaultdict(nested_dict)
+        findings = nested_dict()
+        artifacts = [
+            {
+                "name": "libc6",
+                "version": "2.31",
+                "metadata": {
+                    "source": "glibc",
+                    "release": "13",
+                    "files": [{
+                        "path": "/lib/libc.so.6"
+                    }],
+                },
+            },
+            {
+                "name": "bash",
+                "version": "5.1"
+            },
+        ]
+
+        translate_and_save_entries(findings, artifacts)
+
+        package_list = findings["package_list"]
+        assert package_list["pkgs.all"]["base"] == {
+            "libc6": "2.31",
+            "bash": "5.1"
+        }
+        assert package_list["pkgfiles.all"]["base"] == {
+            "/lib/libc.so.6": "DPKGFILE"
+        }
+        assert package_list["pkgs.allinfo"]["base"]["libc6"][
+            "version"] == "2.31-13"
+        assert package_list["pkgs.allinfo"]["base"]["libc6"][
+            "sourcepkg"] == "glibc"
+        assert package_list["pkgs.allinfo"]["base"]["bash"][
+            "sourcepkg"] == "N/A"
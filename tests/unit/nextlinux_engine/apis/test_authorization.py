@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from nextlinux_engine.apis.authorization import (
+    DbAuthorizationHandler,
+    Permission,
+    UnauthorizedError,
+)
+
+
+@pytest.fixture
+def handler():
+    return DbAuthorizationHandler(identity_provider_factory=None)
+
+
+def test_exec_permission_check_empty_list(handler):
+    subject = MagicMock()
+    handler._exec_permission_check(subject, [])
+    subject.check_permission.assert_not_called()
+
+
+def test_exec_permission_check(handler):
+    subject = MagicMock()
+    handler._exec_permission_check(subject, [Permission("account1", "getImage", None)])
+    subject.check_permission.assert_called_once_with(
+        ["account1:getImage:*"], logical_operator=all
+    )
+
+
+def test_exec_permission_check_denied(handler):
+    subject = MagicMock()
+    subject.check_permission.side_effect = ValueError("not authenticated")
+    with pytest.raises(UnauthorizedError):
+        handler._exec_permission_check(subject, [Permission("account1", "*", "*")])
@@ -0,0 +1,497 @@
+import os
+import tarfile
+import threading
+
+import orjson
+import pytest
+import sqlalchemy
+from sqlalchemy import select
+
+import nextlinux_engine.configuration.localconfig
+from nextlinux_engine.clients.govulners_wrapper import (
+    Base,
+    GovulnersVulnerability,
+    GovulnersVulnerabilityMetadata,
+    GovulnersWrapperSingleton,
+    LockAcquisitionError,
+    _QUERY_VULN_IDS_TEMP_TABLE,
+    _load_query_vuln_ids,
+)
+
+GOVULNERS_DB_VERSION = "3"
+NAMESPACES = ("nvd", "debian:10")
+MOCK_BUILT_TIMESTAMP = "2021-04-07T08:12:05Z"
+
+
+@pytest.fixture
+def govulners_wrapper(tmp_path, monkeypatch) -> GovulnersWrapperSingleton:
+    """
+    Returns a new wrapper instance, which does not share any state with the process singleton, that unpacks
+    govulners_db archives under tmp_path
+    """
+    monkeypatch.setattr(
+        nextlinux_engine.configuration.localconfig,
+        "get_config",
+        lambda: {"service_dir": str(tmp_path)},
+    )
+    wrapper_class = type(
+        "TestGovulnersWrapper",
+        (GovulnersWrapperSingleton,),
+        {"_govulners_wrapper_instance": None},
+    )
+    return wrapper_class()
+
+
+def create_govulners_db(
+    govulners_db_dir: str, vuln_ids: list, built: str = MOCK_BUILT_TIMESTAMP
+) -> str:
+    """
+    Creates a scratch govulners_db in govulners_db_dir, with a vulnerability and a metadata record for each of the
+    vuln_ids in every namespace of NAMESPACES. Returns govulners_db_dir
+    """
+    versioned_dir = os.path.join(govulners_db_dir, GOVULNERS_DB_VERSION)
+    os.makedirs(versioned_dir, exist_ok=True)
+
+    engine = sqlalchemy.create_engine(
+        "sqlite:///"
+        + os.path.join(versioned_dir, GovulnersWrapperSingleton.VULNERABILITY_FILE_NAME)
+    )
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            GovulnersVulnerability.__table__.insert(),
+            [
+                {
+                    "id": vuln_id,
+                    "package_name": "package-" + vuln_id,
+                    "namespace": namespace,
+                    "version_constraint": "< 1.0",
+                    "version_format": "semver",
+                    "cpes": "[]",
+                    "related_vulnerabilities": "[]",
+                    "fixed_in_versions": "[]",
+                    "fix_state": "unknown",
+                    "advisories": "[]",
+                }
+                for vuln_id in vuln_ids
+                for namespace in NAMESPACES
+            ],
+        )
+        connection.execute(
+            GovulnersVulnerabilityMetadata.__table__.insert(),
+            [
+                {
+                    "id": vuln_id,
+                    "namespace": namespace,
+                    "data_source": "https://example.com/" + vuln_id,
+                    "record_source": namespace,
+                    "severity": "High",
+                    "urls": "[]",
+                    "description": "",
+                    "cvss": "[]",
+                }
+                for vuln_id in vuln_ids
+                for namespace in NAMESPACES
+            ],
+        )
+    engine.dispose()
+
+    write_govulners_db_metadata(govulners_db_dir, built)
+    return govulners_db_dir
+
+
+def write_govulners_db_metadata(govulners_db_dir: str, built: str) -> str:
+    """
+    Writes the metadata file of the govulners_db in govulners_db_dir, and returns its path
+    """
+    metadata_file = os.path.join(
+        govulners_db_dir,
+        GOVULNERS_DB_VERSION,
+        GovulnersWrapperSingleton.METADATA_FILE_NAME,
+    )
+    with open(metadata_file, "wb") as write_file:
+        write_file.write(
+            orjson.dumps(
+                {
+                    "built": built,
+                    "version": int(GOVULNERS_DB_VERSION),
+                    "checksum": "sha256:" + built,
+                }
+            )
+        )
+    return metadata_file
+
+
+def create_govulners_db_archive(
+    archive_dir: str, vuln_ids: list, built: str = MOCK_BUILT_TIMESTAMP
+) -> str:
+    """
+    Creates a govulners_db archive in archive_dir, holding the files of a scratch govulners_db at its top level as
+    the feed service serves them. Returns the path to the archive
+    """
+    govulners_db_dir = create_govulners_db(
+        os.path.join(archive_dir, "archive_contents"), vuln_ids, built
+    )
+    archive = os.path.join(archive_dir, "govulners_db.tar.gz")
+    with tarfile.open(archive, "w:gz") as write_archive:
+        for file_name in (
+            GovulnersWrapperSingleton.VULNERABILITY_FILE_NAME,
+            GovulnersWrapperSingleton.METADATA_FILE_NAME,
+        ):
+            write_archive.add(
+                os.path.join(govulners_db_dir, GOVULNERS_DB_VERSION, file_name),
+                arcname=file_name,
+            )
+    return archive
+
+
+def set_govulners_db(
+    govulners_wrapper: GovulnersWrapperSingleton,
+    govulners_db_dir: str,
+    use_staging: bool = False,
+):
+    """
+    Swaps the govulners_db in govulners_db_dir in as the wrapper's production or staging db
+    """
+    engine = govulners_wrapper._init_latest_govulners_db_engine(
+        govulners_db_dir, GOVULNERS_DB_VERSION
+    )
+    with govulners_wrapper.write_lock_access():
+        govulners_wrapper._set_govulners_db(
+            govulners_db_dir,
+            GOVULNERS_DB_VERSION,
+            engine,
+            govulners_wrapper._init_latest_govulners_db_session_maker(engine),
+            os.path.basename(govulners_db_dir),
+            use_staging,
+        )
+    return engine
+
+
+def test_query_vuln_ids_temp_table(govulners_wrapper, tmp_path):
+    threshold = GovulnersWrapperSingleton.QUERY_VULN_IDS_TEMP_TABLE_THRESHOLD
+    vuln_ids = ["CVE-{}".format(i) for i in range(2 * threshold + 200)]
+    set_govulners_db(
+        govulners_wrapper, create_govulners_db(str(tmp_path / "db"), vuln_ids)
+    )
+
+    def unbatched_vulnerabilities(ids):
+        # The query as it was run before lookups were batched, with all ids bound to a single statement
+        stmt = (
+            select(GovulnersVulnerability, GovulnersVulnerabilityMetadata)
+            .outerjoin(
+                GovulnersVulnerability,
+                sqlalchemy.and_(
+                    GovulnersVulnerability.id == GovulnersVulnerabilityMetadata.id,
+                    GovulnersVulnerability.namespace
+                    == GovulnersVulnerabilityMetadata.namespace,
+                ),
+            )
+            .where(GovulnersVulnerability.id.in_(ids))
+            .where(GovulnersVulnerability.namespace.in_(["debian:10"]))
+        )
+        with govulners_wrapper.govulners_session_scope() as session:
+            return session.execute(stmt).all()
+
+    def unbatched_metadata(ids):
+        stmt = (
+            select(GovulnersVulnerabilityMetadata)
+            .where(GovulnersVulnerabilityMetadata.id.in_(ids))
+            .where(GovulnersVulnerabilityMetadata.namespace.in_(["nvd"]))
+        )
+        with govulners_wrapper.govulners_session_scope() as session:
+            return session.execute(stmt).scalars().all()
+
+    def vulnerability_keys(rows):
+        return sorted(
+            (
+                row.GovulnersVulnerability.id,
+                row.GovulnersVulnerability.namespace,
+                row.GovulnersVulnerabilityMetadata.namespace,
+            )
+            for row in rows
+        )
+
+    def metadata_keys(records):
+        return sorted((record.id, record.namespace) for record in records)
+
+    # The first two lookups go through the temp table, the second must only see its own ids. The last one is run as
+    # several batches of bound ids
+    lookups = [
+        vuln_ids[: threshold + 100],
+        vuln_ids[threshold + 100 :],
+        vuln_ids[: GovulnersWrapperSingleton.QUERY_VULN_IDS_BATCH_SIZE * 2 + 1],
+    ]
+    for lookup_ids in lookups:
+        vulnerabilities = govulners_wrapper.query_vulnerabilities(
+            vuln_id=lookup_ids, namespace="debian:10"
+        )
+        assert vulnerability_keys(vulnerabilities) == vulnerability_keys(
+            unbatched_vulnerabilities(lookup_ids)
+        )
+        assert {row.GovulnersVulnerability.id for row in vulnerabilities} == set(
+            lookup_ids
+        )
+
+        metadata = govulners_wrapper.query_vulnerability_metadata(lookup_ids, ["nvd"])
+        assert metadata_keys(metadata) == metadata_keys(unbatched_metadata(lookup_ids))
+        assert {record.id for record in metadata} == set(lookup_ids)
+
+
+def test_load_query_vuln_ids_replaces_previous_ids(govulners_wrapper, tmp_path):
+    vuln_ids = ["CVE-{}".format(i) for i in range(10)]
+    set_govulners_db(
+        govulners_wrapper, create_govulners_db(str(tmp_path / "db"), vuln_ids)
+    )
+
+    # Loaded twice on the same connection, without the rollback that resets it between sessions
+    with govulners_wrapper.govulners_session_scope() as session:
+        _load_query_vuln_ids(session, vuln_ids[:6])
+        _load_query_vuln_ids(session, vuln_ids[4:])
+        loaded_ids = session.execute(select(_QUERY_VULN_IDS_TEMP_TABLE.c.id)).scalars()
+        assert sorted(loaded_ids) == sorted(vuln_ids[4:])
+
+
+def test_update_govulners_db_reads_while_preparing(
+    govulners_wrapper, tmp_path, monkeypatch
+):
+    production_engine = set_govulners_db(
+        govulners_wrapper,
+        create_govulners_db(str(tmp_path / "old_checksum"), ["CVE-old"]),
+    )
+    archive = create_govulners_db_archive(str(tmp_path), ["CVE-new"])
+
+    # Fail rather than hang if a read has to wait on the update
+    monkeypatch.setattr(govulners_wrapper, "LOCK_READ_ACCESS_TIMEOUT", 5)
+    disposed = []
+    monkeypatch.setattr(
+        govulners_wrapper, "_dispose_govulners_db_engine", disposed.append
+    )
+
+    # Hold the update open while the new archive is being unpacked
+    preparing = threading.Event()
+    release_update = threading.Event()
+    open_govulners_db_archive = govulners_wrapper._open_govulners_db_archive
+
+    def blocking_open_govulners_db_archive(*args):
+        preparing.set()
+        assert release_update.wait(5)
+        return open_govulners_db_archive(*args)
+
+    monkeypatch.setattr(
+        govulners_wrapper,
+        "_open_govulners_db_archive",
+        blocking_open_govulners_db_archive,
+    )
+
+    # Function under test
+    update = threading.Thread(
+        target=govulners_wrapper.update_govulners_db,
+        args=(archive, "new_checksum", GOVULNERS_DB_VERSION),
+    )
+    update.start()
+    try:
+        assert preparing.wait(5)
+
+        # The current production db can still be read while the new one is prepared
+        results = govulners_wrapper.query_vulnerabilities(vuln_id="CVE-old")
+        assert {row.GovulnersVulnerability.id for row in results} == {"CVE-old"}
+        assert disposed == []
+    finally:
+        release_update.set()
+        update.join(5)
+
+    # Once the update is done, the new db is in use and the replaced engine is disposed
+    assert os.path.basename(govulners_wrapper._govulners_db_dir) == "new_checksum"
+    results = govulners_wrapper.query_vulnerabilities(vuln_id=["CVE-old", "CVE-new"])
+    assert {row.GovulnersVulnerability.id for row in results} == {"CVE-new"}
+    assert disposed == [production_engine]
+
+
+def test_update_govulners_db_checksum_in_use(govulners_wrapper, tmp_path, monkeypatch):
+    first_archive_dir = tmp_path / "first"
+    first_archive_dir.mkdir()
+    govulners_wrapper.update_govulners_db(
+        create_govulners_db_archive(str(first_archive_dir), ["CVE-1"]),
+        "checksum",
+        GOVULNERS_DB_VERSION,
+    )
+    production_engine = govulners_wrapper._govulners_db_engine_internal
+
+    monkeypatch.setattr(govulners_wrapper, "LOCK_READ_ACCESS_TIMEOUT", 0.1)
+    disposed = []
+    monkeypatch.setattr(
+        govulners_wrapper, "_dispose_govulners_db_engine", disposed.append
+    )
+
+    # Try to read from another thread while the archive is unpacked over the in-use db
+    read_errors = []
+    open_govulners_db_archive = govulners_wrapper._open_govulners_db_archive
+
+    def read_during_open_govulners_db_archive(*args):
+        def read():
+            try:
+                govulners_wrapper.query_vulnerabilities(vuln_id="CVE-1")
+            except LockAcquisitionError as error:
+                read_errors.append(error)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(5)
+        return open_govulners_db_archive(*args)
+
+    monkeypatch.setattr(
+        govulners_wrapper,
+        "_open_govulners_db_archive",
+        read_during_open_govulners_db_archive,
+    )
+
+    # Function under test, the same checksum is unpacked into the dir of the production db
+    second_archive_dir = tmp_path / "second"
+    second_archive_dir.mkdir()
+    govulners_wrapper.update_govulners_db(
+        create_govulners_db_archive(str(second_archive_dir), ["CVE-1", "CVE-2"]),
+        "checksum",
+        GOVULNERS_DB_VERSION,
+    )
+
+    # Readers were kept out for the whole update, and see the re-extracted db afterwards
+    assert len(read_errors) == 1
+    results = govulners_wrapper.query_vulnerabilities(vuln_id=["CVE-1", "CVE-2"])
+    assert {row.GovulnersVulnerability.id for row in results} == {"CVE-1", "CVE-2"}
+    assert disposed == [production_engine]
+
+
+def test_metadata_file_cache_reloads_rewritten_file(govulners_wrapper, tmp_path):
+    govulners_db_dir = create_govulners_db(str(tmp_path / "checksum"), ["CVE-1"])
+    set_govulners_db(govulners_wrapper, govulners_db_dir)
+
+    first = govulners_wrapper.get_govulners_db_metadata()
+    assert first.built == MOCK_BUILT_TIMESTAMP
+    # Served from the cache while the file is unchanged
+    assert govulners_wrapper.get_govulners_db_metadata() is first
+
+    # Rewrite the file, with an mtime that is guaranteed to differ
+    metadata_file = write_govulners_db_metadata(
+        govulners_db_dir, "2022-01-01T00:00:00Z"
+    )
+    mtime = os.stat(metadata_file).st_mtime_ns
+    os.utime(metadata_file, ns=(mtime, mtime + 1_000_000_000))
+
+    assert govulners_wrapper.get_govulners_db_metadata().built == "2022-01-01T00:00:00Z"
+    # Each converter has its own entry, the raw contents are read separately
+    assert (
+        govulners_wrapper._get_metadata_file_contents(
+            GovulnersWrapperSingleton.METADATA_FILE_NAME
+        )["built"]
+        == "2022-01-01T00:00:00Z"
+    )
+
+
+def test_metadata_file_cache_cleared_on_swap(govulners_wrapper, tmp_path):
+    govulners_db_dir = create_govulners_db(str(tmp_path / "checksum"), ["CVE-1"])
+    set_govulners_db(govulners_wrapper, govulners_db_dir)
+    assert govulners_wrapper.get_govulners_db_metadata().built == MOCK_BUILT_TIMESTAMP
+    assert govulners_wrapper._metadata_file_cache
+
+    # Re-extract the same dir with a new file that has the old mtime, so only the swap can invalidate the cache
+    metadata_file = os.path.join(
+        govulners_db_dir,
+        GOVULNERS_DB_VERSION,
+        GovulnersWrapperSingleton.METADATA_FILE_NAME,
+    )
+    mtime = os.stat(metadata_file).st_mtime_ns
+    write_govulners_db_metadata(govulners_db_dir, "2022-01-01T00:00:00Z")
+    os.utime(metadata_file, ns=(mtime, mtime))
+
+    # Function under test
+    set_govulners_db(govulners_wrapper, govulners_db_dir)
+
+    assert govulners_wrapper.get_govulners_db_metadata().built == "2022-01-01T00:00:00Z"
+
+
+def test_open_govulners_db_archive(govulners_wrapper, tmp_path):
+    archive = create_govulners_db_archive(str(tmp_path), ["CVE-1"])
+    parent_dir = str(tmp_path / "govulners_db")
+
+    # Function under test
+    govulners_db_dir = govulners_wrapper._open_govulners_db_archive(
+        archive, parent_dir, "checksum", GOVULNERS_DB_VERSION
+    )
+
+    assert govulners_db_dir == os.path.join(parent_dir, "checksum")
+    for file_name in (
+        GovulnersWrapperSingleton.VULNERABILITY_FILE_NAME,
+        GovulnersWrapperSingleton.METADATA_FILE_NAME,
+    ):
+        with open(
+            os.path.join(tmp_path, "archive_contents", GOVULNERS_DB_VERSION, file_name),
+            "rb",
+        ) as expected_file, open(
+            os.path.join(govulners_db_dir, GOVULNERS_DB_VERSION, file_name), "rb"
+        ) as extracted_file:
+            assert extracted_file.read() == expected_file.read()
+
+
+@pytest.mark.skipif(
+    not hasattr(tarfile, "data_filter"),
+    reason="extraction filters are not supported by this python",
+)
+def test_open_govulners_db_archive_rejects_member_outside_dir(
+    govulners_wrapper, tmp_path
+):
+    outside_file = tmp_path / "outside.txt"
+    outside_file.write_text("outside")
+    archive = str(tmp_path / "govulners_db.tar.gz")
+    with tarfile.open(archive, "w:gz") as write_archive:
+        write_archive.add(str(outside_file), arcname="../../../escaped.txt")
+    parent_dir = tmp_path / "govulners_db"
+
+    # Function under test
+    with pytest.raises(tarfile.OutsideDestinationError):
+        govulners_wrapper._open_govulners_db_archive(
+            archive, str(parent_dir), "checksum", GOVULNERS_DB_VERSION
+        )
+
+    assert not (tmp_path / "escaped.txt").exists()
+    assert not (parent_dir / "escaped.txt").exists()
+
+
+@pytest.mark.parametrize("linked", [False, True])
+def test_move_govulners_db_archive_same_file(govulners_wrapper, tmp_path, linked):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    archive = tmp_path / "govulners_db.tar.gz"
+    archive.write_bytes(b"archive")
+    if linked:
+        # Left in place by an earlier attempt
+        os.link(str(archive), str(output_dir / archive.name))
+    else:
+        archive = output_dir / archive.name
+        archive.write_bytes(b"archive")
+
+    # Function under test
+    moved_archive = govulners_wrapper._move_govulners_db_archive(
+        str(archive), str(output_dir)
+    )
+
+    assert moved_archive == str(output_dir / archive.name)
+    assert archive.read_bytes() == b"archive"
+    assert os.path.samefile(moved_archive, str(archive))
+
+
+def test_move_govulners_db_archive_replaces_stale_file(govulners_wrapper, tmp_path):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    archive = tmp_path / "govulners_db.tar.gz"
+    archive.write_bytes(b"archive")
+    (output_dir / archive.name).write_bytes(b"stale")
+
+    # Function under test
+    moved_archive = govulners_wrapper._move_govulners_db_archive(
+        str(archive), str(output_dir)
+    )
+
+    with open(moved_archive, "rb") as read_file:
+        assert read_file.read() == b"archive"
+    assert archive.read_bytes() == b"archive"
@@ -1,8 +1,9 @@
 import json
 import os
 import shutil
+from collections import OrderedDict
 from queue import Empty, Queue
-from threading import Thread
+from threading import Event, Thread
 
 import pytest
 import sqlalchemy
@@ -486,7 +487,8 @@ def test_init_latest_grype_db_engine(staging_grype_db_dir):
 
     # Validate output
     assert str(
-        latest_grype_db_engine.url) == "sqlite:///{}".format(expected_output)
+        latest_grype_db_engine.url
+    ) == "sqlite:///file:{}?mode=ro&uri=true".format(expected_output)
 
 
 def test_init_latest_grype_db_session_maker(staging_grype_db_dir):
@@ -1181,6 +1183,72 @@ def test_query_vulnerabilities_missing_session():
         )
 
 
+def test_query_vulnerability_metadata_single_flight(monkeypatch):
+    # Create grype_wrapper_singleton instance, with an empty metadata cache
+    grype_wrapper_singleton = TestGovulnersWrapperSingleton.get_instance()
+    monkeypatch.setattr(grype_wrapper_singleton, "_vulnerability_metadata_cache",
+                        OrderedDict())
+    monkeypatch.setattr(grype_wrapper_singleton,
+                        "_vulnerability_metadata_in_flight", {})
+
+    queried = []
+    query_started = Event()
+    release_query = Event()
+
+    def mock_query_and_cache(vuln_ids, namespaces, namespaces_key):
+        # Hold the first query open until the second lookup is waiting on it
+        queried.append(list(vuln_ids))
+        query_started.set()
+        release_query.wait(5)
+        records = ["record-" + vuln_id for vuln_id in vuln_ids]
+        for vuln_id, record in zip(vuln_ids, records):
+            grype_wrapper_singleton._vulnerability_metadata_cache[(
+                vuln_id, namespaces_key)] = [record]
+        return records
+
+    monkeypatch.setattr(grype_wrapper_singleton,
+                        "_query_and_cache_vulnerability_metadata",
+                        mock_query_and_cache)
+
+    output = Queue()
+    lookups = [
+        Thread(target=lambda: output.put(
+            sorted(
+                grype_wrapper_singleton.query_vulnerability_metadata(
+                    ["CVE-1", "CVE-2"], ["nvd"])))) for _ in range(2)
+    ]
+
+    # Function under test
+    lookups[0].start()
+    assert query_started.wait(5)
+
+    # Signal when the second lookup waits on the in-flight query of the first
+    in_flight = grype_wrapper_singleton._vulnerability_metadata_in_flight
+    in_flight_query_done = in_flight[("CVE-1", frozenset(["nvd"]))]
+    waiting = Event()
+
+    class ObservedEvent:
+
+        def wait(self, timeout=None):
+            waiting.set()
+            return in_flight_query_done.wait(timeout)
+
+    for cache_key in in_flight:
+        in_flight[cache_key] = ObservedEvent()
+
+    lookups[1].start()
+    assert waiting.wait(5)
+    release_query.set()
+    for lookup in lookups:
+        lookup.join(5)
+
+    # Validate that the ids were only queried once, and both lookups got the records
+    assert queried == [["CVE-1", "CVE-2"]]
+    assert output.get_nowait() == ["record-CVE-1", "record-CVE-2"]
+    assert output.get_nowait() == ["record-CVE-1", "record-CVE-2"]
+    assert grype_wrapper_singleton._vulnerability_metadata_in_flight == {}
+
+
 @pytest.mark.parametrize(
     "expected_group, expected_count, use_staging",
     [
@@ -1477,3 +1545,55 @@ class TestLocking:
         # Tell the reader to release the lock.
         reader_instruction_queue.put(True)
         reader.join()
+
+
+def test_replaced_grype_db_engines_are_disposed(monkeypatch):
+    # Create grype_wrapper_singleton instance, without production or staging grype_dbs
+    grype_wrapper_singleton = TestGovulnersWrapperSingleton.get_instance()
+    for db_attribute in (
+            "_govulners_db_dir_internal",
+            "_govulners_db_version_internal",
+            "_govulners_db_session_maker_internal",
+            "_govulners_db_engine_internal",
+            "_staging_govulners_db_dir_internal",
+            "_staging_govulners_db_version_internal",
+            "_staging_govulners_db_session_maker_internal",
+            "_staging_govulners_db_engine_internal",
+    ):
+        monkeypatch.setattr(grype_wrapper_singleton, db_attribute, None)
+    monkeypatch.setattr(grype_wrapper_singleton, "_metadata_file_cache", {})
+    monkeypatch.setattr(grype_wrapper_singleton,
+                        "get_govulners_db_engine_metadata",
+                        lambda use_staging: None)
+
+    disposed = []
+
+    class MockEngine:
+        url = "sqlite://"
+
+        def dispose(self):
+            disposed.append(self)
+
+    production_engine = MockEngine()
+    updated_production_engine = MockEngine()
+    staging_engine = MockEngine()
+
+    # Function under test
+    grype_wrapper_singleton._set_govulners_db("old_version", GOVULNERS_DB_VERSION,
+                                              production_engine,
+                                              sessionmaker(), "old_version",
+                                              False)
+    grype_wrapper_singleton._set_govulners_db("new_version", GOVULNERS_DB_VERSION,
+                                              staging_engine, sessionmaker(),
+                                              "new_version", True)
+    assert disposed == []
+
+    grype_wrapper_singleton._set_govulners_db("new_version", GOVULNERS_DB_VERSION,
+                                              updated_production_engine,
+                                              sessionmaker(), "new_version",
+                                              False)
+    assert disposed == [production_engine]
+
+    grype_wrapper_singleton.unstage_govulners_db()
+    assert disposed == [production_engine, staging_engine]
+    assert grype_wrapper_singleton._staging_govulners_db_engine_internal is None
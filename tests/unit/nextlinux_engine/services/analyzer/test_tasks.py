@@ -0,0 +1,32 @@
+import pytest
+
+from nextlinux_engine.services.analyzer.tasks import Status, WorkerTask
+
+
+class SucceedingTask(WorkerTask):
+    def execute(self):
+        pass
+
+
+class FailingTask(WorkerTask):
+    def execute(self):
+        raise ValueError("task failed")
+
+
+@pytest.mark.parametrize(
+    "task_class, expected_status",
+    [(SucceedingTask, Status.success), (FailingTask, Status.failed)],
+)
+def test_done_callbacks(task_class, expected_status):
+    task = task_class()
+    completed = []
+    task.add_done_callback(completed.append)
+
+    assert not task.done()
+
+    task.start()
+    task.join()
+
+    assert task.done()
+    assert task.status == expected_status
+    assert completed == [task]
@@ -0,0 +1,62 @@
+import pytest
+
+from nextlinux_engine.common.models.schemas import QueueMessage
+from nextlinux_engine.services.analyzer.analysis import ImageAnalysisTask
+from nextlinux_engine.services.analyzer.imports import ImportTask
+from nextlinux_engine.services.analyzer.watchers.analysis import (
+    AnalysisWatcher,
+    UnexpectedTaskTypeError,
+)
+
+analysis_message = {
+    "userId": "account1",
+    "imageDigest": "sha256:abc123def456",
+    "manifest": "{}",
+    "parent_manifest": None,
+}
+
+import_message = {
+    "userId": "account1",
+    "imageDigest": "sha256:abc123def456",
+    "manifest": {
+        "tags": ["sometag"],
+        "digest": "sha256:abc123def456",
+        "local_image_id": "sha256:def",
+        "contents": [
+            {
+                "content_type": "packages",
+                "digest": "sha256:abc",
+                "bucket": "import_data",
+                "key": "somevalue",
+            },
+        ],
+        "operation_uuid": "someid",
+    },
+    "parent_manifest": None,
+}
+
+
+@pytest.mark.parametrize(
+    "data, config, owned_filter, expected_class, expected_owned_filter",
+    [
+        (analysis_message, {}, None, ImageAnalysisTask, True),
+        (
+            analysis_message,
+            {"enable_owned_package_filtering": "false"},
+            None,
+            ImageAnalysisTask,
+            False,
+        ),
+        (import_message, {}, False, ImportTask, False),
+        (import_message, {}, True, ImportTask, True),
+    ],
+)
+def test_build_task(data, config, owned_filter, expected_class, expected_owned_filter):
+    task = AnalysisWatcher.build_task(QueueMessage(data=data), config, owned_filter)
+    assert type(task) == expected_class
+    assert task.owned_package_filtering_enabled == expected_owned_filter
+
+
+def test_build_task_unexpected_message():
+    with pytest.raises(UnexpectedTaskTypeError):
+        AnalysisWatcher.build_task(QueueMessage(data={"manifest": 1}), {})
@@ -0,0 +1,88 @@
+"""
+Unit tests for the /user route handlers of external API service
+"""
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from nextlinux_engine.apis.authorization import get_authorizer, init_authz_handler
+from nextlinux_engine.db import UserAccessCredentialTypes
+
+
+@pytest.fixture
+def user_controller():
+    # The handlers are wrapped by the authorizer when the controller module is imported
+    if get_authorizer() is None:
+        init_authz_handler({})
+    from nextlinux_engine.services.apiext.api.controllers import user
+
+    return user
+
+
+@pytest.fixture
+def mock_user_record(monkeypatch, user_controller):
+    """
+    Returns a callback that makes the handlers load the given record for the authenticated user
+    """
+
+    def _mock_user_record(user_record):
+        @contextmanager
+        def session_scope():
+            yield None
+
+        manager = MagicMock()
+        manager.get_user.return_value = user_record
+        monkeypatch.setattr(user_controller, "session_scope", session_scope)
+        monkeypatch.setattr(
+            user_controller.identities.manager_factory,
+            "for_session",
+            lambda session: manager,
+        )
+        monkeypatch.setattr(
+            user_controller.ApiRequestContextProxy,
+            "identity",
+            lambda: MagicMock(username="user1"),
+        )
+        return manager
+
+    return _mock_user_record
+
+
+@pytest.mark.parametrize("credentials", [None, {}])
+def test_get_credentials_without_password(
+    user_controller, mock_user_record, credentials
+):
+    manager = mock_user_record({"username": "user1", "credentials": credentials})
+
+    # Call the handler itself, without the authorizer
+    response, status = user_controller.get_credentials.__wrapped__()
+
+    assert (response, status) == ([], 200)
+    manager.get_user.assert_called_once_with("user1")
+
+
+def test_get_credentials_with_password(user_controller, mock_user_record):
+    mock_user_record(
+        {
+            "username": "user1",
+            "credentials": {
+                UserAccessCredentialTypes.password: {
+                    "type": UserAccessCredentialTypes.password,
+                    "value": "secret",
+                    "created_at": 0,
+                }
+            },
+        }
+    )
+
+    response, status = user_controller.get_credentials.__wrapped__()
+
+    assert status == 200
+    assert response == [
+        {
+            "type": UserAccessCredentialTypes.password.value,
+            "value": "******",
+            "created_at": "1970-01-01T00:00:00Z",
+        }
+    ]
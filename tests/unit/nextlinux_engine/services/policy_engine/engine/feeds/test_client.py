@@ -0,0 +1,342 @@
+import datetime
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+import nextlinux_engine.services.policy_engine.engine.feeds.client as client_module
+from nextlinux_engine.services.policy_engine.engine.feeds.client import (
+    FeedServiceClient,
+    GovulnersDBServiceClient,
+    GovulnersDBUnavailable,
+    HTTPBasicAuthClient,
+    HTTPClientResponse,
+)
+
+
+@pytest.mark.parametrize(
+    "response, expected_next_token, expected_count",
+    [
+        (
+            {
+                "data": [{"a": {"b": [1, 2]}, "c": "x"}, {"d": 1}],
+                "next_token": "sometoken",
+            },
+            "sometoken",
+            2,
+        ),
+        ({"data": [], "next_token": ""}, None, 0),
+        ({"data": [{"x": 1}] * 5, "next_token": None}, None, 5),
+        (
+            {"next_token": "sometoken", "data": [{"next_token": "nested"}]},
+            "sometoken",
+            1,
+        ),
+        ({"data": [1, "a", [2], None, True]}, None, 5),
+        ({"data": {"a": 1, "b": 2}, "next_token": "sometoken"}, "sometoken", 0),
+        ({"data": [[{"x": 1}], {"y": [{}]}], "other": [1, 2]}, None, 2),
+    ],
+)
+@pytest.mark.parametrize("decoded", [True, False])
+def test_extract_response_data(
+    monkeypatch, response, expected_next_token, expected_count, decoded
+):
+    if not decoded:
+        # Every page is over the limit, so it is walked with ijson
+        monkeypatch.setattr(client_module, "FEED_DATA_DECODE_MAX_BYTES", 0)
+    response_content = json.dumps(response).encode("utf-8")
+    next_token, data, count = FeedServiceClient._extract_response_data(response_content)
+    assert next_token == expected_next_token
+    assert data == response_content
+    assert count == expected_count
+
+
+def test_execute_request_reuses_session(monkeypatch):
+    http_client = HTTPBasicAuthClient(username="user", password="pass")
+    calls = []
+
+    def mock_request(method, url, **kwargs):
+        calls.append((method, url, kwargs))
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {"Content-Type": "application/json"}
+        response.content = b"{}"
+        return response
+
+    monkeypatch.setattr(http_client._session, "request", mock_request)
+
+    for _ in range(2):
+        response = http_client.execute_request("GET", "https://feeds/v1")
+        assert response.success
+        assert response.content == b"{}"
+
+    assert [(method, url) for method, url, _ in calls] == [
+        ("GET", "https://feeds/v1"),
+        ("GET", "https://feeds/v1"),
+    ]
+    assert calls[0][2]["auth"] == ("user", "pass")
+
+
+def test_session_per_thread():
+    http_client = HTTPBasicAuthClient(username="user", password="pass")
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(http_client._session))
+    thread.start()
+    thread.join()
+
+    assert http_client._session is http_client._session
+    assert sessions[0] is not http_client._session
+
+
+@pytest.mark.parametrize("status_code, streamed", [(200, True), (500, False)])
+def test_execute_request_stream(monkeypatch, status_code, streamed):
+    http_client = HTTPBasicAuthClient(username=None, password=None)
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"Content-Type": "application/x-tar"}
+    response.content = b"error body"
+    response.iter_content.return_value = iter([b"chunk1", b"chunk2"])
+    request = MagicMock(return_value=response)
+    monkeypatch.setattr(http_client._session, "request", request)
+    client_response = http_client.execute_request(
+        "GET", "https://toolbox/db.tar.gz", retries=1, stream=True
+    )
+
+    assert request.call_args[1]["stream"] is True
+    if streamed:
+        assert not response.close.called
+        assert list(client_response.content) == [b"chunk1", b"chunk2"]
+        response.iter_content.assert_called_once_with(
+            chunk_size=HTTPBasicAuthClient.STREAM_CHUNK_SIZE
+        )
+        assert response.close.called
+    else:
+        assert client_response.content == b"error body"
+
+
+@pytest.mark.parametrize(
+    "failure, expected_delays, expected_content",
+    [
+        (
+            requests.exceptions.ConnectTimeout("timed out"),
+            [1, 1, 1],
+            b"server error: timed_out: timed out",
+        ),
+        (
+            requests.exceptions.ConnectionError("connection reset"),
+            [0.5, 1, 2],
+            b"server error: connection reset",
+        ),
+    ],
+)
+def test_execute_request_retry_delays(
+    monkeypatch, failure, expected_delays, expected_content
+):
+    http_client = HTTPBasicAuthClient(username=None, password=None, retries=4)
+    sleeps = []
+
+    def mock_request(method, url, **kwargs):
+        raise failure
+
+    monkeypatch.setattr(http_client._session, "request", mock_request)
+    monkeypatch.setattr(
+        "nextlinux_engine.services.policy_engine.engine.feeds.client.time.sleep",
+        sleeps.append,
+    )
+    # Always take the longest wait allowed by the backoff
+    monkeypatch.setattr(
+        "nextlinux_engine.services.policy_engine.engine.feeds.client.random.uniform",
+        lambda low, high: high,
+    )
+
+    response = http_client.execute_request("GET", "https://feeds/v1")
+
+    assert not response.success
+    assert response.content == expected_content
+    # No wait after the last attempt
+    assert sleeps == expected_delays
+
+
+def test_list_feeds_pages():
+    pages = [
+        b'{"feeds": [{"name": "vulnerabilities", "access_tier": 0}], "next_token": "page2"}',
+        b'{"feeds": [{"name": "nvdv2", "description": "nvd"}], "next_token": null}',
+    ]
+    http_client = MagicMock()
+    http_client.execute_request.side_effect = [
+        HTTPClientResponse(success=True, status_code=200, content=page)
+        for page in pages
+    ]
+
+    feed_list = FeedServiceClient("https://feeds/v1", http_client).list_feeds()
+
+    assert [feed.name for feed in feed_list.feeds] == ["vulnerabilities", "nvdv2"]
+    assert feed_list.feeds[1].description == "nvd"
+    # Fields missing from a listing are None
+    assert feed_list.feeds[0].description is None
+    assert feed_list.feeds[1].access_tier is None
+    assert http_client.execute_request.call_args_list[1][0][1] == (
+        "https://feeds/v1?next_token=page2"
+    )
+
+
+def test_auth_client_config_overrides():
+    client = HTTPBasicAuthClient(
+        "user", "pass", connect_timeout=5, read_timeout="120", verify=False
+    )
+
+    assert client.auth_config["conn_timeout"] == 5
+    assert client.auth_config["read_timeout"] == "120"
+    assert (
+        client.auth_config["max_retries"]
+        == HTTPBasicAuthClient.client_config["max_retries"]
+    )
+    assert client.auth_config["verify"] is False
+    assert (client._conn_timeout, client._read_timeout) == (5, 120)
+    # The class defaults are never modified by an instance's overrides
+    assert HTTPBasicAuthClient.client_config["conn_timeout"] == 3
+    assert HTTPBasicAuthClient.client_config["verify"] is True
+
+
+@pytest.mark.parametrize(
+    "since, next_token, expected_url",
+    [
+        (None, None, "https://feeds/v1/vulnerabilities/alpine:3.6"),
+        (
+            None,
+            "abc",
+            "https://feeds/v1/vulnerabilities/alpine:3.6?next_token=abc",
+        ),
+        (
+            datetime.datetime(2021, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            None,
+            "https://feeds/v1/vulnerabilities/alpine:3.6?since=2021-01-02T03%3A04%3A05%2B00%3A00",
+        ),
+        (
+            datetime.datetime(2021, 1, 2, 3, 4, 5),
+            "abc",
+            "https://feeds/v1/vulnerabilities/alpine:3.6?since=2021-01-02T03%3A04%3A05&next_token=abc",
+        ),
+    ],
+)
+def test_get_raw_feed_group_data_url(since, next_token, expected_url):
+    http_client = MagicMock()
+    client = FeedServiceClient("https://feeds/v1", http_client)
+
+    client.get_raw_feed_group_data("vulnerabilities", "alpine:3.6", since, next_token)
+
+    assert http_client.execute_request.call_args[0][1] == expected_url
+
+
+def test_list_feed_groups():
+    groups = [
+        {"name": "alpine:3.6", "description": "alpine 3.6", "access_tier": 0},
+        {"name": "debian:10", "description": "debian 10", "access_tier": 1},
+    ]
+    http_client = MagicMock()
+    http_client.execute_request.return_value = HTTPClientResponse(
+        success=True,
+        status_code=200,
+        content=json.dumps({"groups": groups}).encode("utf-8"),
+    )
+
+    group_list = FeedServiceClient("https://feeds/v1", http_client).list_feed_groups(
+        "vulnerabilities"
+    )
+
+    assert [
+        (group.name, group.description, group.access_tier)
+        for group in group_list.groups
+    ] == [("alpine:3.6", "alpine 3.6", 0), ("debian:10", "debian 10", 1)]
+
+
+GOVULNERS_DB_LISTING = {
+    "available": {
+        "1": [{"built": "2021-01-01T00:00:00Z", "version": 1, "url": "v1-1"}],
+        "2": [
+            {"built": "2021-01-02T00:00:00Z", "version": 2, "url": "v2-2"},
+            {"built": "2021-01-01T00:00:00Z", "version": 2, "url": "v2-1"},
+        ],
+    }
+}
+
+
+@pytest.mark.parametrize(
+    "version, expected_url",
+    [("1", "v1-1"), ("2", "v2-2"), ("3", None)],
+)
+def test_list_govulners_db_listing(monkeypatch, version, expected_url):
+    http_client = MagicMock()
+    http_client.execute_request.return_value = HTTPClientResponse(
+        success=True,
+        status_code=200,
+        content=json.dumps(GOVULNERS_DB_LISTING).encode("utf-8"),
+    )
+    monkeypatch.setattr(
+        GovulnersDBServiceClient,
+        "_get_supported_govulners_db_version",
+        staticmethod(lambda: version),
+    )
+    client = GovulnersDBServiceClient("https://toolbox/listing.json", http_client)
+
+    if expected_url is None:
+        with pytest.raises(GovulnersDBUnavailable):
+            client._list_feed_groups()
+    else:
+        assert client._list_feed_groups()["url"] == expected_url
+
+
+def test_list_feed_groups_pages():
+    pages = [
+        {"groups": [{"name": "alpine:3.6"}], "next_token": "page2"},
+        {"groups": [{"name": "debian:10"}], "next_token": "page3"},
+        {"groups": [{"name": "rhel:8"}]},
+    ]
+    http_client = MagicMock()
+    http_client.execute_request.side_effect = [
+        HTTPClientResponse(
+            success=True, status_code=200, content=json.dumps(page).encode("utf-8")
+        )
+        for page in pages
+    ]
+
+    group_list = FeedServiceClient("https://feeds/v1", http_client).list_feed_groups(
+        "vulnerabilities"
+    )
+
+    assert [group.name for group in group_list.groups] == [
+        "alpine:3.6",
+        "debian:10",
+        "rhel:8",
+    ]
+    assert [call[0][1] for call in http_client.execute_request.call_args_list] == [
+        "https://feeds/v1/vulnerabilities",
+        "https://feeds/v1/vulnerabilities?next_token=page2",
+        "https://feeds/v1/vulnerabilities?next_token=page3",
+    ]
+
+
+@pytest.mark.parametrize(
+    "headers, expected_content_type",
+    [
+        ({"Content-Type": "application/json"}, "application/json"),
+        ({"Content-Type": "Application/JSON; charset=utf-8"}, "application/json"),
+        ({}, ""),
+    ],
+)
+def test_execute_request_content_type(monkeypatch, headers, expected_content_type):
+    http_client = HTTPBasicAuthClient(username=None, password=None)
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = headers
+    response.content = b"{}"
+    monkeypatch.setattr(
+        http_client._session, "request", MagicMock(return_value=response)
+    )
+
+    client_response = http_client.execute_request("GET", "https://feeds/v1")
+
+    assert client_response.success
+    assert client_response.content_type == expected_content_type
@@ -1,5 +1,4 @@
-from dataclasses import dataclass
-from typing import List
+from typing import Dict, FrozenSet, List, NamedTuple
 
 import pytest
 
@@ -15,6 +14,16 @@ from nextlinux_engine.services.policy_engine.engine.vulns.providers import (
     LegacyProvider,
 )
 
+# Config name and default sync config of each provider, keyed on the provider name used in the test cases
+PROVIDER_SYNC_CONFIGS = {
+    provider_name: (provider.get_config_name(),
+                    provider.get_default_sync_config())
+    for provider_name, provider in (
+        ("legacy", LegacyProvider()),
+        ("grype", GovulnersProvider()),
+    )
+}
+
 
 @pytest.mark.parametrize(
     "test_input, expected",
@@ -46,21 +55,21 @@ from nextlinux_engine.services.policy_engine.engine.vulns.providers import (
         ),
     ],
 )
-def test_get_feeds_config(test_input, expected):
-    localconfig.localconfig = test_input
+def test_get_feeds_config(monkeypatch, test_input, expected):
+    monkeypatch.setattr(localconfig, "localconfig", test_input)
     assert get_section_for_vulnerabilities() == expected
 
 
 @pytest.mark.parametrize(
     "provider,test_config,expected",
     [
-        pytest.param(LegacyProvider, {}, {"vulnerabilities", "nvdv2"},
+        pytest.param("legacy", {}, {"vulnerabilities", "nvdv2"},
                      id="invalid-empty"),
-        pytest.param(LegacyProvider,
+        pytest.param("legacy",
                      None, {"vulnerabilities", "nvdv2"},
                      id="invalid-none"),
         pytest.param(
-            LegacyProvider,
+            "legacy",
             {"a": {
                 "b": {
                     "c": "d"
@@ -70,13 +79,13 @@ def test_get_feeds_config(test_input, expected):
             id="invalid-gibberish",
         ),
         pytest.param(
-            LegacyProvider,
+            "legacy",
             {"sync": {}},
             {"vulnerabilities", "nvdv2"},
             id="invalid-empty-sync",
         ),
         pytest.param(
-            LegacyProvider,
+            "legacy",
             {"sync": {
                 "data": {}
             }},
@@ -84,7 +93,7 @@ def test_get_feeds_config(test_input, expected):
             id="invalid-empty-data",
         ),
         pytest.param(
-            LegacyProvider,
+            "legacy",
             {
                 "provider": "legacy",
                 "sync": {
@@ -95,7 +104,7 @@ def test_get_feeds_config(test_input, expected):
             id="invalid-provider-legacy",
         ),
         pytest.param(
-            GovulnersProvider,
+            "grype",
             {
                 "provider": "grype",
                 "sync": {
@@ -109,190 +118,55 @@ def test_get_feeds_config(test_input, expected):
 )
 def test_get_selected_configs_to_sync_defaults(provider, test_config,
                                                expected):
-    assert (set(
-        compute_selected_configs_to_sync(
-            provider.__config__name__,
-            test_config,
-            provider.__default_sync_config__,
-        ).keys()) == expected)
+    config_name, default_sync_config = PROVIDER_SYNC_CONFIGS[provider]
+    assert (compute_selected_configs_to_sync(
+        config_name,
+        test_config,
+        default_sync_config,
+    ).keys() == expected)
+
+
+def get_single_feed_config(provider: str, feed_name: str) -> Dict:
+    return {
+        "provider": provider,
+        "sync": {
+            "data": {
+                feed_name: {
+                    "enabled": True
+                }
+            }
+        },
+    }
 
 
 @pytest.mark.parametrize(
-    "provider, test_config, expected",
+    "provider, feed_name, expected",
     [
-        pytest.param(
-            LegacyProvider,
-            {
-                "provider": "legacy",
-                "sync": {
-                    "data": {
-                        "packages": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            {"packages"},
-            id="valid-legacy-packages",
-        ),
-        pytest.param(
-            LegacyProvider,
-            {
-                "provider": "legacy",
-                "sync": {
-                    "data": {
-                        "github": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            {"github"},
-            id="valid-legacy-github",
-        ),
-        pytest.param(
-            LegacyProvider,
-            {
-                "provider": "legacy",
-                "sync": {
-                    "data": {
-                        "vulnerabilities": {
-                            "enabled": True
-                        }
-                    }
-                },
-            },
-            {"vulnerabilities"},
-            id="valid-legacy-vulnerabilities",
-        ),
-        pytest.param(
-            LegacyProvider,
-            {
-                "provider": "legacy",
-                "sync": {
-                    "data": {
-                        "nvdv2": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            {"nvdv2"},
-            id="valid-legacy-nvdv2",
-        ),
-        pytest.param(
-            LegacyProvider,
-            {
-                "provider": "legacy",
-                "sync": {
-                    "data": {
-                        "vulndb": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            set(),
-            id="invalid-legacy-vulndb",
-        ),
-        pytest.param(
-            GovulnersProvider,
-            {
-                "provider": "grype",
-                "sync": {
-                    "data": {
-                        "grypedb": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            {"grypedb"},
-            id="valid-grype-grypedb",
-        ),
-        pytest.param(
-            GovulnersProvider,
-            {
-                "provider": "grype",
-                "sync": {
-                    "data": {
-                        "github": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            set(),
-            id="invalid-grype-github",
-        ),
-        pytest.param(
-            GovulnersProvider,
-            {
-                "provider": "grype",
-                "sync": {
-                    "data": {
-                        "vulnerabilities": {
-                            "enabled": True
-                        }
-                    }
-                },
-            },
-            set(),
-            id="invalid-grype-vulnerabilities",
-        ),
-        pytest.param(
-            GovulnersProvider,
-            {
-                "provider": "grype",
-                "sync": {
-                    "data": {
-                        "nvdv2": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            set(),
-            id="invalid-grype-nvdv2",
-        ),
-        pytest.param(
-            GovulnersProvider,
-            {
-                "provider": "grype",
-                "sync": {
-                    "data": {
-                        "vulndb": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            set(),
-            id="invalid-grype-vulndb",
-        ),
-        pytest.param(
-            LegacyProvider,
-            {
-                "provider": "legacy",
-                "sync": {
-                    "data": {
-                        "grypedb": {
-                            "enabled": True
-                        }
-                    }
-                }
-            },
-            set(),
-            id="invalid-legacy-grypedb",
-        ),
+        pytest.param("legacy", "packages", {"packages"},
+                     id="valid-legacy-packages"),
+        pytest.param("legacy", "github", {"github"}, id="valid-legacy-github"),
+        pytest.param("legacy",
+                     "vulnerabilities", {"vulnerabilities"},
+                     id="valid-legacy-vulnerabilities"),
+        pytest.param("legacy", "nvdv2", {"nvdv2"}, id="valid-legacy-nvdv2"),
+        pytest.param("legacy", "vulndb", set(), id="invalid-legacy-vulndb"),
+        pytest.param("grype", "grypedb", {"grypedb"}, id="valid-grype-grypedb"),
+        pytest.param("grype", "github", set(), id="invalid-grype-github"),
+        pytest.param("grype",
+                     "vulnerabilities",
+                     set(),
+                     id="invalid-grype-vulnerabilities"),
+        pytest.param("grype", "nvdv2", set(), id="invalid-grype-nvdv2"),
+        pytest.param("grype", "vulndb", set(), id="invalid-grype-vulndb"),
+        pytest.param("legacy", "grypedb", set(), id="invalid-legacy-grypedb"),
     ],
 )
-def test_get_selected_configs_to_sync_valid_data(provider, test_config,
+def test_get_selected_configs_to_sync_valid_data(provider, feed_name,
                                                  expected):
-    assert (set(
-        compute_selected_configs_to_sync(
-            provider.__config__name__, test_config,
-            provider.__default_sync_config__).keys()) == expected)
+    config_name, default_sync_config = PROVIDER_SYNC_CONFIGS[provider]
+    assert (compute_selected_configs_to_sync(
+        config_name, get_single_feed_config(provider, feed_name),
+        default_sync_config).keys() == expected)
 
 
 @pytest.mark.parametrize(
@@ -378,30 +252,32 @@ def test_is_sync_enabled(test_input, expected):
     assert is_sync_enabled(test_input) == expected
 
 
-@dataclass
-class FeedConfiguration:
+class FeedConfiguration(NamedTuple):
     feed_name: str
     enabled: bool
 
 
+FEED_URL = "www.next-linux.systems"
+
+# Sync settings shared by every generated config, only the data section varies per case
+SYNC_SETTINGS = {
+    "enabled": True,
+    "ssl_verify": True,
+    "connection_timeout_seconds": 3,
+    "read_timeout_seconds": 60,
+}
+
+
 def get_config_for_params(provider: str,
                           feed_configurations: List[FeedConfiguration]):
-    return {
-        "provider": provider,
-        "sync": {
-            "enabled": True,
-            "ssl_verify": True,
-            "connection_timeout_seconds": 3,
-            "read_timeout_seconds": 60,
-            "data": {
-                feed_configuration.feed_name: {
-                    "enabled": feed_configuration.enabled,
-                    "url": "www.next-linux.systems",
-                }
-                for feed_configuration in feed_configurations
-            },
-        },
+    data = {
+        feed_configuration.feed_name: {
+            "enabled": feed_configuration.enabled,
+            "url": FEED_URL,
+        }
+        for feed_configuration in feed_configurations
     }
+    return {"provider": provider, "sync": {**SYNC_SETTINGS, "data": data}}
 
 
 @pytest.mark.parametrize(
@@ -415,7 +291,7 @@ def get_config_for_params(provider: str,
                 FeedConfiguration("vulndb", True),
                 FeedConfiguration("grypedb", True),
             ],
-            ["nvdv2", "vulnerabilities"],
+            frozenset({"nvdv2", "vulnerabilities"}),
         ),
         (  # Govulners provider with one invalid config (vulndb) one grype config, and two legacy configs
             "grype",
@@ -425,7 +301,7 @@ def get_config_for_params(provider: str,
                 FeedConfiguration("vulndb", True),
                 FeedConfiguration("grypedb", True),
             ],
-            ["grypedb"],
+            frozenset({"grypedb"}),
         ),
         (  # Legacy provider with two disabled configs and one grypedb config that is enabled
             "legacy",
@@ -434,7 +310,7 @@ def get_config_for_params(provider: str,
                 FeedConfiguration("nvdv2", False),
                 FeedConfiguration("grypedb", True),
             ],
-            [],
+            frozenset(),
         ),
         (  # Govulners provider disabled grypedb config and two legacy configs enabled
             "grype",
@@ -443,7 +319,7 @@ def get_config_for_params(provider: str,
                 FeedConfiguration("nvdv2", True),
                 FeedConfiguration("grypedb", False),
             ],
-            [],
+            frozenset(),
         ),
         (  # Legacy provider all disabled configs
             "legacy",
@@ -452,7 +328,7 @@ def get_config_for_params(provider: str,
                 FeedConfiguration("nvdv2", False),
                 FeedConfiguration("grypedb", False),
             ],
-            [],
+            frozenset(),
         ),
         (  # Govulners provider with all disabled configs
             "grype",
@@ -461,7 +337,7 @@ def get_config_for_params(provider: str,
                 FeedConfiguration("nvdv2", False),
                 FeedConfiguration("grypedb", False),
             ],
-            [],
+            frozenset(),
         ),
         (  # Govulners provider with packages and grypedb enabled
             "grype",
@@ -471,7 +347,7 @@ def get_config_for_params(provider: str,
                 FeedConfiguration("grypedb", True),
                 FeedConfiguration("packages", True),
             ],
-            ["grypedb", "packages"],
+            frozenset({"grypedb", "packages"}),
         ),
         (  # legacy provider with packages and grypedb enabled
             "legacy",
@@ -481,24 +357,20 @@ def get_config_for_params(provider: str,
                 FeedConfiguration("grypedb", True),
                 FeedConfiguration("packages", True),
             ],
-            ["packages"],
+            frozenset({"packages"}),
         ),
     ],
 )
 def test_compute_selected_configs_to_sync(
     provider: str,
     feed_configurations: List[FeedConfiguration],
-    expected_to_sync_after_compute: List[str],
+    expected_to_sync_after_compute: FrozenSet[str],
 ):
-    if provider == "legacy":
-        vulnerabilities_provider = LegacyProvider()
-    else:
-        vulnerabilities_provider = GovulnersProvider()
+    config_name, default_sync_config = PROVIDER_SYNC_CONFIGS[provider]
     sync_configs = compute_selected_configs_to_sync(
-        provider=vulnerabilities_provider.get_config_name(),
+        provider=config_name,
         vulnerabilities_config=get_config_for_params(provider,
                                                      feed_configurations),
-        default_provider_sync_config=vulnerabilities_provider.
-        get_default_sync_config(),
+        default_provider_sync_config=default_sync_config,
     )
-    assert set(sync_configs.keys()) == set(expected_to_sync_after_compute)
+    assert sync_configs.keys() == expected_to_sync_after_compute
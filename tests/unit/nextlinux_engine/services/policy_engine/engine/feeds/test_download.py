@@ -6,16 +6,22 @@ import json
 import os
 import shutil
 import tempfile
+import uuid
 from os import path
 from typing import Callable
 
 import pytest
+import requests.exceptions
 
 from nextlinux_engine.common.models.schemas import (
+    DownloadOperationConfiguration,
     DownloadOperationResult,
+    GroupDownloadOperationConfiguration,
+    GroupDownloadOperationParams,
     GroupDownloadResult,
     LocalFeedDataRepoMetadata,
 )
+from nextlinux_engine.services.policy_engine.engine.feeds import GroupData
 from nextlinux_engine.services.policy_engine.engine.feeds.download import (
     FeedDataFileJsonIterator,
     FeedDownloader,
@@ -211,6 +217,18 @@ class TestLocalFeedDataRepo:
         logger.info("Repo metadata: {}".format(r.metadata))
         assert found_count > 0
 
+    def test_write_chunked_data(self, get_tmpdir):
+        tmpdir = get_tmpdir
+        r = LocalFeedDataRepo(metadata=LocalFeedDataRepoMetadata(
+            data_write_dir=tmpdir))
+        r.initialize()
+        chunks = [b"first chunk,", b"second chunk,", b"last chunk"]
+
+        r.write_data("feed1", "group1", chunk_id=0, data=iter(chunks))
+
+        with open(path.join(tmpdir, "feed1", "group1", "0"), "rb") as f:
+            assert f.read() == b"".join(chunks)
+
     def test_write_read_files(self, get_tmpdir, get_file):
         """
         Test writing chunks of binary data to LocalFeedDataRepo and reading using LocalFeedDataRepo.read_files()
@@ -319,3 +337,75 @@ class TestIterators:
                 expected_data = f.read()
             assert expected_data == file_data.data
             assert group_metadata[f"{idx}.data"] == file_data.metadata
+
+
+class StreamingFeedClient:
+    """
+    Serves a single page of streamed group data, whose body read fails on the first failed_reads requests
+    """
+
+    CHUNKS = [b"first chunk,", b"second chunk,", b"last chunk"]
+
+    def __init__(self, failed_reads):
+        self.failed_reads = failed_reads
+        self.requests = 0
+
+    def _stream(self, fail):
+        yield self.CHUNKS[0]
+        if fail:
+            raise requests.exceptions.ChunkedEncodingError("connection dropped")
+        yield from self.CHUNKS[1:]
+
+    def get_feed_group_data(self, feed, group, since=None, next_token=None):
+        self.requests += 1
+        return GroupData(
+            data=self._stream(self.requests <= self.failed_reads),
+            next_token=None,
+            since=since,
+            record_count=1,
+            response_metadata={},
+        )
+
+
+class TestFeedDownloader:
+
+    def _downloader(self, tmpdir, client):
+        config = DownloadOperationConfiguration(
+            uuid=str(uuid.uuid4()),
+            source_uri=NEXTLINUXIO_URI,
+            groups=[
+                GroupDownloadOperationConfiguration(
+                    feed="govulnersdb",
+                    group="govulnersdb:3",
+                    parameters=GroupDownloadOperationParams(since=None),
+                )
+            ],
+        )
+        return FeedDownloader(download_root_dir=tmpdir,
+                              config=config,
+                              client=client,
+                              fetch_all=True)
+
+    def test_stream_read_retried(self, get_tmpdir):
+        client = StreamingFeedClient(
+            failed_reads=FeedDownloader.STREAM_READ_ATTEMPTS - 1)
+        repo = self._downloader(get_tmpdir, client).execute()
+
+        assert client.requests == FeedDownloader.STREAM_READ_ATTEMPTS
+        assert (repo.metadata.download_result.status ==
+                FeedDownloader.State.complete.value)
+        # The page is rewritten from its first chunk, without the data of the failed reads
+        with open(path.join(repo.root_dir, "govulnersdb", "govulnersdb:3", "0"),
+                  "rb") as f:
+            assert f.read() == b"".join(StreamingFeedClient.CHUNKS)
+
+    def test_stream_read_attempts_exhausted(self, get_tmpdir):
+        client = StreamingFeedClient(
+            failed_reads=FeedDownloader.STREAM_READ_ATTEMPTS)
+        repo = self._downloader(get_tmpdir, client).execute()
+
+        assert client.requests == FeedDownloader.STREAM_READ_ATTEMPTS
+        assert (repo.metadata.download_result.status ==
+                FeedDownloader.State.failed.value)
+        assert (repo.metadata.download_result.results[0].status ==
+                FeedDownloader.State.failed.value)
@@ -1,17 +1,27 @@
 import datetime
+from unittest.mock import MagicMock
 
 import pytest
 
-from nextlinux_engine.db.entities.policy_engine import FeedMetadata
+import nextlinux_engine.services.policy_engine.engine.feeds.sync as sync_module
+from nextlinux_engine.common.models.schemas import FeedAPIGroupRecord, FeedAPIRecord
+from nextlinux_engine.db.entities.policy_engine import FeedGroupMetadata, FeedMetadata
 from nextlinux_engine.services.policy_engine import init_feed_registry
-from nextlinux_engine.services.policy_engine.engine.feeds.feeds import feed_registry
+from nextlinux_engine.services.policy_engine.engine.feeds import FeedGroupList, FeedList
+from nextlinux_engine.services.policy_engine.engine.feeds.feeds import (
+    FeedSyncResult,
+    GroupSyncResult,
+    feed_registry,
+)
 from nextlinux_engine.services.policy_engine.engine.feeds.sync import (
     NvdV2Feed,
     PackagesFeed,
     VulnerabilityFeed,
 )
 from nextlinux_engine.services.policy_engine.engine.feeds.sync_utils import (
-    MetadataSyncUtils, )
+    LegacySyncUtilProvider,
+    MetadataSyncUtils,
+)
 
 
 @pytest.fixture
@@ -134,3 +144,133 @@ def test_pivot_and_filter_feeds_by_config(feed_db_records):
         assert (MetadataSyncUtils._pivot_and_filter_feeds_by_config(
             input["to_sync"], input["source_found"],
             input["db_found"]) == input["expected_result"])
+        # Sets of names are used as given
+        assert (MetadataSyncUtils._pivot_and_filter_feeds_by_config(
+            frozenset(input["to_sync"]), iter(input["source_found"]),
+            input["db_found"]) == input["expected_result"])
+
+
+def test_get_feed_group_information():
+    feed_names = ["vulnerabilities", "nvdv2", "packages"]
+    feed_client = MagicMock()
+    feed_client.list_feeds.return_value = FeedList(feeds=[
+        FeedAPIRecord(name=name, description="", access_tier=0)
+        for name in feed_names
+    ])
+    feed_client.list_feed_groups.side_effect = lambda feed: FeedGroupList(
+        groups=[
+            FeedAPIGroupRecord(name=feed + ":group",
+                               description="",
+                               access_tier=0)
+        ])
+
+    source_feeds = sync_module.DataFeeds.get_feed_group_information(
+        feed_client, ["vulnerabilities", "nvdv2"])
+
+    assert list(source_feeds) == ["vulnerabilities", "nvdv2"]
+    for name, feed_record in source_feeds.items():
+        assert feed_record.meta.name == name
+        assert [g.name for g in feed_record.groups] == [name + ":group"]
+    assert feed_client.list_feed_groups.call_count == 2
+
+
+class TestDataFeedsSyncDownloads:
+    group_names = ["group1", "group2", "group3"]
+
+    class MockDownloader:
+        def __init__(self, download_root_dir, config, client, fetch_all):
+            self.config = config
+            self.events = client.events
+
+        def execute(self, feed_name, group_name):
+            self.events.append(("download", group_name))
+            if group_name == "bad_group":
+                raise Exception("download failed")
+            repo = MagicMock()
+            repo.group_name = group_name
+            repo.teardown.side_effect = lambda: self.events.append(
+                ("teardown", group_name))
+            return repo
+
+    @pytest.fixture
+    def mock_sync(self, monkeypatch):
+        """
+        Patches DataFeeds.sync dependencies, returning the list of download, sync and teardown events in order
+        """
+        events = []
+        feed_client = MagicMock()
+        feed_client.events = events
+        feed = MagicMock()
+        feed.__feed_name__ = VulnerabilityFeed.__feed_name__
+
+        def sync_from_fetched(fetched_repo, **kwargs):
+            events.append(("sync", fetched_repo.group_name))
+            return [
+                FeedSyncResult(
+                    feed=feed.__feed_name__,
+                    status="success",
+                    groups=[
+                        GroupSyncResult(group=fetched_repo.group_name,
+                                        status="success")
+                    ],
+                )
+            ]
+
+        monkeypatch.setattr(sync_module, "FeedDownloader", self.MockDownloader)
+        monkeypatch.setattr(sync_module.DataFeeds,
+                            "get_feed_group_information",
+                            lambda *args: {})
+        monkeypatch.setattr(sync_module.DataFeeds, "sync_from_fetched",
+                            sync_from_fetched)
+        monkeypatch.setattr(sync_module, "feed_instance_by_name",
+                            lambda name: feed)
+        monkeypatch.setattr(sync_module.DataFeeds, "__scratch_dir__", "/tmp")
+
+        def _mock_sync(group_names):
+            groups = []
+            for group_name in group_names:
+                group = FeedGroupMetadata(name=group_name,
+                                          feed_name=feed.__feed_name__)
+                groups.append(group)
+
+            sync_util_provider = MagicMock()
+            sync_util_provider.to_sync = [feed.__feed_name__]
+            sync_util_provider.get_client.return_value = feed_client
+            sync_util_provider.sync_metadata.return_value = ({
+                feed.__feed_name__: None
+            }, [])
+            sync_util_provider.get_groups_to_download.return_value = groups
+            sync_util_provider.retrieve_group_result = (
+                LegacySyncUtilProvider.retrieve_group_result)
+            sync_util_provider.update_feed_result = (
+                LegacySyncUtilProvider.update_feed_result)
+
+            return sync_module.DataFeeds.sync(sync_util_provider), events
+
+        return _mock_sync
+
+    def test_groups_are_synced_in_order(self, mock_sync):
+        results, events = mock_sync(self.group_names)
+
+        # Downloads stay in group order, and every group is downloaded before it is synced and torn down
+        assert [event for event in events if event[0] == "download"
+               ] == [("download", name) for name in self.group_names]
+        assert [event for event in events if event[0] != "download"] == [
+            (event_type, name) for name in self.group_names
+            for event_type in ("sync", "teardown")
+        ]
+        for name in self.group_names:
+            assert events.index(("download", name)) < events.index(
+                ("sync", name))
+
+        assert len(results) == 1
+        assert results[0].status == "success"
+        assert [group.group for group in results[0].groups] == self.group_names
+
+    def test_failed_download_does_not_stop_later_groups(self, mock_sync):
+        results, events = mock_sync(["group1", "bad_group", "group3"])
+
+        assert ("sync", "bad_group") not in events
+        assert ("sync", "group3") in events
+        assert ("teardown", "group3") in events
+        assert results[0].status == "failure"
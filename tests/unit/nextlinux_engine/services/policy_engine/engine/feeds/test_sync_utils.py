@@ -1,6 +1,8 @@
 from typing import Dict, List, Type
 
 import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
 
 from nextlinux_engine.common.models.schemas import (
     FeedAPIGroupRecord,
@@ -9,20 +11,23 @@ from nextlinux_engine.common.models.schemas import (
 )
 from nextlinux_engine.db import FeedGroupMetadata, FeedMetadata
 from nextlinux_engine.db.entities.common import nextlinux_now_datetime
-from nextlinux_engine.services.policy_engine.engine.feeds import FeedList
+from nextlinux_engine.services.policy_engine.engine.feeds import FeedList, FeedRecord
 from nextlinux_engine.services.policy_engine.engine.feeds.client import (
     FeedServiceClient,
     GovulnersDBServiceClient,
     IFeedSource,
 )
 from nextlinux_engine.services.policy_engine.engine.feeds.config import SyncConfig
+from nextlinux_engine.services.policy_engine.engine.feeds.db import get_all_feeds
 from nextlinux_engine.services.policy_engine.engine.feeds.feeds import (
     GovulnersDBFeed,
     VulnerabilityFeed,
 )
+from nextlinux_engine.services.policy_engine.engine.feeds import sync_utils
 from nextlinux_engine.services.policy_engine.engine.feeds.sync_utils import (
     GovulnersDBSyncUtilProvider,
     LegacySyncUtilProvider,
+    MetadataSyncUtils,
     SyncUtilProvider,
 )
 
@@ -95,6 +100,19 @@ class TestSyncUtilProvider:
             sync_configs)
         assert set(filtered_configs) == set(expected_to_sync_after_filtering)
 
+    def test_to_sync_names(self):
+        provider = LegacySyncUtilProvider({
+            "nvdv2":
+            SyncConfig(url="www.next-linux.systems", enabled=True),
+            "vulnerabilities":
+            SyncConfig(url="www.next-linux.systems", enabled=True),
+            GovulnersDBFeed.__feed_name__:
+            SyncConfig(url="www.next-linux.systems", enabled=True),
+        })
+        assert provider.to_sync == ["nvdv2", "vulnerabilities"]
+        assert provider.to_sync_names == frozenset(
+            ["nvdv2", "vulnerabilities"])
+
     @pytest.mark.parametrize(
         "sync_util_provider, sync_configs, expected_client_class",
         [
@@ -145,16 +163,16 @@ class TestSyncUtilProvider:
         expected_feed_group_metadata: FeedMetadata,
     ):
         source_feeds = {
-            "grypedb": {
-                "meta":
-                FeedList(feeds=[
+            "grypedb":
+            FeedRecord(
+                meta=FeedList(feeds=[
                     FeedAPIRecord(
                         name="grypedb",
                         description="grypedb feed",
                         access_tier="0",
                     )
                 ]),
-                "groups": [
+                groups=[
                     FeedAPIGroupRecord(
                         name="grypedb:vulnerabilities",
                         description="grypedb:vulnerabilities group",
@@ -167,7 +185,7 @@ class TestSyncUtilProvider:
                         ),
                     )
                 ],
-            }
+            )
         }
         feeds_to_sync = [GovulnersDBFeed(metadata=metadata)]
         sync_config = {
@@ -183,6 +201,32 @@ class TestSyncUtilProvider:
             assert group.feed_name == expected_feed_group_metadata.feed_name
             assert group.name == expected_feed_group_metadata.name
 
+    @pytest.mark.parametrize(
+        "source_feeds, expected_cause",
+        [
+            ({}, KeyError),
+            ({
+                GovulnersDBFeed.__feed_name__:
+                FeedRecord(meta=None, groups=[])
+            }, ValueError),
+        ],
+    )
+    def test_get_groups_to_download_grype_invalid(self, source_feeds,
+                                                  expected_cause):
+        feeds_to_sync = [
+            GovulnersDBFeed(metadata=FeedMetadata(
+                name=GovulnersDBFeed.__feed_name__, enabled=True))
+        ]
+        sync_config = {
+            GovulnersDBFeed.__feed_name__:
+            SyncConfig(enabled=True, url="www.next-linux.systems")
+        }
+        with pytest.raises(ValueError) as error:
+            GovulnersDBSyncUtilProvider(sync_config).get_groups_to_download(
+                source_feeds, feeds_to_sync, "0")
+        # Whether the feed is missing or the group count is wrong is kept as the cause
+        assert type(error.value.__cause__) == expected_cause
+
     def test_get_groups_to_download_legacy(self):
         feed_group_metadata = [
             FeedGroupMetadata(name="vulnerabilities:alpine:3.10",
@@ -204,3 +248,167 @@ class TestSyncUtilProvider:
         groups_to_download = LegacySyncUtilProvider(
             sync_config).get_groups_to_download({}, feeds_to_sync, "0")
         assert groups_to_download == feed_group_metadata
+
+    def test_get_groups_to_download_legacy_skips_disabled(self, caplog):
+        enabled_group = FeedGroupMetadata(name="vulnerabilities:alpine:3.10",
+                                          enabled=True)
+        feeds_to_sync = [
+            VulnerabilityFeed(metadata=FeedMetadata(
+                name="vulnerabilities",
+                enabled=True,
+                groups=[
+                    enabled_group,
+                    FeedGroupMetadata(name="vulnerabilities:alpine:3.11",
+                                      enabled=False),
+                ],
+            )),
+            VulnerabilityFeed(metadata=FeedMetadata(
+                name="nvdv2",
+                enabled=False,
+                groups=[FeedGroupMetadata(name="nvdv2:cves", enabled=True)],
+            )),
+        ]
+        sync_config = {
+            "vulnerabilities":
+            SyncConfig(enabled=True, url="www.next-linux.systems")
+        }
+        groups_to_download = LegacySyncUtilProvider(
+            sync_config).get_groups_to_download({}, feeds_to_sync, "0")
+        assert groups_to_download == [enabled_group]
+        # Disabled groups are logged along with their feed
+        assert "vulnerabilities/vulnerabilities:alpine:3.11" in caplog.text
+
+
+class TestMetadataSyncUtils:
+
+    @pytest.fixture
+    def feeds_db(self):
+        engine = create_engine("sqlite://")
+        FeedMetadata.metadata.create_all(
+            engine,
+            tables=[FeedMetadata.__table__, FeedGroupMetadata.__table__])
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record_statement(conn, cursor, statement, parameters, context,
+                             executemany):
+            statements.append((statement.split()[0], executemany))
+
+        db = sessionmaker(bind=engine)()
+        yield db, statements
+        db.close()
+        engine.dispose()
+
+    def test_sync_new_feed_and_groups(self, feeds_db):
+        db, statements = feeds_db
+        feed_api_record = FeedRecord(
+            meta=FeedAPIRecord(name="vulnerabilities",
+                               description="vulns",
+                               access_tier=0),
+            groups=[
+                FeedAPIGroupRecord(name="alpine:3.{}".format(i),
+                                   description="alpine",
+                                   access_tier=0) for i in range(10)
+            ],
+        )
+
+        db_feeds = MetadataSyncUtils._sync_feed_metadata(
+            db, feed_api_record, {})
+        MetadataSyncUtils._sync_feed_group_metadata(db, feed_api_record,
+                                                    db_feeds)
+        db.flush()
+
+        # One insert for the feed and one batch for all of its groups
+        assert statements == [("INSERT", False), ("INSERT", True)]
+        assert len(db.query(FeedGroupMetadata).all()) == 10
+
+    def test_sync_existing_feeds_groups(self, feeds_db):
+        db, statements = feeds_db
+        feed_api_records = []
+        for feed_name in ("vulnerabilities", "nvdv2", "packages"):
+            db.add(
+                FeedMetadata(
+                    name=feed_name,
+                    groups=[FeedGroupMetadata(name=feed_name + ":group")],
+                ))
+            feed_api_records.append(
+                FeedRecord(
+                    meta=FeedAPIRecord(name=feed_name,
+                                       description="new description",
+                                       access_tier=0),
+                    groups=[
+                        FeedAPIGroupRecord(name=feed_name + ":group",
+                                           description="new description",
+                                           access_tier=0)
+                    ],
+                ))
+        db.commit()
+        db.expire_all()
+        statements.clear()
+
+        db_feeds = {x.name: x for x in get_all_feeds(db)}
+        for feed_api_record in feed_api_records:
+            MetadataSyncUtils._sync_feed_group_metadata(
+                db, feed_api_record, db_feeds)
+
+        # The feeds and all of their groups are loaded with two queries
+        assert statements == [("SELECT", False), ("SELECT", False)]
+        assert all(group.description == "new description"
+                   for feed in db_feeds.values() for group in feed.groups)
+
+    def test_sync_metadata(self, feeds_db, monkeypatch):
+        db, statements = feeds_db
+        db.add(FeedMetadata(name="vulnerabilities"))
+        db.commit()
+        monkeypatch.setattr(sync_utils, "get_session", lambda: db)
+        source_feeds = {
+            feed_name: FeedRecord(
+                meta=FeedAPIRecord(name=feed_name,
+                                   description="",
+                                   access_tier=0),
+                groups=[
+                    FeedAPIGroupRecord(name=feed_name + ":group",
+                                       description="",
+                                       access_tier=0)
+                ],
+            )
+            for feed_name in ("vulnerabilities", "nvdv2", "packages")
+        }
+        statements.clear()
+
+        synced_feeds, failed = MetadataSyncUtils.sync_metadata(
+            source_feeds, to_sync=["vulnerabilities", "nvdv2"])
+
+        assert failed == []
+        assert sorted(synced_feeds) == ["nvdv2", "vulnerabilities"]
+        assert all(isinstance(feed, FeedMetadata)
+                   for feed in synced_feeds.values())
+        # The feeds are only queried once, at the start of the sync
+        assert [statement for statement, _ in statements
+                ].count("SELECT") == 2
+        # The new feed, and then the new groups of both feeds in one batch
+        assert [(statement, executemany)
+                for statement, executemany in statements
+                if statement == "INSERT"] == [("INSERT", False),
+                                              ("INSERT", True)]
+        # Feeds found upstream that aren't configured are skipped
+        assert db.query(FeedMetadata).filter_by(
+            name="packages").one_or_none() is None
+
+    def test_resync_unchanged_metadata(self, feeds_db, monkeypatch):
+        db, statements = feeds_db
+        monkeypatch.setattr(sync_utils, "get_session", lambda: db)
+        client = GovulnersDBServiceClient("https://toolbox/listing.json",
+                                          None)
+        feed = client.list_feeds().feeds[0]
+        group = FeedAPIGroupRecord(name="govulnersdb:vulnerabilities",
+                                   description="govulnersdb group",
+                                   access_tier=0)
+        source_feeds = {feed.name: FeedRecord(meta=feed, groups=[group])}
+        MetadataSyncUtils.sync_metadata(source_feeds, to_sync=[feed.name])
+        statements.clear()
+
+        MetadataSyncUtils.sync_metadata(source_feeds, to_sync=[feed.name])
+
+        # Nothing changed upstream, so nothing is written
+        assert "UPDATE" not in [statement for statement, _ in statements]
@@ -6,6 +6,10 @@ import pytest
 from nextlinux_engine.db.db_grype_db_feed_metadata import NoActiveGovulnersDB
 from nextlinux_engine.db.entities.policy_engine import DistroMapping
 from nextlinux_engine.services.policy_engine import init_feed_registry
+from nextlinux_engine.services.policy_engine.engine.policy.gate_util_provider import (
+    GovulnersGateUtilProvider,
+    LegacyGateUtilProvider,
+)
 
 DISTRO_MAPPINGS = [
     DistroMapping(from_distro="alpine", to_distro="alpine", flavor="ALPINE"),
@@ -55,6 +59,10 @@ def mock_gate_util_provider_feed_data(monkeypatch, mock_distromapping_query):
     def _setup_mocks(feed_group_metadata=None,
                      grype_db_feed_metadata=None,
                      feed_metadata=None):
+        # Drop the values cached by earlier tests so the mocks below are used
+        GovulnersGateUtilProvider.__active_db_cache__.flush()
+        LegacyGateUtilProvider.__oldest_sync_cache__.flush()
+
         # required for FeedOutOfDateTrigger.evaluate
         # mocks nextlinux_engine.services.policy_engine.engine.feeds.db.get_feed_group_detached
         monkeypatch.setattr(
@@ -1,4 +1,5 @@
 import datetime
+from contextlib import contextmanager
 from typing import Optional, Type
 from unittest.mock import Mock
 
@@ -9,6 +10,9 @@ from nextlinux_engine.db.entities.policy_engine import (
     FeedGroupMetadata,
     GovulnersDBFeedMetadata,
 )
+from nextlinux_engine.services.policy_engine.engine.feeds.govulnersdb_sync import (
+    GovulnersDBSyncManager,
+)
 from nextlinux_engine.services.policy_engine.engine.policy.gate_util_provider import (
     GateUtilProvider,
     GovulnersGateUtilProvider,
@@ -139,3 +143,70 @@ class TestGateUtilProvider:
 
         # Assert expected result
         assert result is expected
+
+    def test_active_grype_db_is_cached(self, monkeypatch):
+        GovulnersGateUtilProvider.__active_db_cache__.flush()
+
+        @contextmanager
+        def mock_session_scope():
+            yield None
+
+        monkeypatch.setattr(
+            "nextlinux_engine.services.policy_engine.engine.policy.gate_util_provider.session_scope",
+            mock_session_scope,
+        )
+        lookups = []
+
+        def get_active_grypedb(session):
+            lookups.append(session)
+            return grype_db_for_unsupported_distro
+
+        monkeypatch.setattr(
+            "nextlinux_engine.services.policy_engine.engine.policy.gate_util_provider.get_most_recent_active_govulnersdb",
+            get_active_grypedb,
+        )
+        distro_namespace = Mock()
+        distro_namespace.like_namespace_names = ["alpine:3.10"]
+        provider = GovulnersGateUtilProvider()
+
+        assert provider.have_vulnerabilities_for(distro_namespace) is True
+        assert provider.have_vulnerabilities_for(distro_namespace) is True
+        assert len(lookups) == 1
+
+        # An update of the local db is picked up without waiting for the ttl
+        monkeypatch.setattr(GovulnersDBSyncManager, "generation",
+                            GovulnersDBSyncManager.generation + 1)
+        provider.oldest_namespace_feed_sync(distro_namespace)
+        assert len(lookups) == 2
+
+    def test_legacy_oldest_namespace_feed_sync_is_cached(self, monkeypatch):
+        LegacyGateUtilProvider.__oldest_sync_cache__.flush()
+        lookups = []
+
+        def get_feed_group_detached(feed, namespace_name):
+            lookups.append((feed, namespace_name))
+            if namespace_name == "debian:10":
+                return FeedGroupMetadata(last_sync=self.sync_time,
+                                         name=namespace_name)
+            return None
+
+        monkeypatch.setattr(
+            "nextlinux_engine.services.policy_engine.engine.policy.gate_util_provider.get_feed_group_detached",
+            get_feed_group_detached,
+        )
+        monkeypatch.setattr(
+            "nextlinux_engine.services.policy_engine.engine.policy.gate_util_provider.feed_registry.registered_vulnerability_feed_names",
+            lambda: ["vulnerabilities"],
+        )
+        debian = Mock()
+        debian.like_namespace_names = ["debian:10"]
+        unknown = Mock()
+        unknown.like_namespace_names = ["unknown:1"]
+        provider = LegacyGateUtilProvider()
+
+        for _ in range(2):
+            assert provider.oldest_namespace_feed_sync(debian) == self.sync_time
+            assert provider.oldest_namespace_feed_sync(unknown) is None
+
+        assert lookups == [("vulnerabilities", "debian:10"),
+                           ("vulnerabilities", "unknown:1")]
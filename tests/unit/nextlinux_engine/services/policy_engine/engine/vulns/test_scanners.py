@@ -1,6 +1,16 @@
+import threading
+
 import pytest
 
-from nextlinux_engine.services.policy_engine.engine.vulns.scanners import GovulnersScanner
+from nextlinux_engine.db.entities.policy_engine import Image
+from nextlinux_engine.services.policy_engine.engine.feeds.govulnersdb_sync import (
+    GovulnersDBSyncManager,
+    NoActiveDBSyncError,
+)
+from nextlinux_engine.services.policy_engine.engine.vulns import scanners
+from nextlinux_engine.services.policy_engine.engine.vulns.scanners import (
+    GovulnersScanner,
+)
 
 
 @pytest.mark.parametrize(
@@ -18,4 +28,75 @@ def test_is_only_nvd_namespace(input, expected_output):
     """
     Tests private function in GovulnersScanner that determines if namespace is an nvd namespace
     """
-    assert GovulnersScanner()._is_only_nvd_namespace(input) is expected_output
+    assert GovulnersScanner._is_only_nvd_namespace(input) is expected_output
+
+
+def test_is_nvd_namespace_is_memoized():
+    GovulnersScanner._is_nvd_namespace.cache_clear()
+
+    for _ in range(3):
+        assert GovulnersScanner._is_only_nvd_namespace("nvdv2:cves") is True
+        assert GovulnersScanner._is_only_nvd_namespace(["debian:10"]) is False
+
+    cache_info = GovulnersScanner._is_nvd_namespace.cache_info()
+    assert cache_info.misses == 2
+    assert cache_info.hits == 4
+
+
+def test_scan_without_active_db_reports_problem(monkeypatch):
+    fetched = []
+    content_fetched = threading.Event()
+
+    def get_image_content(self, account, image_digest):
+        fetched.append((account, image_digest))
+        content_fetched.set()
+        return {}
+
+    def run_govulnersdb_sync(session):
+        # the content fetch runs while the sync check does
+        assert content_fetched.wait(timeout=5)
+        raise NoActiveDBSyncError()
+
+    monkeypatch.setattr(GovulnersScanner, "_get_image_content", get_image_content)
+    monkeypatch.setattr(
+        GovulnersDBSyncManager, "run_govulnersdb_sync", run_govulnersdb_sync
+    )
+
+    image = Image(id="image1", user_id="account1", digest="sha256:abc")
+    report = GovulnersScanner().scan_image_for_vulnerabilities(image, None)
+
+    assert report.results == []
+    assert len(report.problems) == 1
+    assert fetched == [("account1", "sha256:abc")]
+
+
+def test_scan_without_active_db_logs_discarded_content_error(monkeypatch):
+    fetch_started = threading.Event()
+    release_fetch = threading.Event()
+    logged = threading.Event()
+
+    def get_image_content(self, account, image_digest):
+        fetch_started.set()
+        release_fetch.wait(timeout=5)
+        raise ValueError("catalog unavailable")
+
+    def run_govulnersdb_sync(session):
+        assert fetch_started.wait(timeout=5)
+        raise NoActiveDBSyncError()
+
+    def log_error(msg, *args):
+        logged.set()
+
+    monkeypatch.setattr(GovulnersScanner, "_get_image_content", get_image_content)
+    monkeypatch.setattr(
+        GovulnersDBSyncManager, "run_govulnersdb_sync", run_govulnersdb_sync
+    )
+    monkeypatch.setattr(scanners.logger, "error", log_error)
+
+    image = Image(id="image1", user_id="account1", digest="sha256:abc")
+    report = GovulnersScanner().scan_image_for_vulnerabilities(image, None)
+    assert len(report.problems) == 1
+
+    # The fetch outlives the scan, its error is still logged once it ends
+    release_fetch.set()
+    assert logged.wait(timeout=5)
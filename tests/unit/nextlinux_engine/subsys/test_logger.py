@@ -73,3 +73,36 @@ class TestLoggerFunctions:
         assert "TypeError: not enough arguments for format string" in err
         assert "[ERROR] unable to produce log record: log message %s %s" in err
         assert err.endswith("] log message %s %s\n")
+
+
+class TestDisabledLevels:
+
+    @pytest.mark.parametrize(
+        "log, level",
+        [
+            # INFO
+            (logger.debug, 3),
+            (logger.spew, 3),
+            # ERROR
+            (logger.info, 1),
+            (logger.warn, 1),
+        ],
+    )
+    def test_disabled_level_skips_formatting(self, monkeypatch, capsys, log,
+                                             level):
+        monkeypatch.setattr(logger, "log_level", level)
+        # Log through the engine logger rather than the test bootstrap logger
+        monkeypatch.setattr(logger, "bootstrap_logger_enabled", False)
+        monkeypatch.setattr(logger, "_log_to_stdout", True)
+        formatted = []
+
+        class Argument:
+
+            def __str__(self):
+                formatted.append(True)
+                return "argument"
+
+        log("log message %s", Argument())
+        out, err = capsys.readouterr()
+        assert formatted == []
+        assert err == ""
@@ -1,5 +1,6 @@
 import pytest
 
+from nextlinux_engine.subsys import logger
 from nextlinux_engine.util.docker import parse_dockerimage_string
 from nextlinux_engine.utils import (
     SANITIZE_CMD_ERROR_MESSAGE,
@@ -271,6 +272,32 @@ class TestRunCheck:
             "line",
         )
 
+    @pytest.mark.parametrize("level, expect_spew", [(None, False),
+                                                     ("INFO", False),
+                                                     ("SPEW", True)])
+    def test_log_spew(self, monkeypatch, level, expect_spew):
+        monkeypatch.setattr(
+            "nextlinux_engine.utils.subprocess.Popen",
+            FakePopen(0, "stdout\nline", "stderr"),
+        )
+        # No log level set means INFO
+        monkeypatch.setattr(
+            "nextlinux_engine.utils.logger.log_level",
+            logger.log_level_map[level] if level else None,
+        )
+
+        spew_log = Capture()
+        monkeypatch.setattr("nextlinux_engine.utils.logger.spew", spew_log)
+        run_check(["ls"], log_level="spew")
+        if expect_spew:
+            assert [call["args"] for call in spew_log.calls] == [
+                ("stdout: %s", "stdout"),
+                ("stdout: %s", "line"),
+                ("stderr: %s", "stderr"),
+            ]
+        else:
+            assert spew_log.calls == []
+
     def test_log_stderr_does_not_log(self, monkeypatch):
         # a 0 exit status doesn't log stderr
         monkeypatch.setattr(
@@ -333,6 +360,36 @@ class TestRunCheck:
 
         assert len(error_log.calls) == 1
 
+    def test_spew_logs_output(self, monkeypatch):
+        monkeypatch.setattr("nextlinux_engine.utils.logger.log_level", 99)
+        monkeypatch.setattr(
+            "nextlinux_engine.utils.subprocess.Popen",
+            FakePopen(0, "stdout\nline", "stderr"),
+        )
+
+        spew_log = Capture()
+        monkeypatch.setattr("nextlinux_engine.utils.logger.spew", spew_log)
+        run_check(["ls"], log_level="spew")
+        assert [call["args"] for call in spew_log.calls] == [
+            ("stdout: %s", "stdout"),
+            ("stdout: %s", "line"),
+            ("stderr: %s", "stderr"),
+        ]
+
+    def test_spew_disabled_does_not_log(self, monkeypatch):
+        # set the log level to 4 (DEBUG)
+        monkeypatch.setattr("nextlinux_engine.utils.logger.log_level", 4)
+        monkeypatch.setattr(
+            "nextlinux_engine.utils.subprocess.Popen",
+            FakePopen(0, "stdout\nline", "stderr"),
+        )
+
+        spew_log = Capture()
+        monkeypatch.setattr("nextlinux_engine.utils.logger.spew", spew_log)
+        stdout, stderr = run_check(["ls"], log_level="spew")
+        assert stdout == "stdout\nline"
+        assert spew_log.calls == []
+
 
 class TestCPE:
 